@@ -4,10 +4,12 @@ from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db import connection
 
+from usaspending_api.etl.award_helpers import update_idv_hierarchy
+
 
 class Command(BaseCommand):
 
-    help = "Empty and repopulate parent_award table with IDV aggregates and counts"
+    help = "Empty and repopulate parent_award table with IDV aggregates and counts, and the idv_hierarchy table"
     logger = logging.getLogger("script")
 
     def add_arguments(self, parser):
@@ -53,6 +55,9 @@ class Command(BaseCommand):
             self.logger.info("Restocking parent_award")
             cursor.execute(sql)
 
+            self.logger.info("Restocking idv_hierarchy")
+            self.logger.info(f"{update_idv_hierarchy()} idv_hierarchy records inserted")
+
             vacuum = options.get("vacuum")
 
             if vacuum:
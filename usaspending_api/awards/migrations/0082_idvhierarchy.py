@@ -0,0 +1,27 @@
+# Generated by Django 2.2.18 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0081_auto_20210512_1823'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IDVHierarchy',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ancestor_award_id', models.BigIntegerField()),
+                ('descendant_award_id', models.BigIntegerField(db_index=True)),
+                ('depth', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'idv_hierarchy',
+                'managed': True,
+                'unique_together': {('ancestor_award_id', 'descendant_award_id')},
+            },
+        ),
+    ]
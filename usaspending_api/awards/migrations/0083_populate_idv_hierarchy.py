@@ -0,0 +1,43 @@
+# Generated by Django 2.2.18 on 2026-10-18 12:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('awards', '0082_idvhierarchy'),
+    ]
+
+    # The IDV endpoints read the awards below an IDV from idv_hierarchy, so it's filled here rather than waiting for
+    # the next restock_parent_award.  Same as update_idv_hierarchy() without award ids, copied in so the migration
+    # doesn't change with it.
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                WITH RECURSIVE ancestors AS (
+                  SELECT c.id AS descendant_award_id, p.id AS ancestor_award_id, 1 AS depth, ARRAY[c.id, p.id] AS path
+                  FROM awards c
+                  INNER JOIN awards p ON
+                    p.piid = c.parent_award_piid
+                    AND p.fpds_agency_id = c.fpds_parent_agency_id
+                    AND p.type LIKE 'IDV%'
+                    AND p.id <> c.id
+                  UNION ALL
+                  SELECT a.descendant_award_id, p.id, a.depth + 1, a.path || p.id
+                  FROM ancestors a
+                  INNER JOIN awards c ON c.id = a.ancestor_award_id
+                  INNER JOIN awards p ON
+                    p.piid = c.parent_award_piid
+                    AND p.fpds_agency_id = c.fpds_parent_agency_id
+                    AND p.type LIKE 'IDV%'
+                    AND p.id <> ALL(a.path)
+                )
+                INSERT INTO idv_hierarchy (ancestor_award_id, descendant_award_id, depth)
+                SELECT ancestor_award_id, descendant_award_id, MIN(depth)
+                FROM ancestors
+                GROUP BY ancestor_award_id, descendant_award_id
+            """,
+            reverse_sql="DELETE FROM idv_hierarchy",
+        ),
+    ]
@@ -1,6 +1,7 @@
 from usaspending_api.awards.models.award import Award
 from usaspending_api.awards.models.broker_subaward import BrokerSubaward
 from usaspending_api.awards.models.financial_accounts_by_awards import FinancialAccountsByAwards
+from usaspending_api.awards.models.idv_hierarchy import IDVHierarchy
 from usaspending_api.awards.models.mv_covid_financial_account import CovidFinancialAccountMatview
 from usaspending_api.awards.models.parent_award import ParentAward
 from usaspending_api.awards.models.subaward import Subaward
@@ -14,6 +15,7 @@ __all__ = [
     "BrokerSubaward",
     "CovidFinancialAccountMatview",
     "FinancialAccountsByAwards",
+    "IDVHierarchy",
     "ParentAward",
     "Subaward",
     "TransactionDelta",
@@ -0,0 +1,19 @@
+from django.db import models
+
+
+class IDVHierarchy(models.Model):
+    """
+    Closure table of IDV hierarchies: one record per IDV and each award below it (child IDVs and contracts,
+    grandchildren and so on) with the number of levels between them, so the awards of a hierarchy are found without
+    walking it.  An award's parent is the other IDV whose piid and fpds_agency_id are the award's parent_award_piid and
+    fpds_parent_agency_id.  Maintained by usaspending_api.etl.award_helpers.update_idv_hierarchy.
+    """
+
+    ancestor_award_id = models.BigIntegerField()
+    descendant_award_id = models.BigIntegerField(db_index=True)
+    depth = models.IntegerField()
+
+    class Meta:
+        managed = True
+        db_table = "idv_hierarchy"
+        unique_together = ("ancestor_award_id", "descendant_award_id")
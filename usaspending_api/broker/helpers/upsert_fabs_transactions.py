@@ -12,9 +12,9 @@ from usaspending_api.common.helpers.dict_helpers import upper_case_dict_values
 from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
 from usaspending_api.common.helpers.date_helper import fy
 from usaspending_api.common.helpers.timing_helpers import timer
-from usaspending_api.etl.award_helpers import update_awards, update_assistance_awards
+from usaspending_api.etl.award_helpers import recompute_awards
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
-from usaspending_api.etl.management.load_base import load_data_into_model, format_date
+from usaspending_api.etl.management.load_base import compile_model_data_mapper, format_date
 from usaspending_api.references.models import Agency
 
 
@@ -74,6 +74,24 @@ def insert_new_fabs(to_insert):
         "officer_5_amount": "high_comp_officer5_amount",
     }
 
+    financial_assistance_mapper = compile_model_data_mapper(TransactionFABS, field_map=fabs_field_map)
+    # the fields of each row's parent_txn_value_map
+    parent_txn_value_fields = (
+        "award",
+        "awarding_agency",
+        "funding_agency",
+        "period_of_performance_start_date",
+        "period_of_performance_current_end_date",
+        "action_date",
+        "last_modified_date",
+        "type_description",
+        "transaction_unique_id",
+        "business_categories",
+    )
+    transaction_normalized_mapper = compile_model_data_mapper(
+        TransactionNormalized, field_map=fabs_normalized_field_map, value_map=parent_txn_value_fields
+    )
+
     update_award_ids = []
     for row in to_insert:
         upper_case_dict_values(row)
@@ -112,17 +130,9 @@ def insert_new_fabs(to_insert):
             "business_categories": get_business_categories(row=row, data_type="fabs"),
         }
 
-        transaction_normalized_dict = load_data_into_model(
-            TransactionNormalized(),  # thrown away
-            row,
-            field_map=fabs_normalized_field_map,
-            value_map=parent_txn_value_map,
-            as_dict=True,
-        )
+        transaction_normalized_dict = transaction_normalized_mapper.to_dict(row, parent_txn_value_map)
 
-        financial_assistance_data = load_data_into_model(
-            TransactionFABS(), row, field_map=fabs_field_map, as_dict=True  # thrown away
-        )
+        financial_assistance_data = financial_assistance_mapper.to_dict(row)
 
         # Hack to cut back on the number of warnings dumped to the log.
         financial_assistance_data["updated_at"] = cast_datetime_to_utc(financial_assistance_data["updated_at"])
@@ -164,13 +174,12 @@ def upsert_fabs_transactions(ids_to_upsert, externally_updated_award_ids):
                 update_award_ids.extend(insert_all_new_fabs(ids_to_upsert))
 
         if update_award_ids:
-            update_award_ids = tuple(set(update_award_ids))  # Convert to tuple and remove duplicates.
-            with timer("updating awards to reflect their latest associated transaction info", logger.info):
-                award_record_count = update_awards(update_award_ids)
-                logger.info("{} awards updated from their transactional data".format(award_record_count))
-            with timer("updating awards with executive compensation data", logger.info):
-                award_record_count = update_assistance_awards(update_award_ids)
-                logger.info("{} awards updated FABS-specific and exec comp data".format(award_record_count))
+            with timer("updating awards with their latest transaction info and executive compensation", logger.info):
+                award_record_counts = recompute_awards(update_award_ids, ["awards", "assistance"])
+                logger.info("{} awards updated from their transactional data".format(award_record_counts["awards"]))
+                logger.info(
+                    "{} awards updated FABS-specific and exec comp data".format(award_record_counts["assistance"])
+                )
 
         with timer("updating C->D linkages", logger.info):
             update_c_to_d_linkages("assistance")
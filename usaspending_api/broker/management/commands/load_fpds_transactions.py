@@ -11,7 +11,7 @@ from usaspending_api.common.helpers.date_helper import datetime_command_line_arg
 from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
 from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
-from usaspending_api.etl.award_helpers import update_awards, update_procurement_awards, prune_empty_awards
+from usaspending_api.etl.award_helpers import recompute_awards, update_idv_hierarchy
 from usaspending_api.etl.transaction_loaders.fpds_loader import load_fpds_transactions, failed_ids, delete_stale_fpds
 from usaspending_api.transactions.transaction_delete_journal_helpers import retrieve_deleted_fpds_transactions
 
@@ -26,6 +26,7 @@ class Command(BaseCommand):
     help = "Sync USAspending DB FPDS data using source transaction for new or modified records and S3 for deleted IDs"
 
     modified_award_ids = []
+    set_based = False
 
     @staticmethod
     def get_cursor_for_date_query(connection, date, count=False):
@@ -65,7 +66,7 @@ class Command(BaseCommand):
                 if len(id_list) == 0:
                     break
                 logger.info("Loading batch (size: {}) from date query...".format(len(id_list)))
-                self.modified_award_ids.extend(load_fpds_transactions([row[0] for row in id_list]))
+                self.modified_award_ids.extend(load_fpds_transactions([row[0] for row in id_list], self.set_based))
                 records_processed = records_processed + len(id_list)
                 logger.info("{} out of {} processed".format(records_processed, total_records))
 
@@ -88,7 +89,7 @@ class Command(BaseCommand):
                 id_list = [int(re.search(r"\d+", x).group()) for x in next_batch]
                 total_count += len(id_list)
                 logger.info(f"Loading next batch (size: {len(id_list)}, ids {id_list[0]}-{id_list[-1]})...")
-                self.modified_award_ids.extend(load_fpds_transactions(id_list))
+                self.modified_award_ids.extend(load_fpds_transactions(id_list, self.set_based))
 
         logger.info(f"Total transaction IDs in file: {total_count}")
 
@@ -97,11 +98,11 @@ class Command(BaseCommand):
         if awards:
             unique_awards = set(awards)
             logger.info(f"{len(unique_awards)} award records impacted by transaction DML operations")
-            logger.info(f"{prune_empty_awards(tuple(unique_awards))} award records removed")
-            logger.info(f"{update_awards(tuple(unique_awards))} award records updated")
-            logger.info(
-                f"{update_procurement_awards(tuple(unique_awards))} award records updated on FPDS-specific fields"
-            )
+            counts = recompute_awards(unique_awards, ["prune", "awards", "procurement"])
+            logger.info(f"{counts['prune']} award records removed")
+            logger.info(f"{counts['awards']} award records updated")
+            logger.info(f"{counts['procurement']} award records updated on FPDS-specific fields")
+            logger.info(f"{update_idv_hierarchy(tuple(unique_awards))} IDV hierarchy records updated")
             if not skip_cd_linkage:
                 update_c_to_d_linkages("contract")
         else:
@@ -139,11 +140,17 @@ class Command(BaseCommand):
             action="store_true",
             help="Script will load or reload all FPDS records in source tables, from all time. This does NOT clear the USAspending database first",
         )
+        parser.add_argument(
+            "--set-based",
+            action="store_true",
+            help="Load each chunk of transactions with a few set-based statements instead of several per transaction",
+        )
 
     def handle(self, *args, **options):
 
         # Record script execution start time to update the FPDS last updated date in DB as appropriate
         update_time = datetime.now(timezone.utc)
+        self.set_based = options["set_based"]
 
         if options["reload_all"]:
             self.load_fpds_incrementally(None)
@@ -152,7 +159,7 @@ class Command(BaseCommand):
             self.load_fpds_incrementally(options["date"])
 
         elif options["ids"]:
-            self.modified_award_ids.extend(load_fpds_transactions(options["ids"]))
+            self.modified_award_ids.extend(load_fpds_transactions(options["ids"], self.set_based))
 
         elif options["file"]:
             self.load_fpds_from_file(options["file"])
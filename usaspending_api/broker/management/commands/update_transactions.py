@@ -11,7 +11,12 @@ from usaspending_api.awards.models import Award
 from usaspending_api.common.helpers.timing_helpers import timer
 from usaspending_api.references.models import Agency, SubtierAgency, ToptierAgency
 from usaspending_api.etl.management.load_base import format_date, load_data_into_model
-from usaspending_api.etl.award_helpers import update_awards, update_procurement_awards, update_assistance_awards
+from usaspending_api.etl.award_helpers import (
+    update_assistance_awards,
+    update_awards,
+    update_idv_hierarchy,
+    update_procurement_awards,
+)
 
 
 logger = logging.getLogger("script")
@@ -408,5 +413,9 @@ class Command(BaseCommand):
         with timer("updating contract-specific awards to reflect their latest transaction info", logger.info):
             update_procurement_awards(tuple(award_contract_update_id_list))
 
+        if award_contract_update_id_list:
+            with timer("updating the IDV hierarchies of contract awards", logger.info):
+                update_idv_hierarchy(tuple(award_contract_update_id_list))
+
         # Done!
         logger.info("FINISHED")
@@ -1,10 +1,103 @@
 import hashlib
 import json
-
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.db.models import Max
+from django.utils.timezone import now
 from rest_framework_extensions.key_constructor import bits
 from rest_framework_extensions.key_constructor.constructors import DefaultKeyConstructor
 
+from usaspending_api.broker.models import ExternalDataLoadDate
+from usaspending_api.common.elasticsearch.client import instantiate_elasticsearch_client
 from usaspending_api.common.helpers.dict_helpers import order_nested_object
+from usaspending_api.submissions.models import DABSSubmissionWindowSchedule, SubmissionAttributes
+
+logger = logging.getLogger("console")
+
+# How long a process keeps using the data version it looked up, before looking it up again
+DATA_VERSION_CACHE_SECONDS = 60
+_data_version = {"token": None, "expires": 0.0, "refreshing": False}
+_data_version_lock = threading.Lock()
+_last_alias_indexes = []  # the indexes behind the Elasticsearch query aliases when last read successfully
+
+
+def get_data_version() -> str:
+    """
+    Token identifying the version of the data served by the API, which changes with every load of it: the last load
+    dates of external data (FPDS, FABS, Elasticsearch loads, ...), the latest published and revealed submissions, and
+    the indexes behind the Elasticsearch query aliases.
+
+    The token is looked up outside of the lock, which only guards swapping it in: while one request looks up an expired
+    token, the others keep using it rather than waiting on the lookup. Should the lookup fail, the expired token is
+    used for another DATA_VERSION_CACHE_SECONDS.
+    """
+    with _data_version_lock:
+        token = _data_version["token"]
+        if token is not None and (_data_version["expires"] >= time.monotonic() or _data_version["refreshing"]):
+            return token
+        _data_version["refreshing"] = True
+
+    try:
+        token = _look_up_data_version()
+    except Exception:
+        with _data_version_lock:
+            _data_version["refreshing"] = False
+            token = _data_version["token"]
+            if token is None:
+                raise
+            # Keep serving the last version looked up (and cached responses with it) rather than failing every request,
+            # and only look it up again once it expires anew
+            _data_version["expires"] = time.monotonic() + DATA_VERSION_CACHE_SECONDS
+        logger.warning("Unable to look up the data version; reusing the last one looked up", exc_info=True)
+        return token
+
+    with _data_version_lock:
+        _data_version["token"] = token
+        _data_version["expires"] = time.monotonic() + DATA_VERSION_CACHE_SECONDS
+        _data_version["refreshing"] = False
+    return token
+
+
+def _look_up_data_version() -> str:
+    load_dates = ExternalDataLoadDate.objects.order_by("external_data_type_id")
+    sources = {
+        "external_data_load_date": [
+            f"{data_type_id}:{last_load_date.isoformat()}"
+            for data_type_id, last_load_date in load_dates.values_list("external_data_type_id", "last_load_date")
+        ],
+        "submission_published_date": str(
+            SubmissionAttributes.objects.aggregate(Max("published_date"))["published_date__max"]
+        ),
+        "submission_reveal_date": str(
+            DABSSubmissionWindowSchedule.objects.filter(submission_reveal_date__lte=now()).aggregate(
+                Max("submission_reveal_date")
+            )["submission_reveal_date__max"]
+        ),
+        "es_indexes": _query_alias_indexes(),
+    }
+    return hashlib.md5(json.dumps(sources, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def _query_alias_indexes() -> list:
+    global _last_alias_indexes
+    alias_patterns = [
+        f"{settings.ES_TRANSACTIONS_QUERY_ALIAS_PREFIX}*",
+        f"{settings.ES_AWARDS_QUERY_ALIAS_PREFIX}*",
+        f"{settings.ES_COVID19_FABA_QUERY_ALIAS_PREFIX}*",
+    ]
+    try:
+        client = instantiate_elasticsearch_client()
+        _last_alias_indexes = sorted(client.indices.get_alias(name=",".join(alias_patterns), request_timeout=5))
+    except Exception:
+        # Keep the indexes last read, so the data version (and every cache key with it) doesn't change with an
+        # Elasticsearch blip. Reloads of the indexes are also recorded as load dates, so nothing is missed meanwhile.
+        logger.warning("Unable to retrieve the indexes behind the Elasticsearch query aliases")
+    return _last_alias_indexes
 
 
 class PathKeyBit(bits.QueryParamsKeyBit):
@@ -41,6 +134,18 @@ class GetPostQueryParamsKeyBit(bits.QueryParamsKeyBit):
         return {"request": json.dumps(order_nested_object(params))}
 
 
+class DataVersionKeyBit(bits.KeyBitBase):
+    """
+    Adds the version of the data served by the API as a key bit, so responses cached before a data load are never
+    served after it (and can be cached for long). Nothing is added when the cache is disabled.
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        if isinstance(caches[settings.REST_FRAMEWORK_EXTENSIONS["DEFAULT_USE_CACHE"]], DummyCache):
+            return None
+        return get_data_version()
+
+
 class USAspendingKeyConstructor(DefaultKeyConstructor):
     """
     Handle cache key construction for API requests. If we never need to create more nuanced keys, see the
@@ -49,6 +154,7 @@ class USAspendingKeyConstructor(DefaultKeyConstructor):
 
     path_bit = PathKeyBit()
     request_params = GetPostQueryParamsKeyBit()
+    data_version = DataVersionKeyBit()
 
     def prepare_key(self, key_dict):
         # Order the key_dict using the order_nested_object function to make sure cache keys are always exactly the same
@@ -1,15 +1,37 @@
 # -*- coding: utf-8 -*-
 import logging
+import time
+import zlib
 
 from collections.abc import Iterable
+from ddtrace import tracer
 from django.conf import settings
 from django.db.models import QuerySet
+from django.http.response import HttpResponse
 from rest_framework_extensions.cache.decorators import CacheResponse
-from typing import Any
+from typing import Any, Optional, Tuple
+from uuid import uuid4
 from usaspending_api.common.experimental_api_flags import is_experimental_elasticsearch_api
 
 logger = logging.getLogger("console")
 
+# Version of the envelope responses are cached in; entries of any other version (or format) are cache misses
+CACHE_ENVELOPE_VERSION = 1
+# Response bodies of at least this many bytes are cached zlib compressed
+CACHE_COMPRESSION_MIN_BYTES = 1024
+CACHE_COMPRESSION_LEVEL = 6
+# Headers which are set per request, rather than cached
+UNCACHED_HEADERS = ("Cache-Trace", "key")
+# Single-flight requests hold a lock in the cache for at most this long, in case the computing worker dies
+SINGLE_FLIGHT_LOCK_SECONDS = 120
+# How long, and how often, single-flight requests check for the response being computed by another worker
+SINGLE_FLIGHT_WAIT_SECONDS = 60
+SINGLE_FLIGHT_POLL_SECONDS = 0.1
+# When the response under the lock isn't cached (e.g. for an error), the lock is replaced with this marker for this
+# long, so requests waiting on it (or arriving meanwhile) compute their responses at once rather than in turn
+SINGLE_FLIGHT_FAILED = "failed"
+SINGLE_FLIGHT_FAILED_SECONDS = 10
+
 
 def contains_queryset(data: Any) -> bool:
     """Traverse a complex object and return True if a Queryset exists anywhere"""
@@ -26,7 +48,53 @@ def contains_queryset(data: Any) -> bool:
         return False
 
 
+def pack_cached_response(response: HttpResponse) -> tuple:
+    """
+    Envelope of a rendered response to store in the cache: only its status, headers and (above a size threshold,
+    compressed) body bytes, rather than the pickled response object
+    """
+    body = response.content
+    compressed = len(body) >= CACHE_COMPRESSION_MIN_BYTES
+    if compressed:
+        body = zlib.compress(body, CACHE_COMPRESSION_LEVEL)
+    headers = [(header, value) for header, value in response.items() if header not in UNCACHED_HEADERS]
+    return CACHE_ENVELOPE_VERSION, response.status_code, headers, compressed, body
+
+
+def unpack_cached_response(envelope: Any) -> Optional[HttpResponse]:
+    """Rebuild a response from its cache envelope, or None if the envelope isn't one this version can read"""
+    if not isinstance(envelope, tuple) or len(envelope) != 5 or envelope[0] != CACHE_ENVELOPE_VERSION:
+        return None
+    _, status, headers, compressed, body = envelope
+    response = HttpResponse(content=zlib.decompress(body) if compressed else body, status=status)
+    for header, value in headers:
+        response[header] = value
+    return response
+
+
+def _trace_cache_result(result: str, envelope: Optional[tuple] = None, response: Optional[HttpResponse] = None):
+    """Tag the request's trace with the cache result and the compression of cached bodies, to report per endpoint"""
+    span = tracer.current_root_span()
+    if span is None:
+        return
+    span.set_tag("cache.result", result)
+    if envelope is not None and response is not None:
+        body_size, cached_size = len(response.content), len(envelope[-1])
+        span.set_metric("cache.body_size", body_size)
+        span.set_metric("cache.cached_size", cached_size)
+        span.set_metric("cache.compression_ratio", body_size / cached_size if cached_size else 1.0)
+
+
 class CustomCacheResponse(CacheResponse):
+    """
+    With single_flight, concurrent cache misses for the same key are coalesced: one request computes the response under
+    a lock held in the cache while the others wait for, and return, the response it caches.
+    """
+
+    def __init__(self, *args, single_flight: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.single_flight = single_flight
+
     def process_cache_response(self, view_instance, view_method, request, args, kwargs):
         if is_experimental_elasticsearch_api(request):
             # bypass cache altogether
@@ -39,42 +107,32 @@ class CustomCacheResponse(CacheResponse):
         )
         response = None
         try:
-            response = self.cache.get(key)
+            envelope = self.cache.get(key)
+            response = unpack_cached_response(envelope)
         except Exception:
             msg = "Problem while retrieving key [{k}] from cache for path:'{p}'"
             logger.exception(msg.format(k=key, p=str(request.path)))
 
-        if not response:
-            response = view_method(view_instance, request, *args, **kwargs)
-            response = view_instance.finalize_response(request, response, *args, **kwargs)
-
-            # While returning a Queryset is functional most of the time, it isn't
-            # fully supported by Django Rest Framework. This check was inserted
-            # in local mode to catch if a Queryset is being returned by the view
-            # which could cause an exception when setting the cache
-            if settings.IS_LOCAL and response and not response.is_rendered:
-                if contains_queryset(response.data):
-                    raise RuntimeError(
-                        "Your view is returning a QuerySet. QuerySets are not"
-                        " really designed to be pickled and can cause caching"
-                        " issues. Please materialize the QuerySet using a List"
-                        " or some other more primitive data structure."
-                    )
-
-            response["Cache-Trace"] = "no-cache"
-            response.render()  # should be rendered, before pickling while storing to cache
-
-            if not response.status_code >= 400 or self.cache_errors:
-                if self.cache_errors:
-                    logger.error(self.cache_errors)
-                try:
-                    self.cache.set(key, response, self.timeout)
-                    response["Cache-Trace"] = "set-cache"
-                except Exception:
-                    msg = "Problem while writing to cache: path:'{p}' data:'{d}'"
-                    logger.exception(msg.format(p=str(request.path), d=str(request.data)))
-        else:
+        lock_token = None
+        if not response and self.single_flight:
+            try:
+                response, lock_token = self._acquire_or_wait_for_response(key)
+            except Exception:
+                logger.exception(f"Problem while coalescing key [{key}] for path:'{request.path}'")
+            if response:
+                response["Cache-Trace"] = "hit-cache"
+                _trace_cache_result("coalesced")
+        elif response:
             response["Cache-Trace"] = "hit-cache"
+            _trace_cache_result("hit")
+
+        if not response:
+            try:
+                response = self._compute_and_cache_response(view_instance, view_method, request, args, kwargs, key)
+            finally:
+                if lock_token:
+                    failed = response is None or response["Cache-Trace"] != "set-cache"
+                    self._release_lock(key, lock_token, failed)
 
         if not hasattr(response, "_closable_objects"):
             response._closable_objects = []
@@ -82,5 +140,79 @@ class CustomCacheResponse(CacheResponse):
         response["key"] = key
         return response
 
+    def _compute_and_cache_response(self, view_instance, view_method, request, args, kwargs, key):
+        response = view_method(view_instance, request, *args, **kwargs)
+        response = view_instance.finalize_response(request, response, *args, **kwargs)
+
+        # While returning a Queryset is functional most of the time, it isn't
+        # fully supported by Django Rest Framework. This check was inserted
+        # in local mode to catch if a Queryset is being returned by the view
+        # which could cause an exception when setting the cache
+        if settings.IS_LOCAL and response and not response.is_rendered:
+            if contains_queryset(response.data):
+                raise RuntimeError(
+                    "Your view is returning a QuerySet. QuerySets are not"
+                    " really designed to be pickled and can cause caching"
+                    " issues. Please materialize the QuerySet using a List"
+                    " or some other more primitive data structure."
+                )
+
+        response["Cache-Trace"] = "no-cache"
+        response.render()  # should be rendered, before its content is stored in the cache
+
+        if not response.status_code >= 400 or self.cache_errors:
+            if self.cache_errors:
+                logger.error(self.cache_errors)
+            try:
+                envelope = pack_cached_response(response)
+                self.cache.set(key, envelope, self.timeout)
+                response["Cache-Trace"] = "set-cache"
+                _trace_cache_result("miss", envelope, response)
+            except Exception:
+                msg = "Problem while writing to cache: path:'{p}' data:'{d}'"
+                logger.exception(msg.format(p=str(request.path), d=str(request.data)))
+        else:
+            _trace_cache_result("miss")
+        return response
+
+    def _acquire_or_wait_for_response(self, key: str) -> Tuple[Optional[HttpResponse], Optional[str]]:
+        """
+        Either take the lock to compute the response of key, returning its token, or wait for the worker holding it to
+        cache the response, returning that. Stops waiting (to compute the response without the lock) after
+        SINGLE_FLIGHT_WAIT_SECONDS, or as soon as the lock holder failed to cache a response, e.g. for an error.
+        """
+        lock_key = f"{key}:single-flight"
+        token = uuid4().hex
+        deadline = time.monotonic() + SINGLE_FLIGHT_WAIT_SECONDS
+        while True:
+            if self.cache.add(lock_key, token, SINGLE_FLIGHT_LOCK_SECONDS):
+                # The response may have been cached between the cache miss and taking the lock
+                response = unpack_cached_response(self.cache.get(key))
+                if response:
+                    self._release_lock(key, token)
+                    return response, None
+                return None, token
+            if self.cache.get(lock_key) == SINGLE_FLIGHT_FAILED:
+                return None, None
+            if time.monotonic() >= deadline:
+                logger.warning(f"Timed out waiting for key [{key}] to be cached by another request")
+                return None, None
+            time.sleep(SINGLE_FLIGHT_POLL_SECONDS)
+            response = unpack_cached_response(self.cache.get(key))
+            if response:
+                return response, None
+
+    def _release_lock(self, key: str, token: str, failed: bool = False):
+        lock_key = f"{key}:single-flight"
+        try:
+            # Only release the lock if it wasn't taken over after expiring
+            if self.cache.get(lock_key) == token:
+                if failed:
+                    self.cache.set(lock_key, SINGLE_FLIGHT_FAILED, SINGLE_FLIGHT_FAILED_SECONDS)
+                else:
+                    self.cache.delete(lock_key)
+        except Exception:
+            logger.exception(f"Problem while releasing the lock of key [{key}]")
+
 
 cache_response = CustomCacheResponse
@@ -4,6 +4,7 @@ import logging
 import math
 
 from boto3.s3.transfer import TransferConfig, S3Transfer
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from django.conf import settings
 from pathlib import Path
 from typing import List
@@ -11,6 +12,9 @@ from typing import List
 
 logger = logging.getLogger("script")
 
+# S3 requires every part of a multipart upload except the last to be at least 5MB
+MULTIPART_UPLOAD_MIN_PART_SIZE = 5242880
+
 
 def retrieve_s3_bucket_object_list(bucket_name: str) -> List["boto3.resources.factory.s3.ObjectSummary"]:
     try:
@@ -52,7 +56,111 @@ def multipart_upload(bucketname, regionname, source_path, keyname):
     s3client = boto3.client("s3", region_name=regionname)
     source_size = Path(source_path).stat().st_size
     # Sets the chunksize at minimum ~5MB to sqrt(5MB) * sqrt(source size)
-    bytes_per_chunk = max(int(math.sqrt(5242880) * math.sqrt(source_size)), 5242880)
+    bytes_per_chunk = max(
+        int(math.sqrt(MULTIPART_UPLOAD_MIN_PART_SIZE) * math.sqrt(source_size)), MULTIPART_UPLOAD_MIN_PART_SIZE
+    )
     config = TransferConfig(multipart_chunksize=bytes_per_chunk)
     transfer = S3Transfer(s3client, config)
     transfer.upload_file(source_path, bucketname, Path(keyname).name, extra_args={"ACL": "bucket-owner-full-control"})
+
+
+class MultipartUploadStream:
+    """
+    Write-only, unseekable file-like object which uploads to an S3 object as it is written, for producers (such as a
+    zipfile.ZipFile) whose output should never need to be held on local disk. Every part_size bytes written become a
+    part of a multipart upload, sent by background threads while writing continues; at most max_pending_parts parts
+    are buffered waiting on S3 before writes block.
+
+    close() uploads the final part and completes the upload; abort() discards everything uploaded, and anything written
+    afterwards (e.g. by a ZipFile closed on garbage collection). Unlike io classes, nothing is ever completed implicitly.
+    """
+
+    def __init__(
+        self,
+        bucket_name: str,
+        region_name: str,
+        key_name: str,
+        part_size: int = 4 * MULTIPART_UPLOAD_MIN_PART_SIZE,
+        max_pending_parts: int = 4,
+        s3_client=None,
+    ):
+        if part_size < MULTIPART_UPLOAD_MIN_PART_SIZE:
+            raise ValueError(f"Multipart upload parts must be at least {MULTIPART_UPLOAD_MIN_PART_SIZE} bytes")
+        self.s3_client = s3_client or boto3.client("s3", region_name=region_name)
+        self.bucket_name = bucket_name
+        self.key_name = Path(key_name).name
+        self.part_size = part_size
+        self.max_pending_parts = max_pending_parts
+        self.bytes_written = 0
+        self.closed = False
+        self.aborted = False
+        self._buffer = bytearray()
+        self._completed_parts = []
+        self._pending_parts = set()
+        self._part_count = 0
+        self._executor = ThreadPoolExecutor(max_workers=max_pending_parts)
+        self._upload_id = self.s3_client.create_multipart_upload(
+            Bucket=self.bucket_name, Key=self.key_name, ACL="bucket-owner-full-control"
+        )["UploadId"]
+
+    def write(self, data: bytes) -> int:
+        if self.aborted:
+            return len(data)
+        if self.closed:
+            raise ValueError("Write to a closed MultipartUploadStream")
+        self._buffer += data
+        self.bytes_written += len(data)
+        while len(self._buffer) >= self.part_size:
+            self._upload_part(bytes(self._buffer[: self.part_size]))
+            del self._buffer[: self.part_size]
+        return len(data)
+
+    def flush(self) -> None:
+        """Parts are only uploaded once full, so there is nothing to flush before close()"""
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            if self._buffer or self._part_count == 0:
+                self._upload_part(bytes(self._buffer))
+                self._buffer.clear()
+            for future in self._pending_parts:
+                self._completed_parts.append(future.result())
+            self._pending_parts.clear()
+            parts = sorted(self._completed_parts, key=lambda part: part["PartNumber"])
+            self.s3_client.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=self.key_name,
+                UploadId=self._upload_id,
+                MultipartUpload={"Parts": parts},
+            )
+        except Exception:
+            self.abort()
+            raise
+        self.closed = True
+        self._executor.shutdown()
+        logger.info(f"Uploaded {self.bytes_written:,} bytes in {self._part_count} parts to {self.key_name}")
+
+    def abort(self) -> None:
+        if self.closed:
+            return
+        self.closed = self.aborted = True
+        for future in self._pending_parts:
+            future.cancel()
+        self._executor.shutdown()
+        self.s3_client.abort_multipart_upload(Bucket=self.bucket_name, Key=self.key_name, UploadId=self._upload_id)
+        logger.warning(f"Aborted multipart upload to {self.key_name}")
+
+    def _upload_part(self, body: bytes) -> None:
+        if len(self._pending_parts) >= self.max_pending_parts:
+            done, self._pending_parts = wait(self._pending_parts, return_when=FIRST_COMPLETED)
+            self._completed_parts.extend(future.result() for future in done)
+        self._part_count += 1
+        self._pending_parts.add(self._executor.submit(self._send_part, self._part_count, body))
+
+    def _send_part(self, part_number: int, body: bytes) -> dict:
+        response = self.s3_client.upload_part(
+            Bucket=self.bucket_name, Key=self.key_name, UploadId=self._upload_id, PartNumber=part_number, Body=body
+        )
+        return {"PartNumber": part_number, "ETag": response["ETag"]}
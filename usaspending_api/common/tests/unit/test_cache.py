@@ -0,0 +1,105 @@
+import pytest
+
+from datetime import datetime, timezone
+from django.core.cache.backends.locmem import LocMemCache
+from model_mommy import mommy
+
+from usaspending_api.broker.helpers.last_load_date import update_last_load_date
+from usaspending_api.broker.lookups import EXTERNAL_DATA_TYPE
+from usaspending_api.broker.models import ExternalDataType
+from usaspending_api.common import cache
+from usaspending_api.common.cache import DataVersionKeyBit, get_data_version
+
+
+@pytest.fixture
+def fresh_data_version(monkeypatch):
+    monkeypatch.setattr(cache, "_data_version", {"token": None, "expires": 0.0, "refreshing": False})
+    monkeypatch.setattr(cache, "_query_alias_indexes", lambda: ["transaction-query-1"])
+
+
+def test_data_version_is_looked_up_again_once_expired(monkeypatch, fresh_data_version):
+    versions = iter(["v1", "v2"])
+    monkeypatch.setattr(cache, "_look_up_data_version", lambda: next(versions))
+    now = cache.time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+
+    assert get_data_version() == "v1"
+    assert get_data_version() == "v1"
+
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + cache.DATA_VERSION_CACHE_SECONDS + 1)
+    assert get_data_version() == "v2"
+
+
+def test_expired_data_version_is_served_while_another_request_looks_it_up(monkeypatch):
+    monkeypatch.setattr(cache, "_data_version", {"token": "v1", "expires": 0.0, "refreshing": True})
+    monkeypatch.setattr(cache, "_look_up_data_version", lambda: pytest.fail("looked up twice"))
+    assert get_data_version() == "v1"
+
+
+def test_alias_indexes_last_read_are_kept_on_elasticsearch_errors(monkeypatch):
+    class Indices:
+        aliases = {"transaction-query-1": {}}
+
+        def get_alias(self, **kwargs):
+            if self.aliases is None:
+                raise ConnectionError()
+            return self.aliases
+
+    indices = Indices()
+    monkeypatch.setattr(cache, "_last_alias_indexes", [])
+    monkeypatch.setattr(cache, "instantiate_elasticsearch_client", lambda: type("Client", (), {"indices": indices}))
+
+    assert cache._query_alias_indexes() == ["transaction-query-1"]
+    indices.aliases = None
+    assert cache._query_alias_indexes() == ["transaction-query-1"]
+
+
+def test_data_version_last_looked_up_is_kept_on_database_errors(monkeypatch, fresh_data_version):
+    monkeypatch.setattr(cache, "_look_up_data_version", lambda: "v1")
+    now = cache.time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now)
+    assert get_data_version() == "v1"
+
+    lookups = []
+
+    def failing_look_up():
+        lookups.append(1)
+        raise ConnectionError()
+
+    monkeypatch.setattr(cache, "_look_up_data_version", failing_look_up)
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now + cache.DATA_VERSION_CACHE_SECONDS + 1)
+    assert get_data_version() == "v1"
+    assert get_data_version() == "v1"
+    assert len(lookups) == 1  # not looked up again until the version expires anew
+    assert cache._data_version["refreshing"] is False
+
+
+def test_data_version_lookup_errors_are_raised_without_a_version(monkeypatch, fresh_data_version):
+    monkeypatch.setattr(cache, "_look_up_data_version", lambda: (_ for _ in ()).throw(ConnectionError()))
+    with pytest.raises(ConnectionError):
+        get_data_version()
+    assert cache._data_version["refreshing"] is False
+
+
+@pytest.mark.django_db
+def test_data_version_changes_with_data_loads(monkeypatch, fresh_data_version):
+    for external_data_type in EXTERNAL_DATA_TYPE:
+        mommy.make(ExternalDataType, external_data_type_id=external_data_type.id, name=external_data_type.name)
+    update_last_load_date("fpds", datetime(2020, 1, 2, tzinfo=timezone.utc))
+    version = cache._look_up_data_version()
+
+    assert cache._look_up_data_version() == version
+    update_last_load_date("es_transactions", datetime(2020, 1, 3, tzinfo=timezone.utc))
+    assert cache._look_up_data_version() != version
+
+    version = cache._look_up_data_version()
+    monkeypatch.setattr(cache, "_query_alias_indexes", lambda: ["transaction-query-2"])
+    assert cache._look_up_data_version() != version
+
+
+def test_data_version_key_bit_is_empty_with_disabled_cache(monkeypatch, fresh_data_version):
+    monkeypatch.setattr(cache, "_look_up_data_version", lambda: "v1")
+    assert DataVersionKeyBit().get_data(None, None, None, None, None, None) is None
+
+    monkeypatch.setattr(cache, "caches", {"usaspending-cache": LocMemCache("test", {})})
+    assert DataVersionKeyBit().get_data(None, None, None, None, None, None) == "v1"
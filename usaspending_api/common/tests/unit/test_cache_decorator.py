@@ -0,0 +1,128 @@
+import threading
+import time
+import zlib
+
+from django.core.cache import caches
+from django.http.response import HttpResponse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+
+from usaspending_api.common.cache_decorator import (
+    CACHE_COMPRESSION_MIN_BYTES,
+    SINGLE_FLIGHT_FAILED,
+    SINGLE_FLIGHT_POLL_SECONDS,
+    cache_response,
+    pack_cached_response,
+    unpack_cached_response,
+)
+
+
+class _CachedView(APIView):
+    calls = 0
+
+    @cache_response(cache="default")
+    def post(self, request):
+        _CachedView.calls += 1
+        return Response({"results": ["x" * CACHE_COMPRESSION_MIN_BYTES], "calls": _CachedView.calls})
+
+
+class _SingleFlightView(APIView):
+    calls = 0
+    status_code = status.HTTP_200_OK
+
+    @cache_response(cache="default", single_flight=True)
+    def post(self, request):
+        _SingleFlightView.calls += 1
+        time.sleep(SINGLE_FLIGHT_POLL_SECONDS * 5)
+        return Response({"calls": _SingleFlightView.calls}, status=_SingleFlightView.status_code)
+
+
+def _post_concurrently(view, request_data, count):
+    responses = [None] * count
+
+    def post(i):
+        responses[i] = view(APIRequestFactory().post("/api/v2/single_flight/", request_data, format="json"))
+
+    threads = [threading.Thread(target=post, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return responses
+
+
+def test_response_is_cached_compressed_and_served_from_the_envelope():
+    caches["default"].clear()
+    view = _CachedView.as_view()
+    request_data = {"filters": {"keywords": ["cached"]}}
+
+    first = view(APIRequestFactory().post("/api/v2/cached/", request_data, format="json"))
+    second = view(APIRequestFactory().post("/api/v2/cached/", request_data, format="json"))
+
+    assert first["Cache-Trace"] == "set-cache"
+    assert second["Cache-Trace"] == "hit-cache"
+    assert second.content == first.rendered_content
+    assert second["Content-Type"] == "application/json"
+    assert _CachedView.calls == 1
+
+    envelope = caches["default"].get(first["key"])
+    assert envelope[1] == 200
+    assert envelope[3] is True
+    assert len(envelope[4]) < len(first.rendered_content)
+    assert ("Cache-Trace", "set-cache") not in envelope[2]
+
+
+def test_small_bodies_are_not_compressed():
+    response = HttpResponse(b'{"results": []}', status=200, content_type="application/json")
+    envelope = pack_cached_response(response)
+
+    assert envelope[3:] == (False, b'{"results": []}')
+    assert unpack_cached_response(envelope).content == b'{"results": []}'
+
+
+def test_unknown_envelopes_are_cache_misses():
+    body = zlib.compress(b"{}")
+    assert unpack_cached_response(HttpResponse(b"{}")) is None  # pickled response, as formerly cached
+    assert unpack_cached_response((0, 200, [], True, body)) is None
+    assert unpack_cached_response(None) is None
+
+
+def test_concurrent_misses_are_computed_once():
+    caches["default"].clear()
+    _SingleFlightView.calls = 0
+    _SingleFlightView.status_code = status.HTTP_200_OK
+
+    responses = _post_concurrently(_SingleFlightView.as_view(), {"filters": {"keywords": ["single"]}}, 4)
+
+    assert _SingleFlightView.calls == 1
+    assert sorted(response["Cache-Trace"] for response in responses) == ["hit-cache"] * 3 + ["set-cache"]
+    assert len({response.content for response in responses}) == 1
+    assert caches["default"].get(f"{responses[0]['key']}:single-flight") is None
+
+
+def test_waiting_requests_compute_uncached_errors_themselves():
+    caches["default"].clear()
+    _SingleFlightView.calls = 0
+    _SingleFlightView.status_code = status.HTTP_400_BAD_REQUEST
+
+    responses = _post_concurrently(_SingleFlightView.as_view(), {"filters": {"keywords": ["error"]}}, 2)
+
+    assert _SingleFlightView.calls == 2
+    assert [response.status_code for response in responses] == [400, 400]
+    assert caches["default"].get(f"{responses[0]['key']}:single-flight") == SINGLE_FLIGHT_FAILED
+
+
+def test_failed_responses_are_computed_at_once_by_waiting_requests():
+    caches["default"].clear()
+    _SingleFlightView.calls = 0
+    _SingleFlightView.status_code = status.HTTP_400_BAD_REQUEST
+
+    start = time.monotonic()
+    responses = _post_concurrently(_SingleFlightView.as_view(), {"filters": {"keywords": ["errors"]}}, 4)
+
+    assert _SingleFlightView.calls == 4
+    assert [response.status_code for response in responses] == [400] * 4
+    # The waiting requests compute theirs together once the first fails, rather than one after another
+    assert time.monotonic() - start < SINGLE_FLIGHT_POLL_SECONDS * 5 * 3
@@ -0,0 +1,88 @@
+import io
+import os
+import pytest
+import zipfile
+
+from usaspending_api.common.helpers.s3_helpers import MULTIPART_UPLOAD_MIN_PART_SIZE, MultipartUploadStream
+
+
+class FakeS3Client:
+    """Stand-in for the multipart upload API of a boto3 S3 client, holding uploaded objects in memory"""
+
+    def __init__(self):
+        self.uploads = {}
+        self.objects = {}
+        self.aborted = []
+
+    def create_multipart_upload(self, Bucket, Key, ACL):
+        upload_id = f"upload-{len(self.uploads)}"
+        self.uploads[upload_id] = {}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.uploads[UploadId][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        bodies = self.uploads.pop(UploadId)
+        part_numbers = [part["PartNumber"] for part in MultipartUpload["Parts"]]
+        assert part_numbers == list(range(1, len(bodies) + 1))
+        assert all(len(bodies[part_number]) >= MULTIPART_UPLOAD_MIN_PART_SIZE for part_number in part_numbers[:-1])
+        self.objects[(Bucket, Key)] = b"".join(bodies[part_number] for part_number in part_numbers)
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        self.aborted.append(self.uploads.pop(UploadId))
+
+
+def test_zip_file_is_uploaded_in_parts_while_written():
+    s3_client = FakeS3Client()
+    data = os.urandom(2 * MULTIPART_UPLOAD_MIN_PART_SIZE + 1000)
+    upload_stream = MultipartUploadStream(
+        "bucket",
+        "region",
+        "/tmp/download.zip",
+        MULTIPART_UPLOAD_MIN_PART_SIZE,
+        max_pending_parts=1,
+        s3_client=s3_client,
+    )
+    with zipfile.ZipFile(upload_stream, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as zip_file:
+        zip_file.writestr("data.bin", data)
+        # With one pending part at a time, sending the second full part waited for the first to be uploaded
+        assert 1 in s3_client.uploads["upload-0"]
+        zip_file.writestr("readme.txt", "a readme")
+    upload_stream.close()
+
+    uploaded = s3_client.objects[("bucket", "download.zip")]
+    assert upload_stream.bytes_written == len(uploaded)
+    with zipfile.ZipFile(io.BytesIO(uploaded)) as zip_file:
+        assert zip_file.read("data.bin") == data
+        assert zip_file.read("readme.txt") == b"a readme"
+
+
+def test_small_upload_is_a_single_part():
+    s3_client = FakeS3Client()
+    upload_stream = MultipartUploadStream("bucket", "region", "download.zip", s3_client=s3_client)
+    upload_stream.write(b"tiny")
+    upload_stream.close()
+    upload_stream.abort()  # no-op once completed
+
+    assert s3_client.objects[("bucket", "download.zip")] == b"tiny"
+    assert s3_client.aborted == []
+
+
+def test_aborted_upload_discards_parts():
+    s3_client = FakeS3Client()
+    upload_stream = MultipartUploadStream(
+        "bucket", "region", "download.zip", MULTIPART_UPLOAD_MIN_PART_SIZE, s3_client=s3_client
+    )
+    upload_stream.write(os.urandom(MULTIPART_UPLOAD_MIN_PART_SIZE))
+    upload_stream.abort()
+    upload_stream.write(b"written after abort, e.g. by a ZipFile being garbage collected")
+
+    assert s3_client.objects == {}
+    assert len(s3_client.aborted) == 1
+
+
+def test_parts_must_meet_the_s3_minimum():
+    with pytest.raises(ValueError):
+        MultipartUploadStream("bucket", "region", "download.zip", part_size=1024, s3_client=FakeS3Client())
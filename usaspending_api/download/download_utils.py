@@ -1,10 +1,16 @@
+import hashlib
+
 from datetime import datetime, timezone
+from django.db.models import Max
+from typing import Optional
 
+from usaspending_api.broker.models import ExternalDataLoadDate
 from usaspending_api.common.helpers.text_helpers import slugify_text_for_file_names
 from usaspending_api.common.logging import get_remote_addr
 from usaspending_api.download.helpers import write_to_download_log
 from usaspending_api.download.lookups import VALUE_MAPPINGS
 from usaspending_api.references.models import ToptierAgency
+from usaspending_api.submissions.models import SubmissionAttributes
 
 
 def create_unique_filename(json_request, origination=None):
@@ -91,3 +97,23 @@ def construct_data_date_range(provided_filters: dict) -> str:
         if provided_filters.get("quarter") != 1:
             string += f"-Q{provided_filters.get('quarter')}"
     return string
+
+
+def get_data_load_date() -> Optional[datetime]:
+    """
+    When the data served by downloads last changed: the latest of the last load dates of external data (including the
+    Elasticsearch loads, which finish the nightly pipeline) and the latest publication of an agency submission
+    """
+    last_load_date = ExternalDataLoadDate.objects.aggregate(Max("last_load_date"))["last_load_date__max"]
+    last_published_date = SubmissionAttributes.objects.aggregate(Max("published_date"))["published_date__max"]
+    return max(filter(None, [last_load_date, last_published_date]), default=None)
+
+
+def create_request_fingerprint(ordered_json_request: str) -> str:
+    """
+    Fingerprint of a download request (JSON of its validated, ordered request) against the data it's run on. Requests
+    for the same download share a fingerprint until data is loaded again, so a DownloadJob with it can be reused.
+    Without any recorded data load, fingerprints change daily.
+    """
+    data_version = get_data_load_date() or datetime.now(timezone.utc).date()
+    return hashlib.sha256(f"{data_version.isoformat()}|{ordered_json_request}".encode()).hexdigest()
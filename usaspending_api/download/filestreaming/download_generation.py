@@ -1,9 +1,13 @@
+import io
 import json
 import logging
 import multiprocessing
 import os
+from collections import deque
+from contextlib import contextmanager
+from multiprocessing.sharedctypes import Synchronized
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import NamedTuple, Optional, Tuple, List
 
 import psutil as ps
 import re
@@ -12,6 +16,7 @@ import subprocess
 import tempfile
 import time
 import traceback
+import zipfile
 
 from datetime import datetime, timezone
 from ddtrace import tracer
@@ -23,7 +28,7 @@ from usaspending_api.awards.v2.lookups.lookups import contract_type_mapping, ass
 from usaspending_api.common.csv_helpers import count_rows_in_delimited_file, partition_large_delimited_file
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers.orm_helpers import generate_raw_quoted_query
-from usaspending_api.common.helpers.s3_helpers import multipart_upload
+from usaspending_api.common.helpers.s3_helpers import MultipartUploadStream, multipart_upload
 from usaspending_api.common.helpers.text_helpers import slugify_text_for_file_names
 from usaspending_api.common.retrieve_file_from_uri import RetrieveFileFromUri
 from usaspending_api.common.tracing import SubprocessTrace
@@ -31,8 +36,15 @@ from usaspending_api.download.download_utils import construct_data_date_range
 from usaspending_api.download.filestreaming import NAMING_CONFLICT_DISCRIMINATOR
 from usaspending_api.download.filestreaming.download_source import DownloadSource
 from usaspending_api.download.filestreaming.file_description import build_file_description, save_file_description
-from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
+from usaspending_api.download.filestreaming.zip_file import (
+    append_delimited_stream_to_zip_file,
+    append_files_to_zip_file,
+)
 from usaspending_api.download.helpers import verify_requested_columns_available, write_to_download_log as write_to_log
+from usaspending_api.download.helpers.elasticsearch_download_functions import (
+    discard_staged_download_ids,
+    staged_download_ids_sql,
+)
 from usaspending_api.download.lookups import JOB_STATUS_DICT, VALUE_MAPPINGS, FILE_FORMATS
 from usaspending_api.download.models import DownloadJob
 
@@ -64,6 +76,7 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
 
     file_name = start_download(download_job)
     working_dir = None
+    upload_stream = None
     try:
         # Create temporary files and working directory
         zip_file_path = settings.CSV_LOCAL_PATH + file_name
@@ -74,25 +87,28 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
         if not os.path.exists(working_dir):
             os.mkdir(working_dir)
 
+        zip_file = zip_file_path
+        if settings.DOWNLOAD_STREAMING_UPLOAD and not settings.IS_LOCAL:
+            # Write the zip file into a multipart upload to S3 as it's generated, rather than to disk for uploading after
+            upload_stream = MultipartUploadStream(
+                settings.BULK_DOWNLOAD_S3_BUCKET_NAME, settings.USASPENDING_AWS_REGION, file_name
+            )
+            zip_file = zipfile.ZipFile(
+                upload_stream,
+                "w",
+                compression=zipfile.ZIP_DEFLATED,
+                allowZip64=True,
+                compresslevel=settings.DOWNLOAD_COMPRESSION_LEVEL,
+            )
+
         write_to_log(message=f"Generating {file_name}", download_job=download_job)
 
         # Generate sources from the JSON request object
         sources = get_download_sources(json_request, origination)
-        for source in sources:
-            # Parse and write data to the file; if there are no matching columns for a source then add an empty file
-            source_column_count = len(source.columns(columns))
-            if source_column_count == 0:
-                create_empty_data_file(
-                    source, download_job, working_dir, piid, assistance_id, zip_file_path, file_format
-                )
-            else:
-                download_job.number_of_columns += source_column_count
-                parse_source(
-                    source, columns, download_job, working_dir, piid, assistance_id, zip_file_path, limit, file_format
-                )
+        parse_sources(sources, columns, download_job, working_dir, piid, assistance_id, zip_file, limit, file_format)
         include_data_dictionary = json_request.get("include_data_dictionary")
         if include_data_dictionary:
-            add_data_dictionary_to_zip(working_dir, zip_file_path)
+            add_data_dictionary_to_zip(working_dir, zip_file)
         include_file_description = json_request.get("include_file_description")
         if include_file_description:
             write_to_log(message="Adding file description to zip file")
@@ -101,8 +117,18 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
             file_description_path = save_file_description(
                 working_dir, include_file_description["destination"], file_description
             )
-            append_files_to_zip_file([file_description_path], zip_file_path)
-        download_job.file_size = os.stat(zip_file_path).st_size
+            append_files_to_zip_file([file_description_path], zip_file)
+        if upload_stream:
+            start_uploading = time.perf_counter()
+            zip_file.close()
+            upload_stream.close()
+            download_job.file_size = upload_stream.bytes_written
+            write_to_log(
+                message=f"Completing streamed upload took {time.perf_counter() - start_uploading:.2f}s",
+                download_job=download_job,
+            )
+        else:
+            download_job.file_size = os.stat(zip_file_path).st_size
     except InvalidParameterException as e:
         exc_msg = "InvalidParameterException was raised while attempting to process the DownloadJob"
         fail_download(download_job, e, exc_msg)
@@ -113,13 +139,17 @@ def generate_download(download_job: DownloadJob, origination: Optional[str] = No
         fail_download(download_job, e, exc_msg)
         raise Exception(download_job.error_message) from e
     finally:
+        if upload_stream:
+            # Discard the parts of an upload which wasn't completed; does nothing once it was
+            upload_stream.abort()
         # Remove working directory
         if working_dir and os.path.exists(working_dir):
             shutil.rmtree(working_dir)
+        discard_staged_download_ids()
         _kill_spawned_processes(download_job)
 
-    # push file to S3 bucket, if not local
-    if not settings.IS_LOCAL:
+    # push file to S3 bucket, if not local and not already streamed there
+    if not settings.IS_LOCAL and not upload_stream:
         with tracer.trace(
             name=f"job.{JOB_TYPE}.download.s3",
             service="bulk-download",
@@ -283,8 +313,70 @@ def build_data_file_name(source, download_job, piid, assistance_id):
     return data_file_name
 
 
-def parse_source(source, columns, download_job, working_dir, piid, assistance_id, zip_file_path, limit, file_format):
-    """Write to delimited text file(s) and zip file(s) using the source data"""
+class SourceExport(NamedTuple):
+    source: DownloadSource
+    data_file_name: str
+    source_path: str
+    psql_process: multiprocessing.Process
+    start_time: float
+    temp_file: int
+    temp_file_path: str
+    # Rows counted while streaming into the zip file, with DOWNLOAD_STREAM_TO_ZIP
+    row_count: Optional[Synchronized] = None
+
+
+def parse_sources(sources, columns, download_job, working_dir, piid, assistance_id, zip_file, limit, file_format):
+    """
+    Write each source to delimited text file(s) and zip file(s). Up to DOWNLOAD_MAX_CONCURRENT_EXPORTS sources are
+    exported by concurrent PSQL processes, but their files are always appended to the zip in source order. Sources
+    streamed straight into the zip (DOWNLOAD_STREAM_TO_ZIP) are exported one at a time, as they share the zip file.
+
+    zip_file is the path of the zip file, or a ZipFile open for writing (e.g. streaming to S3); the latter can only be
+    written by this process, so the files of each source are zipped here rather than in separate processes.
+    """
+    if settings.DOWNLOAD_STREAM_TO_ZIP:
+        max_concurrent_exports = 1
+    else:
+        max_concurrent_exports = max(1, settings.DOWNLOAD_MAX_CONCURRENT_EXPORTS)
+    in_progress = deque()  # (source, SourceExport or None if there are no matching columns) in source order
+    try:
+        for source in sources:
+            while sum(1 for _, export in in_progress if export) >= max_concurrent_exports:
+                _finish_source(
+                    *in_progress.popleft(), download_job, working_dir, piid, assistance_id, zip_file, file_format
+                )
+            export = None
+            source_column_count = len(source.columns(columns))
+            if source_column_count > 0:
+                download_job.number_of_columns += source_column_count
+                export = start_source_export(
+                    source, columns, download_job, working_dir, piid, assistance_id, zip_file, limit, file_format
+                )
+            in_progress.append((source, export))
+        while in_progress:
+            _finish_source(
+                *in_progress.popleft(), download_job, working_dir, piid, assistance_id, zip_file, file_format
+            )
+    finally:
+        # Remove temporary files of any exports left unfinished by an error; their processes are killed by the caller
+        for _, export in in_progress:
+            if export:
+                _remove_export_query_temp_file(export)
+
+
+def _finish_source(source, export, download_job, working_dir, piid, assistance_id, zip_file, file_format):
+    # If there are no matching columns for a source then add an empty file
+    if export is None:
+        create_empty_data_file(source, download_job, working_dir, piid, assistance_id, zip_file, file_format)
+    else:
+        finish_source_export(export, download_job, zip_file, file_format)
+
+
+def start_source_export(source, columns, download_job, working_dir, piid, assistance_id, zip_file, limit, file_format):
+    """
+    Start a separate process running the PSQL command which writes the source data to a delimited text file or, with
+    DOWNLOAD_STREAM_TO_ZIP, streams it directly into the zip file
+    """
 
     data_file_name = build_data_file_name(source, download_job, piid, assistance_id)
 
@@ -300,11 +392,63 @@ def parse_source(source, columns, download_job, working_dir, piid, assistance_id
     temp_file, temp_file_path = generate_export_query_temp_file(export_query, download_job)
 
     start_time = time.perf_counter()
+    row_count = None
     try:
-        # Create a separate process to run the PSQL command; wait
-        psql_process = multiprocessing.Process(target=execute_psql, args=(temp_file_path, source_path, download_job))
-        psql_process.start()
-        wait_for_process(psql_process, start_time, download_job)
+        if settings.DOWNLOAD_STREAM_TO_ZIP and isinstance(zip_file, zipfile.ZipFile):
+            # Only this process can write to the zip file, so the PSQL output is streamed here when finishing the source
+            row_count = multiprocessing.Value("q", 0)
+            psql_process = None
+        elif settings.DOWNLOAD_STREAM_TO_ZIP:
+            row_count = multiprocessing.Value("q", 0)
+            psql_process = multiprocessing.Process(
+                target=stream_psql_to_zip,
+                args=(
+                    temp_file_path,
+                    zip_file,
+                    data_file_name,
+                    file_format,
+                    row_count,
+                    download_job,
+                    source.compression_level,
+                ),
+            )
+        else:
+            psql_process = multiprocessing.Process(
+                target=execute_psql, args=(temp_file_path, source_path, download_job)
+            )
+        if psql_process:
+            psql_process.start()
+    except Exception:
+        os.close(temp_file)
+        os.remove(temp_file_path)
+        raise
+
+    return SourceExport(
+        source, data_file_name, source_path, psql_process, start_time, temp_file, temp_file_path, row_count
+    )
+
+
+def finish_source_export(export, download_job, zip_file, file_format):
+    """Wait for the PSQL process of a source, then split its delimited text file into the zip file"""
+    try:
+        if export.psql_process is None:
+            stream_psql_to_zip(
+                export.temp_file_path,
+                zip_file,
+                export.data_file_name,
+                file_format,
+                export.row_count,
+                download_job,
+                export.source.compression_level,
+            )
+        else:
+            wait_for_process(export.psql_process, export.start_time, download_job)
+
+        if export.row_count is not None:
+            # The rows were already counted, split and zipped as they streamed from PSQL
+            download_job.number_of_rows += export.row_count.value
+            download_job.save()
+            return
 
         delim = FILE_FORMATS[file_format]["delimiter"]
 
@@ -312,7 +456,7 @@ def parse_source(source, columns, download_job, working_dir, piid, assistance_id
         write_to_log(message="Counting rows in delimited text file", download_job=download_job)
         try:
             download_job.number_of_rows += count_rows_in_delimited_file(
-                filename=source_path, has_header=True, delimiter=delim
+                filename=export.source_path, has_header=True, delimiter=delim
             )
         except Exception:
             write_to_log(
@@ -320,23 +464,42 @@ def parse_source(source, columns, download_job, working_dir, piid, assistance_id
             )
         download_job.save()
 
-        # Create a separate process to split the large data files into smaller file and write to zip; wait
-        zip_process = multiprocessing.Process(
-            target=split_and_zip_data_files,
-            args=(zip_file_path, source_path, data_file_name, file_format, download_job),
-        )
-        zip_process.start()
-        wait_for_process(zip_process, start_time, download_job)
+        zip_args = (zip_file, export.source_path, export.data_file_name, file_format, download_job)
+        zip_kwargs = {
+            "compression_level": export.source.compression_level,
+            "gzip_members": bool(download_job.monthly_download and settings.MONTHLY_DOWNLOAD_GZIP_MEMBERS),
+        }
+        if isinstance(zip_file, zipfile.ZipFile):
+            split_and_zip_data_files(*zip_args, **zip_kwargs)
+        else:
+            # Create a separate process to split the large data files into smaller file and write to zip; wait
+            zip_process = multiprocessing.Process(target=split_and_zip_data_files, args=zip_args, kwargs=zip_kwargs)
+            zip_process.start()
+            wait_for_process(zip_process, export.start_time, download_job)
         download_job.save()
-    except Exception as e:
-        raise e
     finally:
-        # Remove temporary files
-        os.close(temp_file)
-        os.remove(temp_file_path)
+        _remove_export_query_temp_file(export)
+
 
+def _remove_export_query_temp_file(export):
+    if os.path.exists(export.temp_file_path):
+        os.close(export.temp_file)
+        os.remove(export.temp_file_path)
 
-def split_and_zip_data_files(zip_file_path, source_path, data_file_name, file_format, download_job=None):
+
+def split_and_zip_data_files(
+    zip_file_path,
+    source_path,
+    data_file_name,
+    file_format,
+    download_job=None,
+    compression_level: Optional[int] = None,
+    gzip_members: bool = False,
+):
+    """
+    Split a delimited text file into files of at most EXCEL_ROW_LIMIT rows and add them to the zip file, compressed
+    at compression_level by DOWNLOAD_COMPRESSION_PROCESSES processes (see append_files_to_zip_file)
+    """
     with SubprocessTrace(
         name=f"job.{JOB_TYPE}.download.zip",
         service="bulk-download",
@@ -364,10 +527,19 @@ def split_and_zip_data_files(zip_file_path, source_path, data_file_name, file_fo
             # Zip the split files into one zipfile
             write_to_log(message="Beginning zipping and compression", download_job=download_job)
             log_time = time.perf_counter()
-            append_files_to_zip_file(list_of_files, zip_file_path)
+            append_files_to_zip_file(
+                list_of_files,
+                zip_file_path,
+                compression_level=compression_level,
+                processes=settings.DOWNLOAD_COMPRESSION_PROCESSES,
+                gzip_members=gzip_members,
+            )
 
+            duration = time.perf_counter() - log_time
+            file_size = sum(os.path.getsize(file_path) for file_path in list_of_files)
             write_to_log(
-                message=f"Writing to zipfile took {time.perf_counter() - log_time:.4f}s", download_job=download_job
+                message=f"Writing to zipfile took {duration:.4f}s ({file_size / duration / 1e6:.1f} MB/s)",
+                download_job=download_job,
             )
 
         except Exception as e:
@@ -445,7 +617,8 @@ def generate_export_query(source_query, limit, source, columns, file_format):
         source_query = source_query[:limit]
     query_annotated = apply_annotations_to_sql(generate_raw_quoted_query(source_query), source.columns(columns))
     options = FILE_FORMATS[file_format]["options"]
-    return r"\COPY ({}) TO STDOUT {}".format(query_annotated, options)
+    # Any ids staged from Elasticsearch are loaded into temporary tables by the same psql session, ahead of the query
+    return staged_download_ids_sql(query_annotated) + r"\COPY ({}) TO STDOUT {}".format(query_annotated, options)
 
 
 def generate_export_query_temp_file(export_query, download_job, temp_dir=None):
@@ -569,35 +742,15 @@ def _top_level_split(sql, splitter):
 
 def execute_psql(temp_sql_file_path, source_path, download_job):
     """Executes a single PSQL command within its own Subprocess"""
-    download_sql = Path(temp_sql_file_path).read_text()
-    if download_sql.startswith("\\COPY"):
-        # Trace library parses the SQL, but cannot understand the psql-specific \COPY command. Use standard COPY here.
-        download_sql = download_sql[1:]
-    # Stack 3 context managers: (1) psql code, (2) Download replica query, (3) (same) Postgres query
-    with SubprocessTrace(
-        name=f"job.{JOB_TYPE}.download.psql",
-        service="bulk-download",
-        resource=download_sql,
-        span_type=SpanTypes.SQL,
-        source_path=source_path,
-    ), tracer.trace(
-        name="postgres.query", service="db_downloaddb", resource=download_sql, span_type=SpanTypes.SQL
-    ), tracer.trace(
-        name="postgres.query", service="postgres", resource=download_sql, span_type=SpanTypes.SQL
-    ):
+    with _trace_psql(temp_sql_file_path, source_path=source_path):
         try:
             log_time = time.perf_counter()
-            temp_env = os.environ.copy()
-            if download_job and not download_job.monthly_download:
-                # Since terminating the process isn't guaranteed to end the DB statement, add timeout to client connection
-                temp_env["PGOPTIONS"] = f"--statement-timeout={settings.DOWNLOAD_DB_TIMEOUT_IN_HOURS}h"
-
             cat_command = subprocess.Popen(["cat", temp_sql_file_path], stdout=subprocess.PIPE)
             subprocess.check_output(
                 ["psql", "-q", "-o", source_path, retrieve_db_string(), "-v", "ON_ERROR_STOP=1"],
                 stdin=cat_command.stdout,
                 stderr=subprocess.STDOUT,
-                env=temp_env,
+                env=_psql_env(download_job),
             )
 
             duration = time.perf_counter() - log_time
@@ -605,15 +758,95 @@ def execute_psql(temp_sql_file_path, source_path, download_job):
                 message=f"Wrote {os.path.basename(source_path)}, took {duration:.4f} seconds", download_job=download_job
             )
         except Exception as e:
-            if not settings.IS_LOCAL:
-                # Not logging the command as it can contain the database connection string
-                e.cmd = "[redacted psql command]"
-            logger.error(e)
-            sql = subprocess.check_output(["cat", temp_sql_file_path]).decode()
-            logger.error(f"Faulty SQL: {sql}")
+            _log_psql_error(e, temp_sql_file_path)
             raise e
 
 
+def stream_psql_to_zip(
+    temp_sql_file_path, zip_file, data_file_name, file_format, row_count, download_job, compression_level=None
+):
+    """
+    Executes a single PSQL command within its own Subprocess, consuming its output in one pass: rows are counted (into
+    the shared row_count Value), split every EXCEL_ROW_LIMIT rows and deflated at compression_level into the zip file
+    as they arrive, instead of being written to a delimited text file which is then re-read to count, split and zip it.
+    Entries are always deflated as they stream; MONTHLY_DOWNLOAD_GZIP_MEMBERS only applies to files zipped afterwards.
+    """
+    extension = FILE_FORMATS[file_format]["extension"]
+    with _trace_psql(temp_sql_file_path, zip_file_path=zip_file if isinstance(zip_file, str) else "[streamed]"):
+        try:
+            log_time = time.perf_counter()
+            # PSQL's errors and notices go to a file rather than a pipe, which could fill up (blocking PSQL) while
+            # only its output is read
+            with open(temp_sql_file_path) as sql_file, tempfile.TemporaryFile() as error_file, subprocess.Popen(
+                ["psql", "-q", retrieve_db_string(), "-v", "ON_ERROR_STOP=1"],
+                stdin=sql_file,
+                stdout=subprocess.PIPE,
+                stderr=error_file,
+                env=_psql_env(download_job),
+            ) as psql_process:
+                entry_names, row_count.value = append_delimited_stream_to_zip_file(
+                    stream=io.TextIOWrapper(psql_process.stdout, encoding="utf-8", newline=""),
+                    zip_file_path=zip_file,
+                    delimiter=FILE_FORMATS[file_format]["delimiter"],
+                    row_limit=EXCEL_ROW_LIMIT,
+                    entry_name_template=f"{data_file_name}_%s.{extension}",
+                    compression_level=compression_level,
+                )
+                psql_process.wait()
+                error_file.seek(0)
+                psql_errors = error_file.read()
+            if psql_process.returncode != 0:
+                raise subprocess.CalledProcessError(psql_process.returncode, psql_process.args, stderr=psql_errors)
+
+            duration = time.perf_counter() - log_time
+            write_to_log(
+                message=f"Streamed {row_count.value} rows into {len(entry_names)} zipped files, took {duration:.4f}s",
+                download_job=download_job,
+            )
+        except Exception as e:
+            _log_psql_error(e, temp_sql_file_path)
+            raise e
+
+
+@contextmanager
+def _trace_psql(temp_sql_file_path, **span_tags):
+    download_sql = Path(temp_sql_file_path).read_text()
+    if "\\COPY" in download_sql:
+        # Trace library parses the SQL, but cannot understand the psql-specific \COPY command. Use standard COPY here,
+        # without any commands staging ids ahead of it.
+        download_sql = download_sql[download_sql.index("\\COPY") + 1 :]
+    # Stack 3 context managers: (1) psql code, (2) Download replica query, (3) (same) Postgres query
+    with SubprocessTrace(
+        name=f"job.{JOB_TYPE}.download.psql",
+        service="bulk-download",
+        resource=download_sql,
+        span_type=SpanTypes.SQL,
+        **span_tags,
+    ), tracer.trace(
+        name="postgres.query", service="db_downloaddb", resource=download_sql, span_type=SpanTypes.SQL
+    ), tracer.trace(
+        name="postgres.query", service="postgres", resource=download_sql, span_type=SpanTypes.SQL
+    ):
+        yield
+
+
+def _psql_env(download_job):
+    temp_env = os.environ.copy()
+    if download_job and not download_job.monthly_download:
+        # Since terminating the process isn't guaranteed to end the DB statement, add timeout to client connection
+        temp_env["PGOPTIONS"] = f"--statement-timeout={settings.DOWNLOAD_DB_TIMEOUT_IN_HOURS}h"
+    return temp_env
+
+
+def _log_psql_error(e, temp_sql_file_path):
+    if not settings.IS_LOCAL:
+        # Not logging the command as it can contain the database connection string
+        e.cmd = "[redacted psql command]"
+    logger.error(e)
+    sql = subprocess.check_output(["cat", temp_sql_file_path]).decode()
+    logger.error(f"Faulty SQL: {sql}")
+
+
 def retrieve_db_string():
     """It is necessary for this to be a function so the test suite can mock the connection string"""
     return settings.DOWNLOAD_DATABASE_URL
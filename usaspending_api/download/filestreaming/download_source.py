@@ -1,3 +1,5 @@
+from django.conf import settings
+
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.download.lookups import VALUE_MAPPINGS
 from usaspending_api.download.v2 import download_column_historical_lookups
@@ -24,6 +26,9 @@ class DownloadSource:
         self.is_for_idv = VALUE_MAPPINGS[source_type].get("is_for_idv", False)
         self.is_for_contract = VALUE_MAPPINGS[source_type].get("is_for_contract", False)
         self.is_for_assistance = VALUE_MAPPINGS[source_type].get("is_for_assistance", False)
+        self.compression_level = VALUE_MAPPINGS[source_type].get(
+            "compression_level", settings.DOWNLOAD_COMPRESSION_LEVEL
+        )
         self.award_category = None
         self.filters = filters or {}
 
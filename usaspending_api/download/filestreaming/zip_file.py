@@ -1,11 +1,54 @@
+import csv
+import io
+import multiprocessing
 import os
+import shutil
 import zipfile
+import zlib
 
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional, TextIO, Tuple, Union
 
-def append_files_to_zip_file(file_paths, zip_file_path):
+COMPRESSION_CHUNK_SIZE = 1024 * 1024
+# ZipFile internals written to directly by write_compressed_file_to_zip_file, as they are by ZipFile._open_to_write()
+# in CPython 3.7 through 3.12. test_zip_file.py reads back archives written this way; rerun it on Python upgrades.
+ZIPFILE_WRITE_INTERNALS = ("_lock", "_writing", "_seekable", "_writecheck", "_didModify", "start_dir")
+
+
+class CompressedFile(NamedTuple):
+    """A file compressed ahead of being added to a zip archive, as the data of a member with the given attributes"""
+
+    compressed_path: str
+    compress_type: int
+    CRC: int
+    file_size: int
+    compress_size: int
+
+
+@contextmanager
+def open_zip_file(zip_file_path: Union[str, zipfile.ZipFile]):
+    """
+    Open the zip archive at zip_file_path for appending, closing it afterwards. An already open ZipFile (e.g. one
+    streaming to S3 as it's written) is used as is, and left open for the next files.
+    """
+    if isinstance(zip_file_path, zipfile.ZipFile):
+        yield zip_file_path
+    else:
+        with zipfile.ZipFile(zip_file_path, "a", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
+            yield zip_file
+
+
+def append_files_to_zip_file(
+    file_paths, zip_file_path, compression_level: Optional[int] = None, processes: int = 1, gzip_members: bool = False
+):
     """
     Create zip archive at the specified zip_file_path if it does not exist, and add all the files at provided
-    file_paths to it.
+    file_paths to it. zip_file_path may instead be an already open ZipFile, which the files are written to.
+
+    Files are deflated with the zlib compression_level (default: that of the archive). With more than one process,
+    the files are compressed concurrently by a pool of that many processes, then written to the archive in order.
+    With gzip_members, each file is instead added as a gzip file (named with a ".gz" suffix) stored in the archive
+    uncompressed, so that it can be extracted and decompressed on its own by standard tools.
 
     NOTE: If a zip file already exists at zip_file_path, the given files will be added in addition to the ones
     already in the zip when using append (`a`) mode. If that zip contains a file with the same name as one provided,
@@ -13,7 +56,166 @@ def append_files_to_zip_file(file_paths, zip_file_path):
     Use caution in this case by removing the zip in the finally of an exception and also checking for and removing
     the zip if it exists before you begin to create it from scratch
     """
-    with zipfile.ZipFile(zip_file_path, "a", compression=zipfile.ZIP_DEFLATED, allowZip64=True) as zip_file:
-        for file_path in file_paths:
-            archive_name = os.path.basename(file_path)
-            zip_file.write(file_path, archive_name)
+    with open_zip_file(zip_file_path) as zip_file:
+        if gzip_members or (processes > 1 and len(file_paths) > 1):
+            _append_compressed_files_to_zip_file(file_paths, zip_file, compression_level, processes, gzip_members)
+        else:
+            for file_path in file_paths:
+                archive_name = os.path.basename(file_path)
+                zip_file.write(file_path, archive_name, compresslevel=compression_level)
+
+
+def _append_compressed_files_to_zip_file(file_paths, zip_file, compression_level, processes, gzip_members):
+    if compression_level is None:
+        compression_level = zlib.Z_DEFAULT_COMPRESSION if zip_file.compresslevel is None else zip_file.compresslevel
+    compress_args = [(file_path, compression_level, gzip_members) for file_path in file_paths]
+    pool = None
+    if processes > 1 and len(file_paths) > 1:
+        pool = multiprocessing.Pool(min(processes, len(file_paths)))
+        # Results come back in order, so each file is zipped as soon as it and those before it are compressed
+        compressed_files = pool.imap(_compress_file, compress_args)
+    else:
+        compressed_files = map(_compress_file, compress_args)
+    try:
+        for file_path, compressed_file in zip(file_paths, compressed_files):
+            archive_name = os.path.basename(compressed_file.compressed_path if gzip_members else file_path)
+            try:
+                write_compressed_file_to_zip_file(zip_file, file_path, archive_name, compressed_file)
+            finally:
+                os.remove(compressed_file.compressed_path)
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+            # Remove what was compressed ahead of a file which failed to zip
+            for file_path in file_paths:
+                for suffix in (".deflate", ".gz"):
+                    if os.path.exists(file_path + suffix):
+                        os.remove(file_path + suffix)
+
+
+def _compress_file(args: Tuple[str, int, bool]) -> CompressedFile:
+    """
+    Compress a file, next to it, into the data of a zip archive member: raw deflate output, or with gzip_member a
+    complete gzip file (which is stored in the archive as is)
+    """
+    file_path, compression_level, gzip_member = args
+    compressed_path = file_path + (".gz" if gzip_member else ".deflate")
+    # Negative window bits produce raw deflate output, as zipfile does; adding 16 produces a gzip header and trailer
+    compressor = zlib.compressobj(
+        compression_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS if gzip_member else -zlib.MAX_WBITS
+    )
+    crc = file_size = compressed_crc = 0
+    with open(file_path, "rb") as source, open(compressed_path, "wb") as target:
+        for chunk in iter(lambda: source.read(COMPRESSION_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            compressed = compressor.compress(chunk)
+            compressed_crc = zlib.crc32(compressed, compressed_crc)
+            target.write(compressed)
+        compressed = compressor.flush()
+        compressed_crc = zlib.crc32(compressed, compressed_crc)
+        target.write(compressed)
+    compress_size = os.path.getsize(compressed_path)
+    if gzip_member:
+        return CompressedFile(compressed_path, zipfile.ZIP_STORED, compressed_crc, compress_size, compress_size)
+    return CompressedFile(compressed_path, zipfile.ZIP_DEFLATED, crc, file_size, compress_size)
+
+
+def write_compressed_file_to_zip_file(
+    zip_file: zipfile.ZipFile, file_path: str, archive_name: str, compressed_file: CompressedFile
+):
+    """
+    Add an archive member for file_path whose data was already compressed (see _compress_file). Its CRC and sizes
+    are known, so the member is written with a complete local header, to a seekable file or a stream alike.
+
+    zipfile has no public API for writing already compressed data, so this follows ZipFile._open_to_write() (see
+    ZIPFILE_WRITE_INTERNALS). Should those internals be missing, the file is written with ZipFile.write() instead,
+    compressed again at the archive's level.
+    """
+    if not all(hasattr(zip_file, internal) for internal in ZIPFILE_WRITE_INTERNALS):
+        if compressed_file.compress_type == zipfile.ZIP_STORED:
+            zip_file.write(compressed_file.compressed_path, archive_name, compress_type=zipfile.ZIP_STORED)
+        else:
+            zip_file.write(file_path, archive_name, compress_type=compressed_file.compress_type)
+        return
+
+    zinfo = zipfile.ZipInfo.from_file(file_path, archive_name)
+    zinfo.compress_type = compressed_file.compress_type
+    zinfo.CRC = compressed_file.CRC
+    zinfo.file_size = compressed_file.file_size
+    zinfo.compress_size = compressed_file.compress_size
+    zip64 = max(zinfo.file_size, zinfo.compress_size) > zipfile.ZIP64_LIMIT
+    with zip_file._lock:
+        if zip_file._writing:
+            raise ValueError("Can't write to the ZIP file while there is another write handle open on it.")
+        if zip_file._seekable:
+            zip_file.fp.seek(zip_file.start_dir)
+        zinfo.header_offset = zip_file.fp.tell()
+        zip_file._writecheck(zinfo)
+        zip_file._didModify = True
+        zip_file.fp.write(zinfo.FileHeader(zip64))
+        with open(compressed_file.compressed_path, "rb") as compressed:
+            shutil.copyfileobj(compressed, zip_file.fp, COMPRESSION_CHUNK_SIZE)
+        zip_file.filelist.append(zinfo)
+        zip_file.NameToInfo[zinfo.filename] = zinfo
+        zip_file.start_dir = zip_file.fp.tell()
+
+
+def append_delimited_stream_to_zip_file(
+    stream: TextIO,
+    zip_file_path: Union[str, zipfile.ZipFile],
+    delimiter: str,
+    row_limit: int,
+    entry_name_template: str,
+    compression_level: Optional[int] = None,
+) -> Tuple[List[str], int]:
+    """
+    Parse a delimited text stream (with a header row) once, writing its rows straight into new entries of the zip
+    archive at zip_file_path, deflated with the zlib compression_level (default: that of the archive). A new entry,
+    named from the %s-style entry_name_template and starting with the header, is begun every row_limit rows. Returns
+    the names of the entries written and the number of rows (excluding headers).
+
+    This produces the same entries as writing the stream to a file and using partition_large_delimited_file() then
+    append_files_to_zip_file(), without the delimited file(s) ever being written to disk.
+    """
+    reader = csv.reader(stream, delimiter=delimiter)
+    header = next(reader, [])
+    entry_names = []
+    row_count = 0
+    with open_zip_file(zip_file_path) as zip_file:
+        entry = writer = None
+        try:
+            for row in reader:
+                if row_count % row_limit == 0:
+                    entry, writer = _new_delimited_zip_entry(
+                        zip_file, entry, entry_names, entry_name_template, delimiter, header, compression_level
+                    )
+                writer.writerow(row)
+                row_count += 1
+            if not entry_names:
+                # Like an empty delimited file, an empty stream still gets an entry with just the header
+                entry, writer = _new_delimited_zip_entry(
+                    zip_file, entry, entry_names, entry_name_template, delimiter, header, compression_level
+                )
+        finally:
+            if entry:
+                entry.close()
+    return entry_names, row_count
+
+
+def _new_delimited_zip_entry(
+    zip_file, previous_entry, entry_names, entry_name_template, delimiter, header, compression_level
+):
+    if previous_entry:
+        previous_entry.close()
+    entry_names.append(entry_name_template % (len(entry_names) + 1))
+    # As ZipFile.open() sets up entries given by name, but at compression_level
+    zinfo = zipfile.ZipInfo(entry_names[-1])
+    zinfo.compress_type = zip_file.compression
+    zinfo._compresslevel = zip_file.compresslevel if compression_level is None else compression_level
+    # Entry sizes aren't known up front, so always allow them to exceed the 2GB limit of non-ZIP64 entries
+    entry = io.TextIOWrapper(zip_file.open(zinfo, "w", force_zip64=True), encoding="utf-8", newline="")
+    writer = csv.writer(entry, delimiter=delimiter)
+    writer.writerow(header)
+    return entry, writer
@@ -1,7 +1,9 @@
-import itertools
 import logging
+import os
+import tempfile
 from abc import ABCMeta, abstractmethod
 from typing import Union, List
+from uuid import uuid4
 
 from django.conf import settings
 from django.db.models import QuerySet
@@ -13,6 +15,11 @@ from usaspending_api.search.models import AwardSearchView, TransactionSearch as
 
 logger = logging.getLogger(__name__)
 
+STAGED_IDS_TABLE_PREFIX = "temp_download_ids_"
+
+# Name of each temporary id table referenced by a download query -> file of the ids to COPY into it
+_staged_id_files = {}
+
 
 class _ElasticsearchDownload(metaclass=ABCMeta):
     _source_field = None
@@ -58,16 +65,50 @@ class _ElasticsearchDownload(metaclass=ABCMeta):
             yield results
 
     @classmethod
-    def _get_download_ids(cls, filters: dict, size: int = 10000) -> QuerySet:
+    def _get_download_ids_search_after(cls, search: Union[AwardSearch, TransactionSearch], size: int):
         """
-        Takes a dictionary of the different download filters and returns a flattened list of ids.
+        Alternative to _get_download_ids_generator that pages through the matching documents in one pass, sorted on
+        the (unique) id field and using search_after from the last id of each page. Only the sort values are returned,
+        which come from the id doc-values, so no _source is loaded and no aggregation is built per page.
+        """
+        max_retries = 10
+        search = search.source(False).sort(cls._source_field).extra(size=size, track_total_hits=False)
+        search_after = None
+        while True:
+            page = search.extra(search_after=search_after) if search_after else search
+            response = page.handle_execute(retries=max_retries)
+            if response is None:
+                raise Exception("Breaking generator, unable to reach cluster")
+            hits = response.to_dict()["hits"]["hits"]
+            if hits:
+                yield [hit["sort"][0] for hit in hits]
+            if len(hits) < size:
+                return
+            search_after = hits[-1]["sort"]
+
+    @classmethod
+    def _stage_download_ids(cls, filters: dict, size: int = 10000) -> str:
+        """
+        Takes a dictionary of the different download filters and writes the matching ids to a file as each partition
+        arrives from Elasticsearch. Returns the name of the temporary table the download query should join against;
+        the ids are COPY'd into it by the psql session running that query (see staged_download_ids_sql).
         """
         filter_query = cls._filter_query_func(filters)
         search = cls._search_type().filter(filter_query).source([cls._source_field])
-        ids = cls._get_download_ids_generator(search, size)
-        flat_ids = list(itertools.chain.from_iterable(ids))
-        logger.info(f"Found {len(flat_ids)} {cls._source_field} based on filters")
-        return flat_ids
+        if settings.ES_DOWNLOAD_ID_COLLECTION == "search_after":
+            id_generator = cls._get_download_ids_search_after
+        else:
+            id_generator = cls._get_download_ids_generator
+        table_name = f"{STAGED_IDS_TABLE_PREFIX}{uuid4().hex}"
+        temp_file, temp_file_path = tempfile.mkstemp(prefix=f"{table_name}_", suffix=".txt")
+        id_count = 0
+        with os.fdopen(temp_file, "w") as f:
+            for ids in id_generator(search, size):
+                f.writelines(f"{value}\n" for value in ids)
+                id_count += len(ids)
+        _staged_id_files[table_name] = temp_file_path
+        logger.info(f"Found {id_count} {cls._source_field} based on filters; staged for {table_name}")
+        return table_name
 
     @classmethod
     @abstractmethod
@@ -83,10 +124,8 @@ class AwardsElasticsearchDownload(_ElasticsearchDownload):
     @classmethod
     def query(cls, filters: dict, values: List[str] = None) -> QuerySet:
         base_queryset = AwardSearchView.objects.all()
-        flat_ids = cls._get_download_ids(filters)
-        queryset = base_queryset.extra(
-            where=[f'"vw_award_search"."award_id" = ANY(SELECT UNNEST(ARRAY{flat_ids}::INTEGER[]))']
-        )
+        table_name = cls._stage_download_ids(filters)
+        queryset = base_queryset.extra(where=[f'"vw_award_search"."award_id" IN (SELECT "id" FROM {table_name})'])
         if values:
             queryset = queryset.values(*values)
         return queryset
@@ -100,8 +139,31 @@ class TransactionsElasticsearchDownload(_ElasticsearchDownload):
     @classmethod
     def query(cls, filters: dict) -> QuerySet:
         base_queryset = TransactionSearchModel.objects.all()
-        flat_ids = cls._get_download_ids(filters)
-        queryset = base_queryset.extra(
-            where=[f'"transaction_normalized"."id" = ANY(SELECT UNNEST(ARRAY{flat_ids}::INTEGER[]))']
-        )
+        table_name = cls._stage_download_ids(filters)
+        queryset = base_queryset.extra(where=[f'"transaction_normalized"."id" IN (SELECT "id" FROM {table_name})'])
         return queryset
+
+
+def staged_download_ids_sql(download_sql: str) -> str:
+    """
+    Returns the psql commands that create and load (client-side, via \\copy) the temporary id tables joined by the
+    given download SQL. They must run in the same psql session as the download query, ahead of it, and are quiet so
+    their command tags never end up in the psql output alongside the downloaded rows.
+    """
+    commands = []
+    for table_name, file_path in _staged_id_files.items():
+        if table_name in download_sql:
+            if not commands:
+                commands.append("\\set QUIET on\n")
+            commands.append(f'CREATE TEMPORARY TABLE {table_name} ("id" INTEGER NOT NULL);\n')
+            commands.append(f"\\copy {table_name} FROM '{file_path}'\n")
+            commands.append(f"ANALYZE {table_name};\n")
+    return "".join(commands)
+
+
+def discard_staged_download_ids() -> None:
+    """Removes the id files staged by this process; their temporary tables die with the psql sessions using them"""
+    for file_path in _staged_id_files.values():
+        if os.path.exists(file_path):
+            os.remove(file_path)
+    _staged_id_files.clear()
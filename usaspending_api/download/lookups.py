@@ -96,6 +96,9 @@ VALUE_MAPPINGS = {
         "assistance_data": "transaction__assistance_data",
         "filter_function": transaction_search_filter,
         "annotations_function": transaction_search_annotations,
+        # The largest downloads, whose compression takes the longest: zlib level 1 deflates CSVs ~3x faster than the
+        # default level 6, for archives ~15-35% larger
+        "compression_level": 1,
     },
     # Elasticsearch Transaction Level
     "elasticsearch_transactions": {
@@ -108,6 +111,7 @@ VALUE_MAPPINGS = {
         "assistance_data": "transaction__assistance_data",
         "filter_function": TransactionsElasticsearchDownload.query,
         "annotations_function": transaction_search_annotations,
+        "compression_level": 1,  # as for "transactions"
     },
     # SubAward Level
     "sub_awards": {
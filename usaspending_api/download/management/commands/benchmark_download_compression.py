@@ -0,0 +1,100 @@
+import csv
+import gzip
+import logging
+import os
+import shutil
+import tempfile
+import zipfile
+
+from django.core.management.base import BaseCommand
+from random import Random
+from time import perf_counter
+from typing import List
+
+from usaspending_api.common.csv_helpers import partition_large_delimited_file
+from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
+
+logger = logging.getLogger("script")
+
+
+class Command(BaseCommand):
+    help = """
+    Compare the throughput and compression ratio of zipping the split files of a download serially, with a pool of
+    compression processes (see DOWNLOAD_COMPRESSION_PROCESSES) and as gzipped members (see
+    MONTHLY_DOWNLOAD_GZIP_MEMBERS), at several compression levels, and verify every archive holds the same data.
+    Uses a provided delimited text file or synthetic download rows; does not touch the database or S3.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", type=str, help="Delimited text file to split and zip, instead of synthetic rows")
+        parser.add_argument("--delimiter", type=str, default=",", help="Delimiter of the provided file")
+        parser.add_argument("--rows", type=int, default=2000000, help="Number of synthetic rows")
+        parser.add_argument("--row-limit", type=int, default=250000, help="Rows per split file")
+        parser.add_argument("--levels", type=int, nargs="+", default=[1, 6, 9], help="zlib compression levels")
+        parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Size of the compression pool")
+
+    def handle(self, *args, **options):
+        working_dir = tempfile.mkdtemp(prefix="benchmark_download_compression_")
+        try:
+            source_path = options["file"] or generate_download_file(working_dir, options["rows"])
+            file_paths = partition_large_delimited_file(
+                file_path=source_path,
+                delimiter=options["delimiter"],
+                row_limit=options["row_limit"],
+                output_name_template=os.path.join(working_dir, "part_%s.csv"),
+            )
+            file_size = sum(os.path.getsize(file_path) for file_path in file_paths)
+            logger.info(f"Zipping {len(file_paths)} files of {file_size / 1e6:,.1f} MB in total")
+
+            modes = {
+                "serial": {"processes": 1},
+                "pool": {"processes": options["processes"]},
+                "gzip pool": {"processes": options["processes"], "gzip_members": True},
+            }
+            for level in options["levels"]:
+                for mode, mode_kwargs in modes.items():
+                    zip_file_path = os.path.join(working_dir, "benchmark.zip")
+                    start = perf_counter()
+                    append_files_to_zip_file(file_paths, zip_file_path, compression_level=level, **mode_kwargs)
+                    duration = perf_counter() - start
+                    verify_zip_file(zip_file_path, file_paths)
+                    ratio = file_size / os.path.getsize(zip_file_path)
+                    logger.info(
+                        f"level {level} {mode:>9}: {file_size / duration / 1e6:,.1f} MB/s ({duration:.2f}s), "
+                        f"compression ratio {ratio:.2f}"
+                    )
+                    os.remove(zip_file_path)
+        finally:
+            shutil.rmtree(working_dir)
+
+
+def generate_download_file(working_dir: str, row_count: int) -> str:
+    """Write a CSV file with repetition of values like that of award download rows"""
+    rng = Random(0)
+    file_path = os.path.join(working_dir, "download.csv")
+    with open(file_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["award_id_piid", "total_obligation", "action_date", "recipient_name", "awarding_agency_name"])
+        for i in range(row_count):
+            agency_id = rng.randrange(100)
+            writer.writerow(
+                [
+                    f"{agency_id:04}{i:012}",
+                    f"{rng.randrange(10 ** 7) / 100:.2f}",
+                    f"20{rng.randrange(8, 21):02}-{rng.randrange(1, 13):02}-{rng.randrange(1, 29):02}",
+                    f"RECIPIENT {rng.randrange(20000)}",
+                    f"AGENCY {agency_id}",
+                ]
+            )
+    return file_path
+
+
+def verify_zip_file(zip_file_path: str, file_paths: List[str]):
+    with zipfile.ZipFile(zip_file_path) as zip_file:
+        for file_path, member in zip(file_paths, zip_file.infolist()):
+            data = zip_file.read(member)
+            if member.filename.endswith(".gz"):
+                data = gzip.decompress(data)
+            with open(file_path, "rb") as f:
+                if data != f.read():
+                    raise SystemExit(f"Fatal error: {member.filename} of {zip_file_path} doesn't match {file_path}")
@@ -23,6 +23,10 @@ from usaspending_api.download.filestreaming.download_generation import (
 )
 from usaspending_api.download.filestreaming.download_source import DownloadSource
 from usaspending_api.download.helpers import pull_modified_agencies_cgacs
+from usaspending_api.download.helpers.elasticsearch_download_functions import (
+    discard_staged_download_ids,
+    staged_download_ids_sql,
+)
 from usaspending_api.download.lookups import VALUE_MAPPINGS
 from usaspending_api.references.models import ToptierAgency, SubtierAgency
 
@@ -178,6 +182,7 @@ class Command(BaseCommand):
 
         (temp_sql_file, temp_sql_file_path) = tempfile.mkstemp(prefix="bd_sql_", dir="/tmp")
         with open(temp_sql_file_path, "w") as file:
+            file.write(staged_download_ids_sql(csv_query_annotated))
             file.write("\\copy ({}) To STDOUT with CSV HEADER".format(csv_query_annotated))
 
         logger.info("Generated temp SQL file {}".format(temp_sql_file_path))
@@ -201,12 +206,15 @@ class Command(BaseCommand):
             zipfile_path = "{}{}.zip".format(settings.CSV_LOCAL_PATH, source_name)
 
             logger.info("Creating compressed file: {}".format(os.path.basename(zipfile_path)))
-            split_and_zip_data_files(zipfile_path, source_path, source_name, "csv")
+            split_and_zip_data_files(
+                zipfile_path, source_path, source_name, "csv", gzip_members=settings.MONTHLY_DOWNLOAD_GZIP_MEMBERS
+            )
         else:
             zipfile_path = None
 
         os.close(temp_sql_file)
         os.remove(temp_sql_file_path)
+        discard_staged_download_ids()
         shutil.rmtree(working_dir)
 
         return zipfile_path
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.17 on 2026-10-18 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('download', '0003_auto_20180306_1726'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='downloadjob',
+            name='request_fingerprint',
+            field=models.TextField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,51 @@
+import json
+import pytest
+
+from datetime import datetime, timezone
+from model_mommy import mommy
+
+from usaspending_api.broker.helpers.last_load_date import update_last_load_date
+from usaspending_api.broker.lookups import EXTERNAL_DATA_TYPE
+from usaspending_api.broker.models import ExternalDataType
+from usaspending_api.download import download_utils
+from usaspending_api.download.download_utils import create_request_fingerprint, get_data_load_date
+from usaspending_api.submissions.models import SubmissionAttributes
+
+REQUEST = json.dumps({"award_id": 456, "columns": [], "request_type": "contract"})
+
+
+@pytest.fixture
+def external_data_types(db):
+    for external_data_type in EXTERNAL_DATA_TYPE:
+        mommy.make(ExternalDataType, external_data_type_id=external_data_type.id, name=external_data_type.name)
+
+
+@pytest.mark.django_db
+def test_data_load_date_is_the_latest_load_or_publication(external_data_types):
+    assert get_data_load_date() is None
+
+    update_last_load_date("fpds", datetime(2020, 1, 2, tzinfo=timezone.utc))
+    update_last_load_date("es_transactions", datetime(2020, 1, 3, tzinfo=timezone.utc))
+    assert get_data_load_date() == datetime(2020, 1, 3, tzinfo=timezone.utc)
+
+    mommy.make(SubmissionAttributes, published_date=datetime(2020, 1, 4, tzinfo=timezone.utc))
+    assert get_data_load_date() == datetime(2020, 1, 4, tzinfo=timezone.utc)
+
+
+@pytest.mark.django_db
+def test_fingerprint_changes_when_data_is_loaded(external_data_types):
+    update_last_load_date("es_awards", datetime(2020, 1, 2, tzinfo=timezone.utc))
+    fingerprint = create_request_fingerprint(REQUEST)
+
+    assert create_request_fingerprint(REQUEST) == fingerprint
+    assert create_request_fingerprint(REQUEST.replace("456", "457")) != fingerprint
+
+    update_last_load_date("es_awards", datetime(2020, 1, 3, tzinfo=timezone.utc))
+    assert create_request_fingerprint(REQUEST) != fingerprint
+
+
+def test_fingerprint_without_data_loads_is_daily(monkeypatch):
+    monkeypatch.setattr(download_utils, "get_data_load_date", lambda: None)
+
+    assert create_request_fingerprint(REQUEST) == create_request_fingerprint(REQUEST)
+    assert len(create_request_fingerprint(REQUEST)) == 64
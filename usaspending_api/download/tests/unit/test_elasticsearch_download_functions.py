@@ -0,0 +1,83 @@
+from pathlib import Path
+
+from usaspending_api.download.helpers import elasticsearch_download_functions
+from usaspending_api.download.helpers.elasticsearch_download_functions import (
+    TransactionsElasticsearchDownload,
+    discard_staged_download_ids,
+    staged_download_ids_sql,
+)
+
+
+def test_ids_are_staged_for_a_temporary_table_join(monkeypatch):
+    monkeypatch.setattr(TransactionsElasticsearchDownload, "_filter_query_func", lambda filters: None)
+    monkeypatch.setattr(TransactionsElasticsearchDownload, "_search_type", lambda: _FakeSearch())
+    monkeypatch.setattr(
+        TransactionsElasticsearchDownload, "_get_download_ids_generator", lambda search, size: iter([[1, 2], [3]])
+    )
+
+    sql = str(TransactionsElasticsearchDownload.query({}).query)
+    table_name = next(iter(elasticsearch_download_functions._staged_id_files))
+    file_path = elasticsearch_download_functions._staged_id_files[table_name]
+
+    assert f'"transaction_normalized"."id" IN (SELECT "id" FROM {table_name})' in sql
+    assert Path(file_path).read_text() == "1\n2\n3\n"
+    setup_sql = staged_download_ids_sql(sql)
+    assert setup_sql.startswith("\\set QUIET on\n")
+    assert f"CREATE TEMPORARY TABLE {table_name}" in setup_sql
+    assert f"\\copy {table_name} FROM '{file_path}'" in setup_sql
+    assert staged_download_ids_sql("SELECT 1") == ""
+
+    discard_staged_download_ids()
+    assert not Path(file_path).exists()
+    assert elasticsearch_download_functions._staged_id_files == {}
+
+
+def test_search_after_collects_ids_in_sorted_pages():
+    search = _FakeSearch(doc_ids=[5, 1, 4, 2, 3])
+    pages = list(TransactionsElasticsearchDownload._get_download_ids_search_after(search, 2))
+
+    assert pages == [[1, 2], [3, 4], [5]]
+    assert search.requests == [
+        {"size": 2, "track_total_hits": False},
+        {"size": 2, "track_total_hits": False, "search_after": [2]},
+        {"size": 2, "track_total_hits": False, "search_after": [4]},
+    ]
+
+
+def test_search_after_stops_on_an_exactly_full_last_page():
+    search = _FakeSearch(doc_ids=[1, 2, 3, 4])
+    assert list(TransactionsElasticsearchDownload._get_download_ids_search_after(search, 2)) == [[1, 2], [3, 4]]
+    assert len(search.requests) == 3
+
+
+class _FakeSearch:
+    def __init__(self, doc_ids=(), extra=None, requests=None):
+        self.doc_ids = sorted(doc_ids)
+        self._extra = extra or {}
+        self.requests = [] if requests is None else requests
+
+    def filter(self, query):
+        return self
+
+    def source(self, fields):
+        return self
+
+    def sort(self, field):
+        return self
+
+    def extra(self, **kwargs):
+        return _FakeSearch(self.doc_ids, {**self._extra, **kwargs}, self.requests)
+
+    def handle_execute(self, retries):
+        self.requests.append(self._extra)
+        after = self._extra.get("search_after", [float("-inf")])[0]
+        hits = [{"sort": [doc_id]} for doc_id in self.doc_ids if doc_id > after][: self._extra["size"]]
+        return _FakeResponse({"hits": {"hits": hits}})
+
+
+class _FakeResponse:
+    def __init__(self, body):
+        self.body = body
+
+    def to_dict(self):
+        return self.body
@@ -1,3 +1,9 @@
+import multiprocessing
+import os
+import pytest
+import subprocess
+import zipfile
+
 from unittest.mock import MagicMock
 
 from usaspending_api.awards.v2.lookups.lookups import award_type_mapping, contract_type_mapping, idv_type_mapping
@@ -127,3 +133,72 @@ def test_idv_treasury_account_funding_csv_sources():
     VALUE_MAPPINGS["idv_federal_account_funding"]["filter_function"] = original
     assert csv_sources[0].file_type == "treasury_account"
     assert csv_sources[0].source_type == "idv_federal_account_funding"
+
+
+def test_parse_sources_runs_exports_concurrently_and_zips_in_order(monkeypatch, settings):
+    settings.DOWNLOAD_MAX_CONCURRENT_EXPORTS = 2
+    events = []
+
+    def start_source_export(source, *args):
+        events.append(f"start {source.name}")
+        return source.name
+
+    monkeypatch.setattr(download_generation, "start_source_export", start_source_export)
+    monkeypatch.setattr(
+        download_generation, "finish_source_export", lambda export, *args: events.append(f"zip {export}")
+    )
+    monkeypatch.setattr(
+        download_generation, "create_empty_data_file", lambda source, *args: events.append(f"empty {source.name}")
+    )
+
+    sources = [_FakeSource("a", 3), _FakeSource("b", 0), _FakeSource("c", 2), _FakeSource("d", 1)]
+    download_job = MagicMock(number_of_columns=0)
+    download_generation.parse_sources(sources, None, download_job, "dir", None, None, "file.zip", None, "csv")
+
+    assert events == ["start a", "start c", "zip a", "start d", "empty b", "zip c", "zip d"]
+    assert download_job.number_of_columns == 6
+
+
+class _FakeSource:
+    def __init__(self, name, column_count):
+        self.name = name
+        self.column_count = column_count
+
+    def columns(self, requested):
+        return ["column"] * self.column_count
+
+
+def test_stream_psql_to_zip(monkeypatch, tmp_path):
+    fake_psql = tmp_path / "psql"
+    fake_psql.write_text("#!/bin/sh\ncat > /dev/null\nprintf 'id,name\\n1,a\\n2,\"b\\nc\"\\n3,d\\n'\n")
+    fake_psql.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    monkeypatch.setattr(download_generation, "EXCEL_ROW_LIMIT", 2)
+    (tmp_path / "query.sql").write_text("\\COPY (SELECT 1) TO STDOUT WITH CSV HEADER")
+    row_count = multiprocessing.Value("q", 0)
+
+    download_generation.stream_psql_to_zip(
+        str(tmp_path / "query.sql"), str(tmp_path / "out.zip"), "data", "csv", row_count, None
+    )
+
+    assert row_count.value == 3
+    with zipfile.ZipFile(tmp_path / "out.zip", "r") as zf:
+        assert zf.namelist() == ["data_1.csv", "data_2.csv"]
+        assert zf.read("data_1.csv") == b'id,name\r\n1,a\r\n2,"b\nc"\r\n'
+        assert zf.read("data_2.csv") == b"id,name\r\n3,d\r\n"
+
+
+def test_stream_psql_to_zip_does_not_block_on_psql_errors(monkeypatch, tmp_path):
+    fake_psql = tmp_path / "psql"
+    # More notices than a pipe buffer holds, written before any output
+    fake_psql.write_text("#!/bin/sh\ncat > /dev/null\nhead -c 1048576 /dev/zero >&2\nprintf 'id,name\\n1,a\\n'\nexit 3\n")
+    fake_psql.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ['PATH']}")
+    (tmp_path / "query.sql").write_text("\\COPY (SELECT 1) TO STDOUT WITH CSV HEADER")
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        download_generation.stream_psql_to_zip(
+            str(tmp_path / "query.sql"), str(tmp_path / "out.zip"), "data", "csv", multiprocessing.Value("q", 0), None
+        )
+    assert error.value.returncode == 3
+    assert len(error.value.stderr) == 1048576
@@ -1,8 +1,15 @@
+import gzip
+import io
 import os
+import pytest
 import zipfile
 
 from tempfile import NamedTemporaryFile
-from usaspending_api.download.filestreaming.zip_file import append_files_to_zip_file
+from usaspending_api.common.csv_helpers import partition_large_delimited_file
+from usaspending_api.download.filestreaming.zip_file import (
+    append_delimited_stream_to_zip_file,
+    append_files_to_zip_file,
+)
 
 
 def test_append_files_to_zip_file():
@@ -20,3 +27,109 @@ def test_append_files_to_zip_file():
                         os.path.basename(include_file_1.name),
                         os.path.basename(include_file_2.name),
                     ]
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_append_files_to_zip_file_with_compression_processes(tmp_path, processes):
+    file_paths = []
+    for i in range(3):
+        (tmp_path / f"part_{i}.csv").write_bytes(b"id,name\r\n" + b"".join(b"%d,row\r\n" % j for j in range(i * 1000)))
+        file_paths.append(str(tmp_path / f"part_{i}.csv"))
+    append_files_to_zip_file(file_paths[:1], str(tmp_path / "out.zip"))
+
+    append_files_to_zip_file(file_paths[1:], str(tmp_path / "out.zip"), compression_level=9, processes=processes)
+
+    with zipfile.ZipFile(tmp_path / "out.zip", "r") as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["part_0.csv", "part_1.csv", "part_2.csv"]
+        assert [zf.read(f"part_{i}.csv") for i in range(3)] == [open(f, "rb").read() for f in file_paths]
+    assert sorted(os.listdir(tmp_path)) == ["out.zip", "part_0.csv", "part_1.csv", "part_2.csv"]
+
+
+@pytest.mark.parametrize("seekable", [True, False])
+def test_precompressed_members_read_back_from_seekable_and_unseekable_zip_files(tmp_path, seekable):
+    """Guards write_compressed_file_to_zip_file, which writes to ZipFile internals, against Python upgrades"""
+    file_paths = []
+    for i in range(3):
+        (tmp_path / f"part_{i}.csv").write_bytes(b"id,name\r\n" + b"".join(b"%d,row\r\n" % j for j in range(i * 5000)))
+        file_paths.append(str(tmp_path / f"part_{i}.csv"))
+    target = open(tmp_path / "out.zip", "wb") if seekable else _UnseekableStream()
+
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        zip_file.write(file_paths[0], "part_0.csv")
+        append_files_to_zip_file(file_paths[1:], zip_file, processes=2)
+        append_files_to_zip_file(file_paths[:1], zip_file, gzip_members=True)
+        zip_file.writestr("README.txt", "written after the precompressed members")
+    contents = (tmp_path / "out.zip").read_bytes() if seekable else target.getvalue()
+    target.close()
+
+    with zipfile.ZipFile(io.BytesIO(contents), "r") as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == ["part_0.csv", "part_1.csv", "part_2.csv", "part_0.csv.gz", "README.txt"]
+        assert [zf.read(f"part_{i}.csv") for i in range(3)] == [open(f, "rb").read() for f in file_paths]
+        assert gzip.decompress(zf.read("part_0.csv.gz")) == open(file_paths[0], "rb").read()
+
+
+def test_append_gzip_members_to_streamed_zip_file(tmp_path):
+    (tmp_path / "part_1.csv").write_bytes(b"id,name\r\n1,a\r\n")
+    (tmp_path / "part_2.csv").write_bytes(b"id,name\r\n2,b\r\n")
+    stream = _UnseekableStream()
+
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_DEFLATED) as zip_file:
+        append_files_to_zip_file(
+            [str(tmp_path / "part_1.csv"), str(tmp_path / "part_2.csv")], zip_file, processes=2, gzip_members=True
+        )
+
+    with zipfile.ZipFile(io.BytesIO(stream.getvalue()), "r") as zf:
+        assert zf.testzip() is None
+        assert [info.compress_type for info in zf.infolist()] == [zipfile.ZIP_STORED, zipfile.ZIP_STORED]
+        assert gzip.decompress(zf.read("part_1.csv.gz")) == b"id,name\r\n1,a\r\n"
+        assert gzip.decompress(zf.read("part_2.csv.gz")) == b"id,name\r\n2,b\r\n"
+
+
+class _UnseekableStream(io.BytesIO):
+    def seekable(self):
+        return False
+
+    def seek(self, *args):
+        raise io.UnsupportedOperation("seek")
+
+
+def test_append_delimited_stream_to_zip_file_matches_partitioned_files(tmp_path):
+    rows = "id,name\r\n" + "".join(f'{i},"row, with\nnewline {i}"\r\n' for i in range(5))
+    (tmp_path / "source.csv").write_text(rows, newline="")
+    files = partition_large_delimited_file(
+        str(tmp_path / "source.csv"), row_limit=2, output_name_template="partitioned_%s.csv"
+    )
+
+    entry_names, row_count = append_delimited_stream_to_zip_file(
+        io.StringIO(rows, newline=""), str(tmp_path / "out.zip"), ",", 2, "streamed_%s.csv"
+    )
+
+    assert row_count == 5
+    assert entry_names == ["streamed_1.csv", "streamed_2.csv", "streamed_3.csv"]
+    with zipfile.ZipFile(tmp_path / "out.zip", "r") as zf:
+        assert [zf.read(name) for name in entry_names] == [open(f, "rb").read() for f in files]
+
+
+def test_delimited_stream_entries_are_deflated_at_the_compression_level(tmp_path):
+    rows = "id,name\r\n" + "".join(f"{i},row {i % 7} of a highly repetitive stream\r\n" for i in range(2000))
+    for level in (1, 9):
+        append_delimited_stream_to_zip_file(
+            io.StringIO(rows, newline=""), str(tmp_path / "out.zip"), ",", 5000, f"level_{level}_%s.csv", level
+        )
+
+    with zipfile.ZipFile(tmp_path / "out.zip", "r") as zf:
+        assert zf.testzip() is None
+        assert zf.getinfo("level_9_1.csv").compress_size < zf.getinfo("level_1_1.csv").compress_size
+        assert zf.read("level_1_1.csv") == zf.read("level_9_1.csv") == rows.encode()
+
+
+def test_append_empty_delimited_stream_to_zip_file(tmp_path):
+    entry_names, row_count = append_delimited_stream_to_zip_file(
+        io.StringIO("id,name\r\n", newline=""), str(tmp_path / "out.zip"), ",", 2, "streamed_%s.csv"
+    )
+
+    assert (entry_names, row_count) == (["streamed_1.csv"], 0)
+    with zipfile.ZipFile(tmp_path / "out.zip", "r") as zf:
+        assert zf.read("streamed_1.csv") == b"id,name\r\n"
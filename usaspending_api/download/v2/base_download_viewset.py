@@ -1,6 +1,5 @@
 import json
 
-from datetime import datetime, timezone
 from typing import Optional, Type
 
 from django.conf import settings
@@ -13,7 +12,11 @@ from usaspending_api.common.api_versioning import api_transformations, API_TRANS
 from usaspending_api.common.exceptions import InvalidParameterException
 from usaspending_api.common.helpers.dict_helpers import order_nested_object
 from usaspending_api.common.sqs.sqs_handler import get_sqs_queue
-from usaspending_api.download.download_utils import create_unique_filename, log_new_download_job
+from usaspending_api.download.download_utils import (
+    create_request_fingerprint,
+    create_unique_filename,
+    log_new_download_job,
+)
 from usaspending_api.download.filestreaming import download_generation
 from usaspending_api.download.filestreaming.s3_handler import S3Handler
 from usaspending_api.download.helpers import write_to_download_log as write_to_log
@@ -52,25 +55,27 @@ class BaseDownloadViewSet(APIView):
         json_request = order_nested_object(validator.json_request)
         ordered_json_request = json.dumps(json_request)
 
-        # Check if the same request has been called today
-        # TODO!!! Use external_data_load_date to determine data freshness
-        updated_date_timestamp = datetime.strftime(datetime.now(timezone.utc), "%Y-%m-%d")
+        # Check if the same request has been made since data was last loaded
+        request_fingerprint = create_request_fingerprint(ordered_json_request)
         cached_download = (
-            DownloadJob.objects.filter(json_request=ordered_json_request, update_date__gte=updated_date_timestamp)
+            DownloadJob.objects.filter(request_fingerprint=request_fingerprint)
             .exclude(job_status_id=JOB_STATUS_DICT["failed"])
             .values("download_job_id", "file_name")
             .first()
         )
 
         if cached_download and not settings.IS_LOCAL:
-            # By returning the cached files, there should be no duplicates on a daily basis
+            # By returning the cached files, there should be no duplicates until data changes
             write_to_log(message=f"Generating file from cached download job ID: {cached_download['download_job_id']}")
             cached_filename = cached_download["file_name"]
             return self.get_download_response(file_name=cached_filename)
 
         final_output_zip_name = create_unique_filename(json_request, origination=origination)
         download_job = DownloadJob.objects.create(
-            job_status_id=JOB_STATUS_DICT["ready"], file_name=final_output_zip_name, json_request=ordered_json_request
+            job_status_id=JOB_STATUS_DICT["ready"],
+            file_name=final_output_zip_name,
+            json_request=ordered_json_request,
+            request_fingerprint=request_fingerprint,
         )
 
         log_new_download_job(request, download_job)
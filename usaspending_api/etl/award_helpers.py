@@ -1,6 +1,17 @@
-from typing import Optional
+import io
+import logging
+import psycopg2
+import threading
 
-from django.db import connection
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import connection, transaction
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
+
+logger = logging.getLogger("script")
 
 general_award_update_sql_string = """
 WITH
@@ -270,6 +281,96 @@ subaward_award_update_sql_string = """
       )
 """
 
+_find_empty_awards_sql_string = """
+  SELECT a.id
+  FROM awards a
+  LEFT JOIN transaction_normalized tn ON tn.award_id = a.id
+  WHERE tn IS NULL {predicate}
+"""
+
+prune_empty_awards_sql_string = f"""
+UPDATE subaward SET award_id = null WHERE award_id IN ({_find_empty_awards_sql_string});
+
+UPDATE financial_accounts_by_awards
+  SET
+    update_date = now(),
+    award_id = null
+WHERE award_id IN ({_find_empty_awards_sql_string});
+
+DELETE FROM parent_award WHERE award_id in ({_find_empty_awards_sql_string});
+
+DELETE FROM awards WHERE id IN ({_find_empty_awards_sql_string})
+"""
+
+# Steps of recompute_awards: name -> (statement, filter of its {predicate} to the awards recomputed)
+AWARD_RECOMPUTE_STEPS = {
+    "prune": (prune_empty_awards_sql_string, "AND a.id {award_ids}"),
+    "awards": (general_award_update_sql_string, "WHERE tn.award_id {award_ids}"),
+    "procurement": (fpds_award_update_sql_string, "WHERE tn.award_id {award_ids}"),
+    "assistance": (fabs_award_update_sql_string, "WHERE tn.award_id {award_ids}"),
+    "subawards": (subaward_award_update_sql_string, "WHERE award_id {award_ids}"),
+}
+
+# First and last award ids of id-ordered chunks of every award
+award_chunk_bounds_sql_string = """
+SELECT MIN(id), MAX(id)
+FROM (SELECT id, (ROW_NUMBER() OVER (ORDER BY id) - 1) / {chunk_size} AS chunk FROM awards) AS numbered_awards
+GROUP BY chunk
+ORDER BY chunk
+"""
+
+# Awards whose position in an IDV hierarchy may have changed along with the awards staged in temp_award_recompute_ids:
+# the awards themselves and every award below them, both before (from idv_hierarchy) and after (walking the hierarchy
+# of the awards table)
+idv_hierarchy_affected_awards_sql_string = """
+CREATE TEMPORARY TABLE temp_idv_hierarchy_affected_awards AS
+WITH RECURSIVE descendants AS (
+  SELECT a.id, ARRAY[a.id] AS path
+  FROM temp_award_recompute_ids t
+  INNER JOIN awards a ON a.id = t.award_id
+  UNION ALL
+  SELECT c.id, d.path || c.id
+  FROM descendants d
+  INNER JOIN awards p ON p.id = d.id AND p.type LIKE 'IDV%'
+  INNER JOIN awards c ON
+    c.parent_award_piid = p.piid
+    AND c.fpds_parent_agency_id = p.fpds_agency_id
+    AND c.id <> ALL(d.path)
+)
+SELECT id AS award_id FROM descendants
+UNION
+SELECT award_id FROM temp_award_recompute_ids
+UNION
+SELECT h.descendant_award_id FROM idv_hierarchy h INNER JOIN temp_award_recompute_ids t ON t.award_id = h.ancestor_award_id
+"""
+
+# Ancestors of awards, walking up from each award to its parent IDV until reaching one without a parent
+idv_hierarchy_insert_sql_string = """
+WITH RECURSIVE ancestors AS (
+  SELECT c.id AS descendant_award_id, p.id AS ancestor_award_id, 1 AS depth, ARRAY[c.id, p.id] AS path
+  FROM awards c
+  {predicate}
+  INNER JOIN awards p ON
+    p.piid = c.parent_award_piid
+    AND p.fpds_agency_id = c.fpds_parent_agency_id
+    AND p.type LIKE 'IDV%'
+    AND p.id <> c.id
+  UNION ALL
+  SELECT a.descendant_award_id, p.id, a.depth + 1, a.path || p.id
+  FROM ancestors a
+  INNER JOIN awards c ON c.id = a.ancestor_award_id
+  INNER JOIN awards p ON
+    p.piid = c.parent_award_piid
+    AND p.fpds_agency_id = c.fpds_parent_agency_id
+    AND p.type LIKE 'IDV%'
+    AND p.id <> ALL(a.path)
+)
+INSERT INTO idv_hierarchy (ancestor_award_id, descendant_award_id, depth)
+SELECT ancestor_award_id, descendant_award_id, MIN(depth)
+FROM ancestors
+GROUP BY ancestor_award_id, descendant_award_id
+"""
+
 
 def execute_database_statement(sql: str, values: Optional[list] = None) -> int:
     """Execute the SQL and return the UPDATE count"""
@@ -293,83 +394,177 @@ def convert_award_id_to_guai(award_tuple: tuple) -> tuple:
         return tuple([row[0] for row in cursor.fetchall()])
 
 
-def update_awards(award_tuple: Optional[tuple] = None) -> int:
-    """Update Award records using transaction data"""
-
-    if award_tuple:
-        values = [award_tuple, award_tuple, award_tuple]
-        predicate = "WHERE tn.award_id IN %s"
+def recompute_awards(
+    award_ids: Optional[Iterable[int]] = None,
+    steps: Sequence[str] = ("awards",),
+    chunk_size: Optional[int] = None,
+    connections: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Run steps of AWARD_RECOMPUTE_STEPS, in order, for these awards (or every award without award_ids) in id-ordered
+    chunks of chunk_size awards, and return the number of records each step changed.  Award ids are staged in a
+    temporary table the statements join to instead of being inlined into them.
+
+    With more than one connection, chunks are recomputed in parallel on their own connections, each committing its
+    chunks as it goes.  That can't see changes the current transaction hasn't committed, so within a transaction
+    chunks are recomputed one after another on the current connection.  Defaults come from AWARD_RECOMPUTE_CHUNK_SIZE
+    and AWARD_RECOMPUTE_CONNECTIONS.
+    """
+    chunk_size = chunk_size or settings.AWARD_RECOMPUTE_CHUNK_SIZE
+    connections = connections or settings.AWARD_RECOMPUTE_CONNECTIONS
+    if connections > 1 and connection.in_atomic_block:
+        logger.info("Recomputing awards on the current connection, as they're part of a transaction in progress")
+        connections = 1
+
+    if award_ids is None:
+        with connection.cursor() as cursor:
+            cursor.execute(award_chunk_bounds_sql_string.format(chunk_size=int(chunk_size)))
+            chunks = [(first_id, last_id, None) for first_id, last_id in cursor.fetchall()]
+    else:
+        award_ids = sorted(set(award_ids))
+        chunks = [
+            (chunk[0], chunk[-1], chunk)
+            for chunk in (award_ids[i : i + chunk_size] for i in range(0, len(award_ids), chunk_size))
+        ]
+
+    totals = {step: 0 for step in steps}
+    if not chunks:
+        return totals
+
+    if connections > 1:
+        chunk_counts = _recompute_chunks_in_parallel(chunks, steps, connections)
     else:
-        values = None
-        predicate = ""
+        chunk_counts = _recompute_chunks(chunks, steps)
 
-    return execute_database_statement(general_award_update_sql_string.format(predicate=predicate), values)
+    for counts in chunk_counts:
+        for step, count in counts.items():
+            totals[step] += count
+    return totals
 
 
-def prune_empty_awards(award_tuple: Optional[tuple] = None) -> int:
-    _find_empty_awards_sql = """
-        SELECT a.id
-        FROM awards a
-        LEFT JOIN transaction_normalized tn ON tn.award_id = a.id
-        WHERE tn IS NULL {}
-    """.format(
-        "AND a.id IN %s" if award_tuple else ""
+def _recompute_chunks(chunks: List[Tuple[int, int, Optional[list]]], steps: Sequence[str]) -> List[Dict[str, int]]:
+    with connection.cursor() as cursor:
+        staged = chunks[0][2] is not None
+        if staged:
+            _stage_award_ids(cursor, [award_id for _, _, chunk in chunks for award_id in chunk])
+        chunk_counts = [_recompute_chunk(cursor, chunk, steps, i, len(chunks)) for i, chunk in enumerate(chunks, 1)]
+        if staged:
+            cursor.execute("DROP TABLE temp_award_recompute_ids")
+    return chunk_counts
+
+
+def _recompute_chunks_in_parallel(
+    chunks: List[Tuple[int, int, Optional[list]]], steps: Sequence[str], connections: int
+) -> List[Dict[str, int]]:
+    """Recompute each chunk in its own transaction, on a connection per thread"""
+    thread_local = threading.local()
+    opened = []
+    lock = threading.Lock()
+
+    def recompute(numbered_chunk):
+        chunk_number, chunk = numbered_chunk
+        if not hasattr(thread_local, "connection"):
+            thread_local.connection = psycopg2.connect(dsn=get_database_dsn_string())
+            with lock:
+                opened.append(thread_local.connection)
+        with thread_local.connection, thread_local.connection.cursor() as cursor:
+            if chunk[2] is not None:
+                _stage_award_ids(cursor, chunk[2])
+            counts = _recompute_chunk(cursor, chunk, steps, chunk_number, len(chunks))
+            if chunk[2] is not None:
+                cursor.execute("DROP TABLE temp_award_recompute_ids")
+        return counts
+
+    try:
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            return list(executor.map(recompute, enumerate(chunks, 1)))
+    finally:
+        for db_connection in opened:
+            db_connection.close()
+
+
+def _stage_award_ids(cursor, award_ids: Iterable[int]) -> None:
+    cursor.execute("DROP TABLE IF EXISTS temp_award_recompute_ids")
+    cursor.execute("CREATE TEMPORARY TABLE temp_award_recompute_ids (award_id BIGINT PRIMARY KEY)")
+    cursor.copy_expert(
+        "COPY temp_award_recompute_ids (award_id) FROM STDIN", io.StringIO("".join(f"{i}\n" for i in award_ids))
     )
+    cursor.execute("ANALYZE temp_award_recompute_ids")
 
-    _modify_subawards_sql = "UPDATE subaward SET award_id = null WHERE award_id IN ({});".format(_find_empty_awards_sql)
 
-    _modify_financial_accounts_sql = """
-      UPDATE financial_accounts_by_awards
-        SET
-          update_date = now(),
-          award_id = null
-      WHERE award_id IN ({});
-    """.format(
-        _find_empty_awards_sql
+def _recompute_chunk(cursor, chunk: Tuple[int, int, Optional[list]], steps: Sequence[str], number, total):
+    first_id, last_id, award_ids = chunk
+    if award_ids is None:
+        award_id_filter = f"BETWEEN {int(first_id)} AND {int(last_id)}"
+    else:
+        award_id_filter = (
+            "IN (SELECT award_id FROM temp_award_recompute_ids "
+            f"WHERE award_id BETWEEN {int(first_id)} AND {int(last_id)})"
+        )
+
+    start = perf_counter()
+    counts = {}
+    for step in steps:
+        sql, predicate = AWARD_RECOMPUTE_STEPS[step]
+        cursor.execute(sql.format(predicate=predicate.format(award_ids=award_id_filter)))
+        counts[step] = cursor.rowcount
+
+    summary = ", ".join(f"{count:,} {step}" for step, count in counts.items())
+    logger.info(
+        f"Recomputed award chunk {number:,} of {total:,} (award ids {first_id}-{last_id}): "
+        f"{summary} in {perf_counter() - start:.2f}s"
     )
+    return counts
 
-    _delete_parent_award_sql = "DELETE FROM parent_award WHERE award_id in ({});".format(_find_empty_awards_sql)
 
-    _prune_empty_awards_sql = "DELETE FROM awards WHERE id IN ({}) ".format(_find_empty_awards_sql)
+def update_awards(award_tuple: Optional[tuple] = None) -> int:
+    """Update Award records using transaction data"""
+    return recompute_awards(award_tuple or None, ["awards"])["awards"]
 
-    return execute_database_statement(
-        _modify_subawards_sql + _modify_financial_accounts_sql + _delete_parent_award_sql + _prune_empty_awards_sql,
-        [award_tuple, award_tuple, award_tuple, award_tuple],
-    )
+
+def prune_empty_awards(award_tuple: Optional[tuple] = None) -> int:
+    return recompute_awards(award_tuple or None, ["prune"])["prune"]
 
 
 def update_assistance_awards(award_tuple: Optional[tuple] = None) -> int:
     """Update assistance-specific award data based on the info in child transactions."""
-    if award_tuple:
-        values = [award_tuple]
-        predicate = "WHERE tn.award_id IN %s"
-    else:
-        values = None
-        predicate = ""
-
-    return execute_database_statement(fabs_award_update_sql_string.format(predicate=predicate), values)
+    return recompute_awards(award_tuple or None, ["assistance"])["assistance"]
 
 
 def update_procurement_awards(award_tuple: Optional[tuple] = None) -> int:
     """Update procurement-specific award data based on the info in child transactions."""
-    if award_tuple:
-        values = [award_tuple, award_tuple, award_tuple]
-        predicate = "WHERE tn.award_id IN %s"
-    else:
-        values = None
-        predicate = ""
-
-    return execute_database_statement(fpds_award_update_sql_string.format(predicate=predicate), values)
+    return recompute_awards(award_tuple or None, ["procurement"])["procurement"]
 
 
 def update_award_subawards(award_tuple: Optional[tuple] = None) -> int:
     """Updates awards' subaward counts and totals"""
+    return recompute_awards(award_tuple or None, ["subawards"])["subawards"]
+
+
+def update_idv_hierarchy(award_tuple: Optional[tuple] = None) -> int:
+    """
+    Refresh the idv_hierarchy closure table for awards created, updated or deleted by a load and the awards below
+    them, or rebuild it without award_tuple.  Returns the number of idv_hierarchy records inserted.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        if award_tuple:
+            _stage_award_ids(cursor, set(award_tuple))
+            cursor.execute("DROP TABLE IF EXISTS temp_idv_hierarchy_affected_awards")
+            cursor.execute(idv_hierarchy_affected_awards_sql_string)
+            cursor.execute("DROP TABLE temp_award_recompute_ids")
+            cursor.execute(
+                "DELETE FROM idv_hierarchy WHERE descendant_award_id IN "
+                "(SELECT award_id FROM temp_idv_hierarchy_affected_awards)"
+            )
+            predicate = "INNER JOIN temp_idv_hierarchy_affected_awards t ON t.award_id = c.id"
+        else:
+            cursor.execute("DELETE FROM idv_hierarchy")
+            predicate = ""
 
-    if award_tuple:
-        values = [award_tuple]
-        predicate = "WHERE award_id IN %s"
-    else:
-        values = None
-        predicate = ""
+        cursor.execute(idv_hierarchy_insert_sql_string.format(predicate=predicate))
+        rowcount = cursor.rowcount
 
-    return execute_database_statement(subaward_award_update_sql_string.format(predicate=predicate), values)
+        if award_tuple:
+            cursor.execute("DROP TABLE temp_idv_hierarchy_affected_awards")
+
+    return rowcount
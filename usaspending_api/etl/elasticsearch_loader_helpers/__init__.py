@@ -1,12 +1,16 @@
+from usaspending_api.etl.elasticsearch_loader_helpers.checkpoint_ledger import CheckpointLedger
 from usaspending_api.etl.elasticsearch_loader_helpers.delete_data import (
     delete_docs_by_unique_key,
     delete_awards,
     delete_transactions,
+    lookup_ids_with_changed_routing,
 )
 from usaspending_api.etl.elasticsearch_loader_helpers.extract_data import (
     count_of_records_to_process,
     extract_records,
+    extract_records_in_batches,
     obtain_extract_sql,
+    partition_upper_bounds,
 )
 from usaspending_api.etl.elasticsearch_loader_helpers.index_config import (
     create_award_type_aliases,
@@ -17,7 +21,7 @@ from usaspending_api.etl.elasticsearch_loader_helpers.index_config import (
     toggle_refresh_on,
     check_new_index_name_is_ok,
 )
-from usaspending_api.etl.elasticsearch_loader_helpers.load_data import load_data
+from usaspending_api.etl.elasticsearch_loader_helpers.load_data import load_data, load_data_in_batches
 from usaspending_api.etl.elasticsearch_loader_helpers.transform_data import (
     transform_award_data,
     transform_covid19_faba_data,
@@ -25,16 +29,20 @@ from usaspending_api.etl.elasticsearch_loader_helpers.transform_data import (
 )
 from usaspending_api.etl.elasticsearch_loader_helpers.utilities import (
     chunks,
+    copy_sql_statement,
     execute_sql_statement,
     format_log,
     gen_random_name,
+    stream_sql_statement,
     TaskSpec,
 )
 from usaspending_api.etl.elasticsearch_loader_helpers.controller import Controller
 
 __all__ = [
+    "CheckpointLedger",
     "chunks",
     "Controller",
+    "copy_sql_statement",
     "count_of_records_to_process",
     "create_award_type_aliases",
     "create_index",
@@ -43,11 +51,16 @@ __all__ = [
     "delete_transactions",
     "execute_sql_statement",
     "extract_records",
+    "extract_records_in_batches",
     "format_log",
     "gen_random_name",
+    "lookup_ids_with_changed_routing",
     "load_data",
+    "load_data_in_batches",
     "obtain_extract_sql",
+    "partition_upper_bounds",
     "set_final_index_config",
+    "stream_sql_statement",
     "swap_aliases",
     "take_snapshot",
     "TaskSpec",
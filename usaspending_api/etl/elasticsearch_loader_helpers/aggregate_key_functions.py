@@ -1,7 +1,7 @@
 import json
 import logging
 
-from typing import Optional, List
+from typing import Callable, Dict, Optional, List, Tuple
 
 
 logger = logging.getLogger("script")
@@ -179,3 +179,45 @@ def _country_agg_key(location_type, record: dict) -> Optional[str]:
             "country_name": record[f"{location_type}_country_name"],
         }
     )
+
+
+def _agency_source_columns(agency_type: str, agency_tier: str) -> Tuple[str, ...]:
+    return (
+        f"{agency_type}_{agency_tier}_agency_name",
+        f"{agency_type}_{agency_tier}_agency_abbreviation",
+        f"{agency_type}_{agency_tier}_agency_code",
+        f"{agency_type}_toptier_agency_id",
+    )
+
+
+def _location_source_columns(location_type: str, *fields: str) -> Tuple[str, ...]:
+    return tuple(f"{location_type}_{field}" for field in fields)
+
+
+_RECIPIENT_COLUMNS = ("recipient_hash", "recipient_levels", "recipient_name", "recipient_unique_id")
+_COUNTY_FIELDS = ("country_code", "state_code", "state_fips", "county_code", "county_name", "county_population")
+_CONGRESSIONAL_FIELDS = ("country_code", "state_code", "state_fips", "congressional_code", "congressional_population")
+_STATE_FIELDS = ("country_code", "state_code", "state_name", "state_population")
+_COUNTRY_FIELDS = ("country_code", "country_name")
+
+# Every record column each aggregate key function reads (whether or not it is present in the record).
+# The output of each function must depend on nothing but the values of these columns, since the batch transform
+# reuses the key generated for the first record having the same values
+AGG_KEY_SOURCE_COLUMNS: Dict[Callable, Tuple[str, ...]] = {
+    award_recipient_agg_key: _RECIPIENT_COLUMNS,
+    transaction_recipient_agg_key: _RECIPIENT_COLUMNS,
+    awarding_subtier_agency_agg_key: _agency_source_columns("awarding", "subtier"),
+    awarding_toptier_agency_agg_key: _agency_source_columns("awarding", "toptier"),
+    funding_subtier_agency_agg_key: _agency_source_columns("funding", "subtier"),
+    funding_toptier_agency_agg_key: _agency_source_columns("funding", "toptier"),
+    naics_agg_key: ("naics_code", "naics_description"),
+    psc_agg_key: ("product_or_service_code", "product_or_service_description"),
+    pop_county_agg_key: _location_source_columns("pop", *_COUNTY_FIELDS),
+    recipient_location_county_agg_key: _location_source_columns("recipient_location", *_COUNTY_FIELDS),
+    pop_congressional_agg_key: _location_source_columns("pop", *_CONGRESSIONAL_FIELDS),
+    recipient_location_congressional_agg_key: _location_source_columns("recipient_location", *_CONGRESSIONAL_FIELDS),
+    pop_state_agg_key: _location_source_columns("pop", *_STATE_FIELDS),
+    recipient_location_state_agg_key: _location_source_columns("recipient_location", *_STATE_FIELDS),
+    pop_country_agg_key: _location_source_columns("pop", *_COUNTRY_FIELDS),
+    recipient_location_country_agg_key: _location_source_columns("recipient_location", *_COUNTRY_FIELDS),
+}
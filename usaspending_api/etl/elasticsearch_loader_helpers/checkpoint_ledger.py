@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from usaspending_api.etl.elasticsearch_loader_helpers.utilities import format_log
+
+logger = logging.getLogger("script")
+
+
+class CheckpointLedger:
+    """
+    Persisted record of the partitions of an ETL run that were fully loaded into the target index.
+
+    The ledger is a small JSON file, only ever written by the controlling (parent) process, and rewritten
+    atomically after each completed partition so a crash can't leave it half-written. Partitions are keyed by
+    their id-range, and the id-ranges of the run are stored with them, so a resumed run uses the same partitions
+    and can skip the ones already loaded.
+    """
+
+    def __init__(self, path: Path, index_name: str, load_type: str):
+        self.path = Path(path)
+        self.index_name = index_name
+        self.load_type = load_type
+        self.partitions = {}
+        self.partition_bounds = None
+
+    @classmethod
+    def for_config(cls, config: dict) -> "CheckpointLedger":
+        path = Path(config["checkpoint_dir"]) / f"{config['index_name']}.es_etl_checkpoint.json"
+        return cls(path, config["index_name"], config["load_type"])
+
+    def load(self) -> None:
+        """Read back the partitions completed by a previous run against the same index"""
+        if not self.path.exists():
+            logger.info(format_log(f"No checkpoint ledger found at {self.path}. Nothing to resume"))
+            return
+
+        ledger = json.loads(self.path.read_text())
+        if ledger["index_name"] != self.index_name or ledger["load_type"] != self.load_type:
+            raise RuntimeError(
+                f"Checkpoint ledger {self.path} is for {ledger['load_type']} index '{ledger['index_name']}', "
+                f"not {self.load_type} index '{self.index_name}'"
+            )
+        self.partitions = ledger["partitions"]
+        self.partition_bounds = [tuple(bounds) for bounds in ledger.get("partition_bounds") or []] or None
+        doc_count = sum(p["doc_count"] for p in self.partitions.values())
+        msg = f"Resuming from checkpoint ledger with {len(self.partitions):,} completed partitions ({doc_count:,} docs)"
+        logger.info(format_log(msg))
+
+    def reset(self, partition_bounds: Optional[List[Tuple[int, int]]] = None) -> None:
+        """Start a fresh ledger for a run of these partitions, discarding any left by a previous run"""
+        self.partitions = {}
+        self.partition_bounds = partition_bounds
+        self._write()
+
+    def is_complete(self, checkpoint_key: Optional[str]) -> bool:
+        return checkpoint_key in self.partitions
+
+    def record(self, checkpoint_key: str, partition_number: int, doc_count: int) -> None:
+        self.partitions[checkpoint_key] = {
+            "partition_number": partition_number,
+            "doc_count": doc_count,
+            "completed_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self._write()
+
+    def delete(self) -> None:
+        if self.path.exists():
+            self.path.unlink()
+
+    def _write(self) -> None:
+        ledger = {
+            "index_name": self.index_name,
+            "load_type": self.load_type,
+            "partition_bounds": self.partition_bounds,
+            "partitions": self.partitions,
+        }
+        temp_path = self.path.with_name(f"{self.path.name}.tmp")
+        temp_path.write_text(json.dumps(ledger, indent=2))
+        os.replace(temp_path, self.path)
@@ -4,20 +4,24 @@ from django.core.management import call_command
 from math import ceil
 from multiprocessing import Pool, Event, Value
 from time import perf_counter
-from typing import Generator, List, Tuple
+from typing import Generator, List, Optional, Tuple
 
 from usaspending_api.broker.helpers.last_load_date import update_last_load_date
 from usaspending_api.common.elasticsearch.client import instantiate_elasticsearch_client
+from usaspending_api.etl.elasticsearch_loader_helpers.checkpoint_ledger import CheckpointLedger
 from usaspending_api.etl.elasticsearch_loader_helpers import (
     count_of_records_to_process,
     create_index,
     delete_awards,
     delete_transactions,
     extract_records,
+    extract_records_in_batches,
     format_log,
     gen_random_name,
     load_data,
+    load_data_in_batches,
     obtain_extract_sql,
+    partition_upper_bounds,
     set_final_index_config,
     swap_aliases,
     TaskSpec,
@@ -46,6 +50,8 @@ class Controller:
     def __init__(self, config):
         self.config = config
         self.tasks = []
+        self.partition_bounds = None
+        self.ledger = None
 
     def prepare_for_etl(self) -> None:
         logger.info(format_log("Assessing data to process"))
@@ -55,10 +61,38 @@ class Controller:
             self.processes = []
             return
 
-        self.config["partitions"] = self.determine_partitions()
+        self.ledger = CheckpointLedger.for_config(self.config)
+        if self.config["resume"]:
+            self.ledger.load()
+
+        if self.ledger.partition_bounds:
+            # Partitions are derived again from data that may have changed since, or sampled differently; reuse
+            # those of the run being resumed so the partitions it completed are recognized
+            self.partition_bounds = self.determine_resumed_partitions(self.ledger.partition_bounds)
+        elif self.config.get("partition_strategy") == "density":
+            self.partition_bounds = self.determine_density_partitions(
+                partition_upper_bounds(self.config, self.determine_partitions_by_record_count())
+            )
+        else:
+            self.partition_bounds = [self.get_id_range_for_partition(j) for j in range(self.determine_partitions())]
+        self.config["partitions"] = len(self.partition_bounds)
         self.config["processes"] = min(self.config["processes"], self.config["partitions"])
         self.tasks = self.construct_tasks()
 
+        if self.config["resume"]:
+            unknown_partitions = set(self.ledger.partitions).difference(task.checkpoint_key for task in self.tasks)
+            if unknown_partitions:
+                raise RuntimeError(
+                    f"Checkpoint ledger {self.ledger.path} has completed partitions not in this run: "
+                    f"{', '.join(sorted(unknown_partitions))}. Run again without --resume"
+                )
+            remaining_tasks = [task for task in self.tasks if not self.ledger.is_complete(task.checkpoint_key)]
+            msg = f"Skipping {len(self.tasks) - len(remaining_tasks):,} partitions completed by a previous run"
+            logger.info(format_log(msg))
+            self.tasks = remaining_tasks
+        else:
+            self.ledger.reset(self.partition_bounds)
+
         logger.info(
             format_log(
                 f"Created {len(self.tasks):,} task partitions"
@@ -69,15 +103,26 @@ class Controller:
         )
 
         if self.config["create_new_index"]:
-            # ensure template for index is present and the latest version
-            call_command("es_configure", "--template-only", f"--load-type={self.config['data_type']}")
-            create_index(self.config["index_name"], instantiate_elasticsearch_client())
+            client = instantiate_elasticsearch_client()
+            if self.config["resume"] and client.indices.exists(self.config["index_name"]):
+                logger.info(format_log(f"Resuming load into existing index {self.config['index_name']}"))
+            else:
+                # ensure template for index is present and the latest version
+                call_command("es_configure", "--template-only", f"--load-type={self.config['data_type']}")
+                create_index(self.config["index_name"], client)
 
     def dispatch_tasks(self) -> None:
+        if not self.tasks:
+            logger.info(format_log("No partitions left to process"))
+            return
+
         _abort = Event()  # Event which when set signals an error occurred in a subprocess
         parallel_procs = self.config["processes"]
         with Pool(parallel_procs, maxtasksperchild=1, initializer=init_shared_abort, initargs=(_abort,)) as pool:
-            pool.map(extract_transform_load, self.tasks)
+            # A chunksize of 1 makes the pool's task queue hand out one partition at a time to whichever process
+            # is free, so fast processes keep pulling remaining partitions rather than idling behind stragglers
+            for result in pool.imap_unordered(extract_transform_load, self.tasks, chunksize=1):
+                self.checkpoint_partition(result)
 
         msg = f"Total documents indexed: {total_doc_success.value}, total document fails: {total_doc_fail.value}"
         logger.info(format_log(msg))
@@ -85,6 +130,14 @@ class Controller:
         if _abort.is_set():
             raise RuntimeError("One or more partitions failed!")
 
+    def checkpoint_partition(self, result: Optional[Tuple[str, int, int, int]]) -> None:
+        """Record a partition in the ledger only once all of its docs were indexed, so a resumed run retries it"""
+        if result is None or self.ledger is None:
+            return
+        checkpoint_key, partition_number, success, fail = result
+        if fail == 0:
+            self.ledger.record(checkpoint_key, partition_number, success)
+
     def complete_process(self) -> None:
         client = instantiate_elasticsearch_client()
         if self.config["create_new_index"]:
@@ -104,6 +157,9 @@ class Controller:
             )
             update_last_load_date(f"{self.config['stored_date_key']}", self.config["processing_start_datetime"])
 
+        if self.ledger:
+            self.ledger.delete()
+
     def determine_partitions(self) -> int:
         """Simple strategy of partitions that cover the id-range in an even distribution"""
         id_range_item_count = self.max_id - self.min_id + 1  # total number or records if all IDs exist in DB
@@ -111,6 +167,34 @@ class Controller:
             return 1
         return ceil(id_range_item_count / self.config["partition_size"])
 
+    def determine_resumed_partitions(self, partition_bounds: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Partitions of the run being resumed, plus partitions for any ids below or above them found since"""
+        id_ranges = list(partition_bounds)
+        if self.min_id < id_ranges[0][0]:
+            id_ranges.insert(0, (self.min_id, id_ranges[0][0] - 1))
+        if self.max_id > id_ranges[-1][1]:
+            id_ranges.append((id_ranges[-1][1] + 1, self.max_id))
+        return id_ranges
+
+    def determine_partitions_by_record_count(self) -> int:
+        """Number of partitions needed to hold the records found if each partition held partition_size of them"""
+        return max(ceil(self.record_count / self.config["partition_size"]), 1)
+
+    def determine_density_partitions(self, upper_bounds: List[int]) -> List[Tuple[int, int]]:
+        """
+        Strategy of partitions whose id-ranges hold roughly equal numbers of records, given the id values sampled
+        at evenly-spaced percentiles of the id distribution. Sparse stretches of the id-range become wide
+        partitions and dense stretches become narrow ones.
+        """
+        id_ranges = []
+        lower_bound = self.min_id
+        for upper_bound in sorted(set(upper_bounds)):
+            if lower_bound <= upper_bound < self.max_id:
+                id_ranges.append((lower_bound, upper_bound))
+                lower_bound = upper_bound + 1
+        id_ranges.append((lower_bound, self.max_id))
+        return id_ranges
+
     def construct_tasks(self) -> List[TaskSpec]:
         """Create the Task objects w/ the appropriate configuration"""
         name_gen = gen_random_name()
@@ -139,9 +223,16 @@ class Controller:
             sql=sql_str,
             transform_func=self.config["data_transform_func"],
             view=self.config["sql_view"],
+            checkpoint_key="null" if is_null_partition else f"{lower_bound}-{upper_bound}",
+            stream_batch_size=self.config["stream_batch_size"] if self.config.get("stream") else None,
+            bulk_senders=self.config.get("bulk_senders", 1),
+            targeted_deletes=self.config.get("targeted_deletes", False),
         )
 
     def get_id_range_for_partition(self, partition_number: int) -> Tuple[int, int]:
+        # The extra null partition is numbered past the last id-range partition and ignores its bounds
+        if self.partition_bounds and partition_number < len(self.partition_bounds):
+            return self.partition_bounds[partition_number]
         partition_size = self.config["partition_size"]
         lower_bound = self.min_id + (partition_number * partition_size)
         upper_bound = min(lower_bound + partition_size - 1, self.max_id)
@@ -158,7 +249,7 @@ class Controller:
             raise RuntimeError(f"No delete function implemented for type {self.config['data_type']}")
 
 
-def extract_transform_load(task: TaskSpec) -> None:
+def extract_transform_load(task: TaskSpec) -> Optional[Tuple[str, int, int, int]]:
     if abort.is_set():
         logger.warning(format_log(f"Skipping partition #{task.partition_number} due to previous error", name=task.name))
         return
@@ -169,16 +260,19 @@ def extract_transform_load(task: TaskSpec) -> None:
 
     client = instantiate_elasticsearch_client()
     try:
-        records = task.transform_func(task, extract_records(task))
-        if abort.is_set():
-            f"Prematurely ending partition #{task.partition_number} due to error in another process"
-            logger.warning(format_log(msg, name=task.name))
-            return
-        if len(records) > 0:
-            success, fail = load_data(task, records, client)
+        if task.stream_batch_size:
+            success, fail = load_data_in_batches(task, transform_in_batches(task), client)
         else:
-            logger.info(format_log("No records to index", name=task.name))
-            success, fail = 0, 0
+            records = task.transform_func(task, extract_records(task))
+            if abort.is_set():
+                f"Prematurely ending partition #{task.partition_number} due to error in another process"
+                logger.warning(format_log(msg, name=task.name))
+                return
+            if len(records) > 0:
+                success, fail = load_data(task, records, client)
+            else:
+                logger.info(format_log("No records to index", name=task.name))
+                success, fail = 0, 0
         with total_doc_success.get_lock():
             total_doc_success.value += success
         with total_doc_fail.get_lock():
@@ -193,3 +287,12 @@ def extract_transform_load(task: TaskSpec) -> None:
     else:
         msg = f"Partition #{task.partition_number} was successfully processed in {perf_counter() - start:.2f}s"
         logger.info(format_log(msg, name=task.name))
+        return task.checkpoint_key, task.partition_number, success, fail
+
+
+def transform_in_batches(task: TaskSpec) -> Generator[List[dict], None, None]:
+    """Transform each batch of streamed records only as the loader asks for it"""
+    for batch in extract_records_in_batches(task):
+        if abort.is_set():
+            raise RuntimeError(f"Prematurely ending partition #{task.partition_number} due to error in another process")
+        yield task.transform_func(task, batch)
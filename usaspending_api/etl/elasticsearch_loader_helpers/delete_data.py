@@ -4,7 +4,7 @@ import pandas as pd
 
 from django.conf import settings
 from time import perf_counter
-from typing import Optional, Dict, Union, Any
+from typing import Optional, Dict, List, Union, Any
 
 from elasticsearch import Elasticsearch
 from elasticsearch_dsl import Search
@@ -146,6 +146,57 @@ def delete_docs_by_unique_key(
     return deleted
 
 
+def lookup_ids_with_changed_routing(
+    client: Elasticsearch,
+    docs: List[dict],
+    task_id: str,
+    index: str,
+    lookup_chunk_size: int = 1000,
+) -> list:
+    """Find which of the given docs already exist in the index under a routing value other than their own
+
+    Indexing a doc overwrites an existing doc with the same ``_id`` only when both are routed to the same shard. So
+    only the docs found here need deleting before they are indexed (see ``streaming_post_to_es``); all others are
+    either new or will be overwritten in place. Docs are looked up by ``_id`` across all shards, returning only
+    their ``_routing`` metadata.
+
+    Args:
+        client (Elasticsearch): elasticsearch-dsl client for making calls to an ES cluster
+        docs (List[dict]): docs about to be indexed, holding their ``_id`` and (optional) ``routing`` meta fields
+        task_id (str): name of ES ETL job being run, used in logging
+        index (str): name of index (or alias) to look the docs up in
+        lookup_chunk_size (int): the batch-size of ``_id`` values looked-up per query. Up to double this many hits
+            are returned by each query, which must be less than the index.max_result_window setting.
+
+    Returns: list of the ``_id`` values of the docs that need to be deleted before being indexed
+    """
+    start = perf_counter()
+    routing_by_id = {str(doc["_id"]): doc.get("routing") for doc in docs}
+    id_by_str = {str(doc["_id"]): doc["_id"] for doc in docs}
+    changed_ids = set()
+    for chunk_of_ids in chunks(list(routing_by_id), lookup_chunk_size):
+        q = Search(using=client, index=index).filter("ids", values=chunk_of_ids).source(False)  # type: Search
+        # Leave room for any docs duplicated across shards by earlier bugs, which also need deleting
+        q = q.extra(size=2 * len(chunk_of_ids), track_total_hits=True)
+        response = q.execute().to_dict()
+        hits = response["hits"]["hits"]
+        if response["hits"]["total"]["value"] > len(hits):
+            # Not every existing doc was returned to compare, so play it safe and delete them all
+            changed_ids.update(chunk_of_ids)
+            continue
+        for hit in hits:
+            new_routing = routing_by_id[hit["_id"]]
+            if hit.get("_routing") != (str(new_routing) if new_routing is not None else None):
+                changed_ids.add(hit["_id"])
+
+    msg = (
+        f"Found {len(changed_ids):,} of {len(routing_by_id):,} docs already indexed under a different routing "
+        f"value in {perf_counter() - start:.2f}s"
+    )
+    logger.info(format_log(msg, action="Delete", name=task_id))
+    return [id_by_str[doc_id] for doc_id in changed_ids]
+
+
 def _is_allowed_key_field_type(client: Elasticsearch, key_field: str, index: str) -> bool:
     """Return ``True`` if the given field's mapping in the given index is in our allowed list of ES types
     compatible with term(s) queries
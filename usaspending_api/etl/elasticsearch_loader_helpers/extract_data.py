@@ -1,9 +1,14 @@
 import logging
 
 from time import perf_counter
-from typing import List, Tuple
+from typing import Generator, List, Tuple
 
-from usaspending_api.etl.elasticsearch_loader_helpers.utilities import TaskSpec, format_log, execute_sql_statement
+from usaspending_api.etl.elasticsearch_loader_helpers.utilities import (
+    TaskSpec,
+    format_log,
+    execute_sql_statement,
+    stream_sql_statement,
+)
 
 logger = logging.getLogger("script")
 
@@ -31,6 +36,14 @@ MIN_MAX_COUNT_SQL = """
     "\n", ""
 )
 
+PARTITION_UPPER_BOUNDS_SQL = """
+    SELECT percentile_disc(ARRAY[{fractions}]) WITHIN GROUP (ORDER BY "{primary_key}") AS upper_bounds
+    FROM "{sql_view}"
+    {optional_predicate}
+""".replace(
+    "\n", ""
+)
+
 
 def obtain_min_max_count_sql(config: dict) -> str:
     if "optional_predicate" not in config:
@@ -39,6 +52,14 @@ def obtain_min_max_count_sql(config: dict) -> str:
     return sql
 
 
+def obtain_partition_upper_bounds_sql(config: dict, partitions: int) -> str:
+    if "optional_predicate" not in config:
+        config["optional_predicate"] = ""
+    fractions = ", ".join(f"{i / partitions:.6f}" for i in range(1, partitions))
+    sql = PARTITION_UPPER_BOUNDS_SQL.format(fractions=fractions, **config).format(**config)
+    return sql
+
+
 def obtain_extract_sql(config: dict, is_null_partition: bool = False) -> str:
     if not config.get("optional_predicate"):
         config["optional_predicate"] = "WHERE"
@@ -61,6 +82,21 @@ def count_of_records_to_process(config: dict) -> Tuple[int, int, int]:
     return count, min_id, max_id
 
 
+def partition_upper_bounds(config: dict, partitions: int) -> List[int]:
+    """
+    Sample the distribution of primary key values to find the IDs that split the records into ``partitions``
+    groups of (roughly) equal row counts. Returns the ``partitions - 1`` inner upper bounds, in ascending order.
+    """
+    if partitions < 2:
+        return []
+    start = perf_counter()
+    results = execute_sql_statement(obtain_partition_upper_bounds_sql(config, partitions), True, config["verbose"])
+    upper_bounds = [bound for bound in results[0]["upper_bounds"] or [] if bound is not None]
+    msg = f"Found {len(upper_bounds):,} partition boundaries by row density, took {perf_counter() - start:.2f}s"
+    logger.info(format_log(msg, action="Extract"))
+    return upper_bounds
+
+
 def extract_records(task: TaskSpec) -> List[dict]:
     start = perf_counter()
     logger.info(format_log(f"Extracting data from source", name=task.name, action="Extract"))
@@ -74,3 +110,22 @@ def extract_records(task: TaskSpec) -> List[dict]:
     msg = f"{len(records):,} records extracted in {perf_counter() - start:.2f}s"
     logger.info(format_log(msg, name=task.name, action="Extract"))
     return records
+
+
+def extract_records_in_batches(task: TaskSpec) -> Generator[List[dict], None, None]:
+    """Lazily extract the partition's records with a server-side cursor, in batches of ``task.stream_batch_size``"""
+    start = perf_counter()
+    msg = f"Streaming data from source in batches of {task.stream_batch_size:,}"
+    logger.info(format_log(msg, name=task.name, action="Extract"))
+
+    record_count = 0
+    try:
+        for batch in stream_sql_statement(task.sql, task.stream_batch_size):
+            record_count += len(batch)
+            yield batch
+    except Exception as e:
+        logger.exception(f"Failed on partition {task.name} with '{task.sql}'")
+        raise e
+
+    msg = f"{record_count:,} records streamed from source over {perf_counter() - start:.2f}s"
+    logger.info(format_log(msg, name=task.name, action="Extract"))
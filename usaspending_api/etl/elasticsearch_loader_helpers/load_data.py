@@ -1,10 +1,14 @@
 import logging
 
-from elasticsearch import Elasticsearch, helpers
-from time import perf_counter
-from typing import List, Tuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from elasticsearch import Elasticsearch, TransportError, helpers
+from time import perf_counter, sleep
+from typing import Generator, Iterable, List, Optional, Tuple
 
-from usaspending_api.etl.elasticsearch_loader_helpers.delete_data import delete_docs_by_unique_key
+from usaspending_api.etl.elasticsearch_loader_helpers.delete_data import (
+    delete_docs_by_unique_key,
+    lookup_ids_with_changed_routing,
+)
 from usaspending_api.etl.elasticsearch_loader_helpers.utilities import TaskSpec, format_log
 
 
@@ -28,21 +32,89 @@ ES_MAX_BATCH_BYTES = 20 * 1024 * 1024
 # Ex: 3-data-node cluster of i3.large.elasticsearch = 2 vCPU * 3 nodes = 6 vCPU: 300*6 = 1800 doc batches
 # Ex: 5-data-node cluster of i3.xlarge.elasticsearch = 4 vCPU * 5 nodes = 20 vCPU: 300*20 = 6000 doc batches
 ES_BATCH_ENTRIES = 4000
+# Retry settings matching the defaults of helpers.streaming_bulk, for docs rejected by a busy cluster (HTTP 429)
+ES_BULK_MAX_RETRIES = 10
+ES_BULK_INITIAL_BACKOFF = 2
+ES_BULK_MAX_BACKOFF = 600
+# Fields of a document that go into the bulk action's metadata rather than its source
+ES_BULK_META_FIELDS = ("_id", "routing")
 
 
 def load_data(worker: TaskSpec, records: List[dict], client: Elasticsearch) -> Tuple[int, int]:
     start = perf_counter()
     logger.info(format_log(f"Starting Index operation", name=worker.name, action="Index"))
-    success, failed = streaming_post_to_es(
-        client, records, worker.index, worker.name, delete_before_index=worker.is_incremental
-    )
-    logger.info(format_log(f"Index operation took {perf_counter() - start:.2f}s", name=worker.name, action="Index"))
+    if worker.is_incremental and worker.targeted_deletes:
+        deletes_avoided = _delete_docs_with_changed_routing(worker, client, records)
+        success, failed = post_to_es(worker, client, records, delete_before_index=False)
+    else:
+        deletes_avoided = None
+        success, failed = post_to_es(worker, client, records, delete_before_index=worker.is_incremental)
+    _log_index_duration(worker, start, deletes_avoided)
+    return success, failed
+
+
+def load_data_in_batches(
+    worker: TaskSpec, record_batches: Iterable[List[dict]], client: Elasticsearch
+) -> Tuple[int, int]:
+    """
+    Index documents as batches of them arrive, rather than from a fully-materialized partition.
+
+    The batches are flattened into a single lazy stream of actions for ``helpers.streaming_bulk``, so only the
+    current batch plus the bulk request being built are held in memory. For incremental loads, each batch's
+    documents are deleted just before the first of them is yielded for indexing (see ``streaming_post_to_es``).
+    """
+    start = perf_counter()
+    logger.info(format_log(f"Starting streaming Index operation", name=worker.name, action="Index"))
+    stats = {"deletes_avoided": 0}
+    actions = _stream_actions(worker, record_batches, client, stats)
+    success, failed = post_to_es(worker, client, actions, delete_before_index=False)
+    _log_index_duration(worker, start, stats["deletes_avoided"] if worker.targeted_deletes else None)
     return success, failed
 
 
+def _stream_actions(
+    worker: TaskSpec, record_batches: Iterable[List[dict]], client: Elasticsearch, stats: dict, delete_key: str = "_id"
+) -> Generator[dict, None, None]:
+    for batch in record_batches:
+        if worker.is_incremental and worker.targeted_deletes:
+            stats["deletes_avoided"] += _delete_docs_with_changed_routing(worker, client, batch)
+        elif worker.is_incremental:
+            value_list = [doc[delete_key] for doc in batch]
+            delete_docs_by_unique_key(client, delete_key, value_list, worker.name, worker.index, refresh_after=False)
+        yield from batch
+
+
+def _delete_docs_with_changed_routing(worker: TaskSpec, client: Elasticsearch, docs: List[dict]) -> int:
+    """
+    Delete before indexing only the docs which would otherwise be left duplicated on another shard, rather than
+    every doc. Returns how many deletes that avoided.
+    """
+    changed_ids = lookup_ids_with_changed_routing(client, docs, worker.name, worker.index)
+    delete_docs_by_unique_key(client, "_id", changed_ids, worker.name, worker.index, refresh_after=False)
+    return len(docs) - len(changed_ids)
+
+
+def _log_index_duration(worker: TaskSpec, start: float, deletes_avoided: Optional[int]) -> None:
+    msg = f"Index operation took {perf_counter() - start:.2f}s"
+    if deletes_avoided is not None:
+        msg += f" and avoided {deletes_avoided:,} deletes of docs whose routing was unchanged"
+    logger.info(format_log(msg, name=worker.name, action="Index"))
+
+
+def post_to_es(
+    worker: TaskSpec, client: Elasticsearch, chunk: Iterable[dict], delete_before_index: bool
+) -> Tuple[int, int]:
+    """Index with as many concurrent bulk requests per process as the task allows"""
+    if worker.bulk_senders > 1:
+        return parallel_post_to_es(
+            client, chunk, worker.index, worker.name, delete_before_index, senders=worker.bulk_senders
+        )
+    return streaming_post_to_es(client, chunk, worker.index, worker.name, delete_before_index=delete_before_index)
+
+
 def streaming_post_to_es(
     client: Elasticsearch,
-    chunk: list,
+    chunk: Iterable[dict],
     index_name: str,
     job_name: str = None,
     delete_before_index: bool = True,
@@ -53,7 +125,8 @@ def streaming_post_to_es(
 
     Args:
         client: Elasticsearch client
-        chunk (List[dict]): list of dictionary objects holding field_name:value data
+        chunk (Iterable[dict]): dictionary objects holding field_name:value data. May be a lazy iterable
+            (e.g. a generator) only if delete_before_index is False, since deletes need every value up front
         index_name (str): name of targetted index
         job_name (str): name of ES ETL job being run, used in logging
         delete_before_index (bool): When true, attempts to delete given documents by a unique key before indexing them.
@@ -75,15 +148,7 @@ def streaming_post_to_es(
     success, failed = 0, 0
     try:
         if delete_before_index:
-            value_list = [doc[delete_key] for doc in chunk]
-            delete_docs_by_unique_key(
-                client,
-                delete_key,
-                value_list,
-                job_name,
-                index_name,
-                refresh_after=False,
-            )
+            _delete_before_index(client, chunk, index_name, job_name, delete_key)
         for ok, item in helpers.streaming_bulk(
             client,
             actions=chunk,
@@ -103,3 +168,113 @@ def streaming_post_to_es(
 
     logger.info(format_log(f"Success: {success:,} | Fail: {failed:,}", name=job_name, action="Index"))
     return success, failed
+
+
+def parallel_post_to_es(
+    client: Elasticsearch,
+    chunk: Iterable[dict],
+    index_name: str,
+    job_name: str = None,
+    delete_before_index: bool = True,
+    delete_key: str = "_id",
+    senders: int = 4,
+) -> Tuple[int, int]:
+    """
+    Pump data into an Elasticsearch index, keeping up to ``senders`` bulk requests in flight at once.
+
+    Each document is serialized to its NDJSON action and source lines exactly once, and the resulting bytes are
+    grouped into bulk request bodies of at most ES_BATCH_ENTRIES docs and ES_MAX_BATCH_BYTES bytes. Bodies are
+    sent from a thread pool sharing the (thread-safe) client. Building the next body waits while ``senders``
+    requests are outstanding, which bounds memory to roughly ``senders + 1`` bodies and gives the cluster
+    backpressure against this process.
+
+    Args and return value are as for ``streaming_post_to_es``, which documents ``delete_before_index``.
+    """
+    success, failed = 0, 0
+    try:
+        if delete_before_index:
+            _delete_before_index(client, chunk, index_name, job_name, delete_key)
+        with ThreadPoolExecutor(max_workers=senders, thread_name_prefix=f"{job_name} bulk") as executor:
+            in_flight = set()
+            for bulk_lines in _serialized_bulk_bodies(client, chunk):
+                if len(in_flight) >= senders:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        success += future.result()
+                in_flight.add(executor.submit(_send_bulk_body, client, index_name, bulk_lines, job_name))
+            for future in wait(in_flight).done:
+                success += future.result()
+
+    except Exception as e:
+        logger.error(f"Error on partition {job_name}:\n\n{str(e)[:2000]}\n...\n{str(e)[-2000:]}\n")
+        raise RuntimeError(f"{job_name}")
+
+    logger.info(format_log(f"Success: {success:,} | Fail: {failed:,}", name=job_name, action="Index"))
+    return success, failed
+
+
+def _delete_before_index(
+    client: Elasticsearch, chunk: Iterable[dict], index_name: str, job_name: str, delete_key: str
+) -> None:
+    value_list = [doc[delete_key] for doc in chunk]
+    delete_docs_by_unique_key(
+        client,
+        delete_key,
+        value_list,
+        job_name,
+        index_name,
+        refresh_after=False,
+    )
+
+
+def _serialized_bulk_bodies(client: Elasticsearch, docs: Iterable[dict]) -> Generator[List[bytes], None, None]:
+    """Serialize each doc once into its bulk action + source lines, grouped by doc count and byte size"""
+    serializer = client.transport.serializer
+    bulk_lines, bulk_bytes = [], 0
+    for doc in docs:
+        action = {"index": {field: doc[field] for field in ES_BULK_META_FIELDS if field in doc}}
+        source = {field: value for field, value in doc.items() if field not in ES_BULK_META_FIELDS}
+        doc_lines = f"{serializer.dumps(action)}\n{serializer.dumps(source)}\n".encode("utf-8")
+        if bulk_lines and (len(bulk_lines) >= ES_BATCH_ENTRIES or bulk_bytes + len(doc_lines) > ES_MAX_BATCH_BYTES):
+            yield bulk_lines
+            bulk_lines, bulk_bytes = [], 0
+        bulk_lines.append(doc_lines)
+        bulk_bytes += len(doc_lines)
+    if bulk_lines:
+        yield bulk_lines
+
+
+def _send_bulk_body(client: Elasticsearch, index_name: str, bulk_lines: List[bytes], job_name: str) -> int:
+    """
+    Send one bulk request, retrying with exponential backoff any docs (or the whole request) the cluster
+    rejected as too busy. Like ``helpers.streaming_bulk``, raises if any doc fails for another reason.
+    """
+    success, errors = 0, []
+    for attempt in range(ES_BULK_MAX_RETRIES + 1):
+        if attempt > 0:
+            sleep(min(ES_BULK_MAX_BACKOFF, ES_BULK_INITIAL_BACKOFF * 2 ** (attempt - 1)))
+        try:
+            response = client.bulk(body=b"".join(bulk_lines), index=index_name)
+        except TransportError as e:
+            if e.status_code == 429 and attempt < ES_BULK_MAX_RETRIES:
+                continue
+            raise
+
+        rejected = []
+        for doc_lines, item in zip(bulk_lines, response["items"]):
+            result = item["index"]
+            if 200 <= result["status"] < 300:
+                success += 1
+            elif result["status"] == 429 and attempt < ES_BULK_MAX_RETRIES:
+                rejected.append(doc_lines)
+            else:
+                errors.append(result)
+        if not rejected:
+            break
+        msg = f"Retrying {len(rejected):,} docs rejected by a busy cluster"
+        logger.warning(format_log(msg, name=job_name, action="Index"))
+        bulk_lines = rejected
+
+    if errors:
+        raise RuntimeError(f"{len(errors):,} document(s) failed to index: {errors[:4]}")
+    return success
@@ -1,8 +1,9 @@
 import logging
 
 from django.conf import settings
+from operator import itemgetter
 from time import perf_counter
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from usaspending_api.etl.elasticsearch_loader_helpers import aggregate_key_functions as funcs
 from usaspending_api.etl.elasticsearch_loader_helpers.utilities import (
@@ -15,7 +16,7 @@ from usaspending_api.etl.elasticsearch_loader_helpers.utilities import (
 logger = logging.getLogger("script")
 
 
-def transform_award_data(worker: TaskSpec, records: List[dict]) -> List[dict]:
+def transform_award_data(worker: TaskSpec, records: List[dict], batch_agg_keys: bool = False) -> List[dict]:
     converters = {}
     agg_key_creations = {
         "funding_subtier_agency_agg_key": funcs.funding_subtier_agency_agg_key,
@@ -43,10 +44,12 @@ def transform_award_data(worker: TaskSpec, records: List[dict]) -> List[dict]:
         "pop_county_population",
         "pop_congressional_population",
     ]
-    return transform_data(worker, records, converters, agg_key_creations, drop_fields, settings.ES_ROUTING_FIELD)
+    return transform_data(
+        worker, records, converters, agg_key_creations, drop_fields, settings.ES_ROUTING_FIELD, batch_agg_keys
+    )
 
 
-def transform_transaction_data(worker: TaskSpec, records: List[dict]) -> List[dict]:
+def transform_transaction_data(worker: TaskSpec, records: List[dict], batch_agg_keys: bool = False) -> List[dict]:
     converters = {
         "federal_accounts": convert_postgres_json_array_to_list,
     }
@@ -80,7 +83,9 @@ def transform_transaction_data(worker: TaskSpec, records: List[dict]) -> List[di
         "recipient_levels",
         "funding_toptier_agency_id",
     ]
-    return transform_data(worker, records, converters, agg_key_creations, drop_fields, settings.ES_ROUTING_FIELD)
+    return transform_data(
+        worker, records, converters, agg_key_creations, drop_fields, settings.ES_ROUTING_FIELD, batch_agg_keys
+    )
 
 
 def transform_covid19_faba_data(worker: TaskSpec, records: List[dict]) -> List[dict]:
@@ -135,16 +140,34 @@ def transform_data(
     agg_key_creations: Dict[str, Callable],
     drop_fields: List[str],
     routing_field: Optional[str] = None,
+    batch_agg_keys: bool = False,
 ) -> List[dict]:
     logger.info(format_log(f"Transforming data", name=worker.name, action="Transform"))
 
     start = perf_counter()
 
+    if batch_agg_keys and records:
+        agg_key_lookups = compile_agg_key_lookups(agg_key_creations, records[0])
+    else:
+        agg_key_lookups = None
+
     for record in records:
         for field, converter in converters.items():
             record[field] = converter(record[field])
-        for key, transform_func in agg_key_creations.items():
-            record[key] = transform_func(record)
+        if agg_key_lookups:
+            for key, transform_func, get_source_values, generated_keys in agg_key_lookups:
+                source_values = get_source_values(record)
+                try:
+                    agg_key = generated_keys.get(source_values, _NOT_GENERATED)
+                except TypeError:  # unhashable value, e.g. a list from a Postgres array column
+                    source_values = _hashable(source_values)
+                    agg_key = generated_keys.get(source_values, _NOT_GENERATED)
+                if agg_key is _NOT_GENERATED:
+                    agg_key = generated_keys[source_values] = transform_func(record)
+                record[key] = agg_key
+        else:
+            for key, transform_func in agg_key_creations.items():
+                record[key] = transform_func(record)
 
         # Route all documents with the same recipient to the same shard
         # This allows for accuracy and early-termination of "top N" recipient category aggregation queries
@@ -168,3 +191,37 @@ def transform_data(
     duration = perf_counter() - start
     logger.info(format_log(f"Transformation operation took {duration:.2f}s", name=worker.name, action="Transform"))
     return records
+
+
+_NOT_GENERATED = object()
+
+
+def compile_agg_key_lookups(
+    agg_key_creations: Dict[str, Callable], sample_record: dict
+) -> List[Tuple[str, Callable, Callable, Dict[Tuple, Optional[str]]]]:
+    """
+    Prepare, once per batch of records, the lookups used to generate each aggregate key only once per distinct
+    combination of the source column values it is built from. Agency, location, NAICS and PSC values repeat
+    heavily across records, so most records then reuse an already-serialized key rather than calling
+    ``json.dumps``. The generated keys are the very strings the per-record functions return for those values.
+
+    Values from the same column share a single DB type, so values comparing equal across types (e.g. 1 and 1.0)
+    can't collide in the lookups.
+    """
+    lookups = []
+    for key, transform_func in agg_key_creations.items():
+        # Only the columns in the record are read. The functions' optional columns are consistently present or
+        # absent for every record in a batch since they all come from the same SQL
+        columns = [col for col in funcs.AGG_KEY_SOURCE_COLUMNS[transform_func] if col in sample_record]
+        get_source_values = itemgetter(*columns) if len(columns) > 1 else _tuple_getter(columns)
+        lookups.append((key, transform_func, get_source_values, {}))
+    return lookups
+
+
+def _tuple_getter(columns: List[str]) -> Callable[[dict], Tuple]:
+    """itemgetter() returns a bare value rather than a tuple when given fewer than two items"""
+    return lambda record: tuple(record[col] for col in columns)
+
+
+def _hashable(values: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    return tuple(tuple(v) if isinstance(v, list) else v for v in values)
@@ -6,6 +6,7 @@ import re
 from dataclasses import dataclass
 from django.conf import settings
 from elasticsearch import Elasticsearch
+from io import StringIO
 from pathlib import Path
 from random import choice
 from typing import Any, Generator, List, Optional
@@ -14,6 +15,11 @@ from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
 
 logger = logging.getLogger("script")
 
+# Backslash escapes emitted by Postgres's COPY ... TO in text format (which never emits octal or hex escapes)
+COPY_TEXT_ESCAPES = {"b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t", "v": "\v", "\\": "\\"}
+COPY_TEXT_ESCAPE_PATTERN = re.compile(r"\\(.)")
+COPY_TEXT_NULL = "\\N"
+
 
 @dataclass
 class TaskSpec:
@@ -31,6 +37,10 @@ class TaskSpec:
     is_incremental: bool
     execute_sql_func: callable = None
     transform_func: callable = None
+    checkpoint_key: Optional[str] = None
+    stream_batch_size: Optional[int] = None
+    bulk_senders: int = 1
+    targeted_deletes: bool = False
 
 
 def chunks(items: List[Any], size: int) -> List[Any]:
@@ -68,6 +78,71 @@ def execute_sql_statement(cmd: str, results: bool = False, verbose: bool = False
     return rows
 
 
+def copy_sql_statement(cmd: str, results: bool = False, verbose: bool = False) -> Optional[List[dict]]:
+    """
+    Drop-in alternative to ``execute_sql_statement`` for a SELECT, which fetches its results with
+    ``COPY (...) TO STDOUT`` in text format rather than through the cursor's row-by-row result protocol.
+
+    The whole output is read into a single text buffer and decoded as one block. Each column is converted with the
+    psycopg2 typecaster of its DB type, giving the same Python values as ``execute_sql_statement`` would.
+    """
+    rows = None
+    if verbose:
+        print(cmd)
+
+    with psycopg2.connect(dsn=get_database_dsn_string()) as connection:
+        connection.autocommit = True
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT * FROM ({cmd}) AS copy_source LIMIT 0")  # only to learn the column types
+            columns = [col[0] for col in cursor.description]
+            typecasters = [psycopg2.extensions.string_types.get(col[1]) for col in cursor.description]
+            buffer = StringIO()
+            cursor.copy_expert(f"COPY ({cmd}) TO STDOUT", buffer)
+            if results:
+                rows = decode_copy_text(buffer.getvalue(), columns, typecasters, cursor)
+    return rows
+
+
+def decode_copy_text(
+    copy_text: str, columns: List[str], typecasters: List[Optional[callable]], cursor: psycopg2.extensions.cursor
+) -> List[dict]:
+    """Decode the text-format output of COPY ... TO into a dictionary per row"""
+    rows = []
+    for line in copy_text.split("\n")[:-1]:  # output ends with a newline
+        values = []
+        for value, typecaster in zip(line.split("\t"), typecasters):
+            if value == COPY_TEXT_NULL:
+                values.append(None)
+                continue
+            if "\\" in value:
+                value = COPY_TEXT_ESCAPE_PATTERN.sub(lambda m: COPY_TEXT_ESCAPES.get(m.group(1), m.group(1)), value)
+            values.append(typecaster(value, cursor) if typecaster else value)
+        rows.append(dict(zip(columns, values)))
+    return rows
+
+
+def stream_sql_statement(cmd: str, batch_size: int, verbose: bool = False) -> Generator[List[dict], None, None]:
+    """
+    Execute SQL using a single-use psycopg2 connection and a server-side (named) cursor, yielding the results
+    as lists of at most ``batch_size`` dictionaries so only one batch of rows is held in memory at a time
+    """
+    if verbose:
+        print(cmd)
+
+    with psycopg2.connect(dsn=get_database_dsn_string()) as connection:
+        # Named cursors must live inside a transaction, so autocommit is left off for this connection
+        connection.set_session(readonly=True)
+        with connection.cursor(name="es_etl_stream_cursor") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(cmd)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                columns = [col[0] for col in cursor.description]
+                yield [dict(zip(columns, row)) for row in rows]
+
+
 def db_rows_to_dict(cursor: psycopg2.extensions.cursor) -> List[dict]:
     """Return a dictionary of all row results from a database connection cursor"""
     columns = [col[0] for col in cursor.description]
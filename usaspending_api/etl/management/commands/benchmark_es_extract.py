@@ -0,0 +1,56 @@
+import logging
+
+from django.core.management.base import BaseCommand
+from time import perf_counter
+
+from usaspending_api.common.elasticsearch.elasticsearch_sql_helpers import ensure_view_exists
+from usaspending_api.etl.elasticsearch_loader_helpers import (
+    copy_sql_statement,
+    count_of_records_to_process,
+    execute_sql_statement,
+    format_log,
+    obtain_extract_sql,
+)
+from usaspending_api.etl.management.commands.elasticsearch_indexer import set_config
+
+logger = logging.getLogger("script")
+
+EXTRACT_METHODS = {"cursor": execute_sql_statement, "copy": copy_sql_statement}
+
+
+class Command(BaseCommand):
+    help = """
+    Compare the rows/second of the 'cursor' and 'copy' extract methods of elasticsearch_indexer (see its
+    --extract-method) over the first partitions of an ETL view, and verify both fetch identical records.
+    Read-only, but puts full-partition extract load on the database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--load-type", type=str, choices=["award", "transaction"], default="transaction")
+        parser.add_argument("--partition-size", type=int, default=10000)
+        parser.add_argument("--partitions", type=int, default=5, help="Number of partitions to extract per method")
+
+    def handle(self, *args, **options):
+        config = set_config([], {"load_type": options["load_type"], "verbosity": 0})
+        config["starting_date"] = config["initial_datetime"]
+        ensure_view_exists(config["sql_view"])
+        _, min_id, _ = count_of_records_to_process(config)
+
+        timings = {method: 0.0 for method in EXTRACT_METHODS}
+        row_count = 0
+        for partition_number in range(options["partitions"]):
+            lower_bound = min_id + partition_number * options["partition_size"]
+            sql_config = {**config, "lower_bound": lower_bound, "upper_bound": lower_bound + options["partition_size"]}
+            sql = obtain_extract_sql(sql_config)
+            results = {}
+            for method, sql_func in EXTRACT_METHODS.items():
+                start = perf_counter()
+                results[method] = sql_func(sql, True)
+                timings[method] += perf_counter() - start
+            if results["cursor"] != results["copy"]:
+                raise SystemExit(f"Fatal error: extract methods fetched different records for partition {sql}")
+            row_count += len(results["cursor"])
+
+        for method, duration in timings.items():
+            msg = f"{method:>6} extract: {row_count / duration:,.0f} rows/s ({row_count:,} rows in {duration:.2f}s)"
+            logger.info(format_log(msg, action="Benchmark"))
@@ -0,0 +1,107 @@
+import json
+import logging
+
+from copy import deepcopy
+from django.core.management.base import BaseCommand
+from random import Random
+from time import perf_counter
+from typing import List
+
+from usaspending_api.etl.elasticsearch_loader_helpers import (
+    TaskSpec,
+    format_log,
+    transform_award_data,
+    transform_transaction_data,
+)
+from usaspending_api.etl.elasticsearch_loader_helpers.aggregate_key_functions import AGG_KEY_SOURCE_COLUMNS
+
+logger = logging.getLogger("script")
+
+TRANSFORM_FUNCS = {"award": transform_award_data, "transaction": transform_transaction_data}
+
+
+class Command(BaseCommand):
+    help = """
+    Compare the throughput of the 'row' and 'batch' aggregate key generation of the Elasticsearch ETL transform
+    (see --transform-mode of elasticsearch_indexer) over synthetic records, and verify both produce identical
+    documents. Does not touch the database or Elasticsearch.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--load-type", type=str, choices=list(TRANSFORM_FUNCS), default="transaction")
+        parser.add_argument("--records", type=int, default=100000, help="Number of records per partition")
+        parser.add_argument(
+            "--distinct-values",
+            type=int,
+            default=500,
+            help="Number of distinct values drawn from for each agency, location, NAICS and PSC column",
+        )
+        parser.add_argument("--distinct-recipients", type=int, default=20000)
+        parser.add_argument("--repeat", type=int, default=3, help="Report the best of this many timings")
+
+    def handle(self, *args, **options):
+        transform_func = TRANSFORM_FUNCS[options["load_type"]]
+        records = generate_records(
+            options["load_type"], options["records"], options["distinct_values"], options["distinct_recipients"]
+        )
+        worker = TaskSpec(
+            name="benchmark",
+            index=None,
+            sql=None,
+            view=None,
+            base_table=None,
+            base_table_id=None,
+            field_for_es_id=f"{options['load_type']}_id",
+            primary_key=f"{options['load_type']}_id",
+            partition_number=0,
+            is_incremental=False,
+        )
+
+        logging.getLogger("script").setLevel(logging.WARNING)  # silence per-partition transform logs while timing
+        results = {}
+        for mode in ("row", "batch"):
+            timings = []
+            for _ in range(options["repeat"]):
+                partition = deepcopy(records)
+                start = perf_counter()
+                docs = transform_func(worker, partition, batch_agg_keys=(mode == "batch"))
+                timings.append(perf_counter() - start)
+            results[mode] = (min(timings), docs)
+        logging.getLogger("script").setLevel(logging.INFO)
+
+        row_docs, batch_docs = results["row"][1], results["batch"][1]
+        if [json.dumps(d) for d in row_docs] != [json.dumps(d) for d in batch_docs]:
+            raise SystemExit("Fatal error: 'row' and 'batch' transforms produced different documents")
+
+        for mode, (duration, _) in results.items():
+            msg = f"{mode:>5} transform: {len(records) / duration:,.0f} records/s ({duration:.3f}s)"
+            logger.info(format_log(msg, action="Benchmark"))
+        speedup = results["row"][0] / results["batch"][0]
+        logger.info(format_log(f"batch is {speedup:.2f}x the speed of row, with identical documents", "Benchmark"))
+
+
+def generate_records(load_type: str, count: int, distinct_values: int, distinct_recipients: int) -> List[dict]:
+    """Fake ETL view records holding every column read by the transform, with realistic repetition of values"""
+    rng = Random(0)
+    transform_columns = {col for cols in AGG_KEY_SOURCE_COLUMNS.values() for col in cols}
+    records = []
+    for i in range(count):
+        value_id = rng.randrange(distinct_values)
+        recipient_id = rng.randrange(distinct_recipients)
+        record = {col: f"{col}-{value_id}" for col in transform_columns}
+        record.update(
+            {
+                f"{load_type}_id": i,
+                "federal_accounts": [{"id": value_id, "federal_account_code": f"{value_id:03}-{value_id:04}"}],
+                "funding_subtier_agency_id": value_id,
+                "recipient_hash": f"{recipient_id:08x}-0000-0000-0000-000000000000",
+                "recipient_levels": ["C", "R"] if recipient_id % 2 else ["P"],
+                "recipient_name": f"RECIPIENT {recipient_id}",
+                "recipient_unique_id": f"{recipient_id:09}",
+            }
+        )
+        for col in transform_columns:
+            if col.endswith("_population") or col.endswith("_agency_id"):
+                record[col] = value_id * 1000
+        records.append(record)
+    return records
@@ -0,0 +1,83 @@
+import logging
+import re
+
+from datetime import date
+from django.core.management.base import BaseCommand
+from random import Random
+from time import perf_counter
+
+from usaspending_api.common.long_to_terse import LONG_TO_TERSE_LABELS
+from usaspending_api.etl.management.load_base import ModelDataMapper, compile_model_data_mapper
+from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
+    transaction_fpds_boolean_columns,
+    transaction_fpds_nonboolean_columns,
+)
+from usaspending_api.etl.transaction_loaders.fpds_loader import _compile_load_object_mapper, _create_load_object
+from usaspending_api.financial_activities.models import FinancialAccountsByProgramActivityObjectClass
+
+logger = logging.getLogger("script")
+
+REVERSE = re.compile(r"(_(cpe|fyb)$)|^transaction_obligated_amount$")
+
+
+class Command(BaseCommand):
+    help = """
+    Compare the rows/second of transforming broker rows with a column plan worked out for every row and with a
+    compiled one, for File B rows (load_data_into_model) and the columns of FPDS transactions (fpds_loader), and verify
+    both produce identical results. Uses synthetic rows; does not touch the database.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=20000, help="Number of synthetic rows per benchmark")
+
+    def handle(self, *args, **options):
+        rng = Random(0)
+        model = FinancialAccountsByProgramActivityObjectClass
+        file_b_rows = [generate_file_b_row(rng) for _ in range(options["rows"])]
+        value_map = {"reporting_period_start": date(2020, 1, 1), "reporting_period_end": date(2020, 3, 31)}
+
+        file_b_mapper = compile_model_data_mapper(model, None, value_map, REVERSE)
+        self.benchmark(
+            "File B",
+            file_b_rows,
+            lambda row: ModelDataMapper(model, None, value_map, REVERSE).to_dict(row, value_map),
+            lambda row: file_b_mapper.to_dict(row, value_map),
+        )
+
+        fpds_rows = [generate_fpds_row(rng) for _ in range(options["rows"])]
+        create_transaction_fpds = _compile_load_object_mapper(
+            transaction_fpds_nonboolean_columns, transaction_fpds_boolean_columns, None
+        )
+        self.benchmark(
+            "FPDS",
+            fpds_rows,
+            lambda row: _create_load_object(
+                row, transaction_fpds_nonboolean_columns, transaction_fpds_boolean_columns, None
+            ),
+            create_transaction_fpds,
+        )
+
+    @staticmethod
+    def benchmark(name, rows, per_row_plan, compiled_plan):
+        results = {}
+        for method, transform in (("per-row plan", per_row_plan), ("compiled plan", compiled_plan)):
+            start = perf_counter()
+            results[method] = [transform(row) for row in rows]
+            duration = perf_counter() - start
+            logger.info(f"{name} {method:>13}: {len(rows) / duration:,.0f} rows/s ({duration:.2f}s)")
+        if results["per-row plan"] != results["compiled plan"]:
+            raise SystemExit(f"Fatal error: {name} column plans transformed rows differently")
+
+
+def generate_file_b_row(rng):
+    row = {"last_modified_date": "2020-03-31 12:00:00", "by_direct_reimbursable_fun": "D"}
+    for field in FinancialAccountsByProgramActivityObjectClass._meta.get_fields():
+        if field.get_internal_type() == "DecimalField":
+            row[LONG_TO_TERSE_LABELS.get(field.name, field.name)] = f"{rng.randrange(10 ** 7) / 100:.2f}"
+    return row
+
+
+def generate_fpds_row(rng):
+    row = {column: f"value {rng.randrange(1000)}" for column in transaction_fpds_nonboolean_columns}
+    row.update({column: rng.choice([True, False, None]) for column in transaction_fpds_boolean_columns})
+    return row
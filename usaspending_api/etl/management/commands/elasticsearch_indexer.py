@@ -1,8 +1,10 @@
 import logging
+import tempfile
 
 from datetime import datetime, timezone
 from django.conf import settings
 from django.core.management.base import BaseCommand
+from functools import partial
 from time import perf_counter
 
 from usaspending_api.broker.helpers.last_load_date import get_last_load_date
@@ -11,6 +13,7 @@ from usaspending_api.common.elasticsearch.elasticsearch_sql_helpers import ensur
 from usaspending_api.common.helpers.date_helper import datetime_command_line_argument_type
 from usaspending_api.etl.elasticsearch_loader_helpers import (
     Controller,
+    copy_sql_statement,
     execute_sql_statement,
     format_log,
     toggle_refresh_off,
@@ -101,6 +104,73 @@ class Command(BaseCommand):
             default=10000,
             metavar="(default: 10,000)",
         )
+        parser.add_argument(
+            "--partition-strategy",
+            type=str,
+            help="How the ID range is split into partitions. 'even' splits it into equal-width ID ranges of "
+            "--partition-size IDs. 'density' samples the distribution of IDs and splits it into ranges holding "
+            "roughly --partition-size records each, so sparse ID ranges don't yield near-empty partitions.",
+            default="even",
+            choices=["even", "density"],
+        )
+        parser.add_argument(
+            "--bulk-senders",
+            type=int,
+            help="Number of bulk index requests each process keeps in flight. When more than 1, docs are "
+            "serialized once into byte-sized bulk requests which are sent from a pool of threads.",
+            default=1,
+            choices=range(1, 11),
+            metavar="[1-10]",
+        )
+        parser.add_argument(
+            "--targeted-deletes",
+            action="store_true",
+            help="On incremental loads, look up which docs to be indexed already exist under a different routing "
+            "value and delete only those before indexing, rather than deleting every doc about to be indexed",
+        )
+        parser.add_argument(
+            "--extract-method",
+            type=str,
+            help="How each partition's rows are fetched from the DB. 'cursor' fetches them through a regular cursor. "
+            "'copy' fetches them with COPY (...) TO STDOUT and decodes them in one block.",
+            default="cursor",
+            choices=["cursor", "copy"],
+        )
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            help="Stream each partition from the DB with a server-side cursor, transforming and indexing it in "
+            "batches of --stream-batch-size so process memory stays flat regardless of --partition-size",
+        )
+        parser.add_argument(
+            "--stream-batch-size",
+            type=int,
+            help="Number of rows fetched from the DB per batch when --stream is provided.",
+            default=2000,
+            metavar="(default: 2,000)",
+        )
+        parser.add_argument(
+            "--transform-mode",
+            type=str,
+            help="'row' generates every aggregate key of every record. 'batch' generates each aggregate key once per "
+            "distinct combination of its source values in a partition, reusing it for the other records. "
+            "Both produce identical documents.",
+            default="row",
+            choices=["row", "batch"],
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            help="Resume a previous run against the same index that failed part way through, with the partitions "
+            "stored in its checkpoint ledger, skipping those recorded as completed",
+        )
+        parser.add_argument(
+            "--checkpoint-dir",
+            type=str,
+            help="Directory holding the checkpoint ledger of completed partitions for each target index.",
+            default=tempfile.gettempdir(),
+            metavar="",
+        )
         parser.add_argument(
             "--drop-db-view",
             action="store_true",
@@ -153,19 +223,42 @@ class Command(BaseCommand):
 
 def parse_cli_args(options: dict, es_client) -> dict:
     passthrough_values = [
+        "bulk_senders",
+        "checkpoint_dir",
         "create_new_index",
         "drop_db_view",
+        "extract_method",
         "index_name",
         "load_type",
         "partition_size",
+        "partition_strategy",
         "process_deletes",
         "deletes_only",
         "processes",
+        "resume",
         "skip_counts",
         "skip_delete_index",
+        "stream",
+        "stream_batch_size",
+        "targeted_deletes",
+        "transform_mode",
     ]
     config = set_config(passthrough_values, options)
 
+    if config["stream"] and config["load_type"] == "covid19-faba":
+        # covid19-faba documents are aggregated across many DB rows, which could be split between streamed batches
+        raise SystemExit("Fatal error: '--stream' is not supported with '--load-type=covid19-faba'.")
+
+    if config["extract_method"] == "copy":
+        if config["stream"]:
+            raise SystemExit("Fatal error: '--extract-method=copy' cannot be combined with '--stream'.")
+        config["execute_sql_func"] = copy_sql_statement
+
+    if config["transform_mode"] == "batch":
+        if config["load_type"] == "covid19-faba":
+            raise SystemExit("Fatal error: '--transform-mode=batch' is not supported with '--load-type=covid19-faba'.")
+        config["data_transform_func"] = partial(config["data_transform_func"], batch_agg_keys=True)
+
     if config["create_new_index"] and not config["index_name"]:
         raise SystemExit("Fatal error: '--create-new-index' requires '--index-name'.")
     elif config["create_new_index"]:
@@ -194,7 +287,7 @@ def parse_cli_args(options: dict, es_client) -> dict:
             logger.error(f"Write alias '{config['write_alias']}' is missing")
             raise SystemExit(1)
     else:
-        if config["index_name"] and es_client.indices.exists(config["index_name"]):
+        if config["index_name"] and es_client.indices.exists(config["index_name"]) and not config["resume"]:
             logger.error(f"Data load into existing index. Change index name or run an incremental load")
             raise SystemExit(1)
 
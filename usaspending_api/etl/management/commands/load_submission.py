@@ -6,6 +6,7 @@ from django.core.management.base import CommandError
 from django.db import transaction
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
 from usaspending_api.etl.management import load_base
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import DEFAULT_COPY_BUFFER_SIZE
 from usaspending_api.etl.submission_loader_helpers.file_a import get_file_a, load_file_a
 from usaspending_api.etl.submission_loader_helpers.file_b import get_file_b, load_file_b
 from usaspending_api.etl.submission_loader_helpers.file_c import get_file_c, load_file_c
@@ -28,6 +29,7 @@ class Command(load_base.Command):
 
     submission_id = None
     file_c_chunk_size = 100000
+    copy_buffer_size = None
     force_reload = False
     skip_final_of_fy_calculation = False
     db_cursor = None
@@ -64,6 +66,14 @@ class Command(load_base.Command):
                 "bigger should be faster... right up until you run out of memory.  Balance carefully."
             ),
         )
+        parser.add_argument(
+            "--copy-buffer-size",
+            type=int,
+            help=(
+                "Stream File A/B/C records into their tables with COPY FROM STDIN, this many records at a time, "
+                f"instead of saving them with bulk_create.  {DEFAULT_COPY_BUFFER_SIZE:,} is a good start."
+            ),
+        )
         super(Command, self).add_arguments(parser)
 
     def handle_loading(self, db_cursor, *args, **options):
@@ -71,6 +81,7 @@ class Command(load_base.Command):
         self.submission_id = options["submission_id"]
         self.force_reload = options["force_reload"]
         self.file_c_chunk_size = options["file_c_chunk_size"]
+        self.copy_buffer_size = options["copy_buffer_size"]
         self.skip_final_of_fy_calculation = options["skip_final_of_fy_calculation"]
         self.db_cursor = db_cursor
 
@@ -115,7 +126,7 @@ class Command(load_base.Command):
         )
         logger.info("Loading File A data")
         start_time = datetime.now()
-        load_file_a(submission_attributes, appropriation_data, self.db_cursor)
+        load_file_a(submission_attributes, appropriation_data, self.db_cursor, self.copy_buffer_size)
         logger.info(f"Finished loading File A data, took {datetime.now() - start_time}")
 
         logger.info("Getting File B data")
@@ -126,7 +137,7 @@ class Command(load_base.Command):
         )
         logger.info("Loading File B data")
         start_time = datetime.now()
-        load_file_b(submission_attributes, prg_act_obj_cls_data, self.db_cursor)
+        load_file_b(submission_attributes, prg_act_obj_cls_data, self.db_cursor, self.copy_buffer_size)
         logger.info(f"Finished loading File B data, took {datetime.now() - start_time}")
 
         logger.info("Getting File C data")
@@ -137,7 +148,7 @@ class Command(load_base.Command):
         )
         logger.info("Loading File C data")
         start_time = datetime.now()
-        load_file_c(submission_attributes, self.db_cursor, certified_award_financial)
+        load_file_c(submission_attributes, self.db_cursor, certified_award_financial, self.copy_buffer_size)
         logger.info(f"Finished loading File C data, took {datetime.now() - start_time}")
 
         if self.skip_final_of_fy_calculation:
@@ -5,6 +5,7 @@ import dateutil
 import logging
 
 from decimal import Decimal
+from functools import lru_cache
 from django.core.management.base import BaseCommand
 from django.db import connections
 from usaspending_api.common.long_to_terse import LONG_TO_TERSE_LABELS
@@ -78,6 +79,9 @@ def load_data_into_model(model_instance, data, **kwargs):
         reverse -   Field names matching this regex should be reversed
                     (multiplied by -1) before saving.
         as_dict - If true, returns the model as a dict instead of saving or altering
+
+    The column plan is compiled once per model, field_map, value_map fields and reverse regex (see
+    compile_model_data_mapper); loops over many rows can compile it themselves and skip the lookup.
     """
     field_map = kwargs.get("field_map")
     value_map = kwargs.get("value_map")
@@ -85,73 +89,125 @@ def load_data_into_model(model_instance, data, **kwargs):
     as_dict = kwargs.get("as_dict", False)
     reverse = kwargs.get("reverse")
 
-    # Grab all the field names from the meta class of the model instance
-    fields = [field.name for field in model_instance._meta.get_fields()]
-    mod = model_instance
+    mapper = compile_model_data_mapper(type(model_instance), field_map, value_map, reverse)
 
     if as_dict:
-        mod = {}
-
-    for field in fields:
-        # Let's handle the data source field here for all objects
-        if field == "data_source" and field not in value_map:
-            store_value(mod, field, "DBR", reverse)
-
-        broker_field = field
-        # If our field is the 'long form' field, we need to get what it maps to
-        # in the broker so we can map the data properly
-        if broker_field in LONG_TO_TERSE_LABELS:
-            broker_field = LONG_TO_TERSE_LABELS[broker_field]
-        sts = False
-        if value_map:
-            if broker_field in value_map:
-                store_value(mod, field, value_map[broker_field], reverse, data)
-                sts = True
-            elif field in value_map:
-                store_value(mod, field, value_map[field], reverse, data)
-                sts = True
-        if field_map and not sts:
-            if broker_field in field_map:
-                try:
-                    store_value(mod, field, data[field_map[broker_field]], reverse)
-                    sts = True
-                except KeyError:
-                    print("column {} missing from data".format(field_map[broker_field]))
-            elif field in field_map:
-                store_value(mod, field, data[field_map[field]], reverse)
-                sts = True
-        if broker_field in data and not sts:
-            store_value(mod, field, data[broker_field], reverse)
-        elif field in data and not sts:
-            store_value(mod, field, data[field], reverse)
+        mod = mapper.to_dict(data, value_map)
+    else:
+        mod = mapper.to_model(data, value_map, model_instance)
 
     if save:
         model_instance.save()
-    if as_dict:
-        return mod
-    else:
+    return mod
+
+
+class ModelDataMapper:
+    """
+    The column plan of load_data_into_model for a model, a field_map, the fields of a value_map and a reverse regex,
+    worked out once: which value_map entry or data column each model field is loaded from, and whether it is parsed as
+    a date or reversed. Loading a row then only moves and converts values. Rows are loaded with value_maps holding
+    the same fields as the one the mapper was compiled for; their values (and callables) can differ by row.
+    """
+
+    def __init__(self, model, field_map=None, value_map_fields=(), reverse=None):
+        self.model = model
+        field_map = field_map or {}
+        value_map_fields = set(value_map_fields)
+        steps = []
+
+        for field in [field.name for field in model._meta.get_fields()]:
+            # If our field is the 'long form' field, the broker names it with what it maps to
+            broker_field = LONG_TO_TERSE_LABELS.get(field, field)
+            value_key = column = None
+            column_is_optional = False
+            if broker_field in value_map_fields:
+                value_key = broker_field
+            elif field in value_map_fields:
+                value_key = field
+            elif broker_field in field_map:
+                column = field_map[broker_field]
+                column_is_optional = True
+            elif field in field_map:
+                column = field_map[field]
+
+            data_columns = (broker_field,) if broker_field == field else (broker_field, field)
+            # Let's handle the data source field here for all objects
+            default = "DBR" if field == "data_source" and field not in value_map_fields else _NOT_LOADED
+            parse_date = field.endswith("date")
+            negate = bool(reverse and reverse.search(field))
+
+            steps.append((field, value_key, column, column_is_optional, data_columns, default, parse_date, negate))
+
+        self._steps = tuple(steps)
+
+    def to_dict(self, data, value_map=None):
+        values = {}
+        for field, value_key, column, column_is_optional, data_columns, default, parse_date, negate in self._steps:
+            if value_key is not None:
+                value = value_map[value_key]
+            else:
+                value = _NOT_LOADED
+                if column is not None:
+                    if column_is_optional and column not in data:
+                        print("column {} missing from data".format(column))
+                    else:
+                        value = data[column]
+                if value is _NOT_LOADED:
+                    for data_column in data_columns:
+                        if data_column in data:
+                            value = data[data_column]
+                            break
+                    else:
+                        if default is _NOT_LOADED:
+                            continue
+                        value = default
+
+            # turn datetimes into dates
+            if parse_date and isinstance(value, str):
+                value = _parse_date_string(value)
+
+            # handles the value_map containing a function
+            if value_key is not None and callable(value) and data:
+                value = value(data)
+
+            if negate:
+                try:
+                    value = -1 * Decimal(value)
+                except TypeError:
+                    pass
+
+            values[field] = value
+
+        return values
+
+    def to_model(self, data, value_map=None, model_instance=None):
+        if model_instance is None:
+            model_instance = self.model()
+        for field, value in self.to_dict(data, value_map).items():
+            setattr(model_instance, field, value)
         return model_instance
 
 
-def store_value(model_instance_or_dict, field, value, reverse=None, data=None):
-    # turn datetimes into dates
-    if field.endswith("date") and isinstance(value, str):
-        try:
-            value = dateutil.parser.parse(value).date()
-        except (TypeError, ValueError):
-            pass
+_NOT_LOADED = object()
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_string(value):
+    """Date strings repeat across the rows of a load (e.g. the same last modified date), so parse each once"""
+    try:
+        return dateutil.parser.parse(value).date()
+    except (TypeError, ValueError):
+        return value
+
 
-    # handles the value_map containing a function
-    if callable(value) and data:
-        value = value(data)
+def compile_model_data_mapper(model, field_map=None, value_map=None, reverse=None):
+    """
+    Returns the (cached) ModelDataMapper of load_data_into_model for these arguments. Only the fields of value_map
+    matter, so it can also be just their names; loaders compile it once ahead of their rows.
+    """
+    return _compile_model_data_mapper(model, tuple((field_map or {}).items()), frozenset(value_map or ()), reverse)
 
-    if reverse and reverse.search(field):
-        try:
-            value = -1 * Decimal(value)
-        except TypeError:
-            pass
 
-    if isinstance(model_instance_or_dict, dict):
-        model_instance_or_dict[field] = value
-    else:
-        setattr(model_instance_or_dict, field, value)
+@lru_cache(maxsize=256)
+def _compile_model_data_mapper(model, field_map_items, value_map_fields, reverse):
+    return ModelDataMapper(model, dict(field_map_items), value_map_fields, reverse)
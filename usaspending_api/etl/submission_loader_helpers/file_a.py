@@ -5,8 +5,8 @@ from collections import defaultdict
 
 from usaspending_api.accounts.models import AppropriationAccountBalances
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
-from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
+from usaspending_api.etl.management.load_base import compile_model_data_mapper
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import get_bulk_save_manager
 from usaspending_api.etl.submission_loader_helpers.treasury_appropriation_account import (
     bulk_treasury_appropriation_account_tas_lookup,
     get_treasury_appropriation_account_tas_lookup,
@@ -23,14 +23,24 @@ def get_file_a(submission_attributes, db_cursor):
     return dictfetchall(db_cursor)
 
 
-def load_file_a(submission_attributes, appropriation_data, db_cursor):
-    """ Process and load file A broker data (aka TAS balances, aka appropriation account balances). """
+def load_file_a(submission_attributes, appropriation_data, db_cursor, copy_buffer_size=None):
+    """
+    Process and load file A broker data (aka TAS balances, aka appropriation account balances).
+    With a copy_buffer_size, rows are streamed into the table with COPY instead of saved with bulk_create.
+    """
     reverse = re.compile("gross_outlay_amount_by_tas_cpe")
     skipped_tas = defaultdict(int)  # tracks count of rows skipped due to "missing" TAS
     bulk_treasury_appropriation_account_tas_lookup(appropriation_data, db_cursor)
 
     # Create account objects
-    save_manager = BulkCreateManager(AppropriationAccountBalances)
+    save_manager = get_bulk_save_manager(AppropriationAccountBalances, copy_buffer_size)
+    value_map = {
+        "treasury_account_identifier": None,  # set per row
+        "submission": submission_attributes,
+        "reporting_period_start": submission_attributes.reporting_period_start,
+        "reporting_period_end": submission_attributes.reporting_period_end,
+    }
+    mapper = compile_model_data_mapper(AppropriationAccountBalances, value_map=value_map, reverse=reverse)
     for row in appropriation_data:
 
         # Check and see if there is an entry for this TAS
@@ -43,24 +53,11 @@ def load_file_a(submission_attributes, appropriation_data, db_cursor):
         # TODO: Figure out how we want to determine what row is overridden by what row
         # If we want to correlate, the following attributes are available in the data broker data that might be useful:
         # appropriation_id, row_number appropriation_balances = something something get appropriation balances...
-        appropriation_balances = AppropriationAccountBalances()
-
-        value_map = {
-            "treasury_account_identifier": treasury_account,
-            "submission": submission_attributes,
-            "reporting_period_start": submission_attributes.reporting_period_start,
-            "reporting_period_end": submission_attributes.reporting_period_end,
-        }
-
-        field_map = {}
-
-        save_manager.append(
-            load_data_into_model(
-                appropriation_balances, row, field_map=field_map, value_map=value_map, save=False, reverse=reverse
-            )
-        )
+        value_map["treasury_account_identifier"] = treasury_account
+        save_manager.append_values(mapper.to_dict(row, value_map))
 
     save_manager.save_stragglers()
+    save_manager.log_throughput("File A")
 
     for tas, count in skipped_tas.items():
         logger.info(f"Skipped {count:,} rows due to {tas}")
@@ -5,8 +5,8 @@ from collections import defaultdict
 
 from usaspending_api.accounts.models import AppropriationAccountBalances
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
-from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
+from usaspending_api.etl.management.load_base import compile_model_data_mapper
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import get_bulk_save_manager
 from usaspending_api.etl.submission_loader_helpers.disaster_emergency_fund_codes import get_disaster_emergency_fund
 from usaspending_api.etl.submission_loader_helpers.object_class import get_object_class
 from usaspending_api.etl.submission_loader_helpers.program_activities import get_program_activity
@@ -153,13 +153,30 @@ def get_file_b(submission_attributes, db_cursor):
     return data
 
 
-def load_file_b(submission_attributes, prg_act_obj_cls_data, db_cursor):
-    """ Process and load file B broker data (aka TAS balances by program activity and object class). """
+def load_file_b(submission_attributes, prg_act_obj_cls_data, db_cursor, copy_buffer_size=None):
+    """
+    Process and load file B broker data (aka TAS balances by program activity and object class).
+    With a copy_buffer_size, rows are streamed into the table with COPY instead of saved with bulk_create.
+    """
     reverse = re.compile(r"(_(cpe|fyb)$)|^transaction_obligated_amount$")
     skipped_tas = defaultdict(int)  # tracks count of rows skipped due to "missing" TAS
     bulk_treasury_appropriation_account_tas_lookup(prg_act_obj_cls_data, db_cursor)
 
-    save_manager = BulkCreateManager(FinancialAccountsByProgramActivityObjectClass)
+    save_manager = get_bulk_save_manager(FinancialAccountsByProgramActivityObjectClass, copy_buffer_size)
+    value_map = {
+        "submission": submission_attributes,
+        "reporting_period_start": submission_attributes.reporting_period_start,
+        "reporting_period_end": submission_attributes.reporting_period_end,
+        # set per row
+        "treasury_account": None,
+        "appropriation_account_balances": None,
+        "object_class": None,
+        "program_activity": None,
+        "disaster_emergency_fund": None,
+    }
+    mapper = compile_model_data_mapper(
+        FinancialAccountsByProgramActivityObjectClass, value_map=value_map, reverse=reverse
+    )
     for row in prg_act_obj_cls_data:
         # Check and see if there is an entry for this TAS
         treasury_account, tas_rendering_label = get_treasury_appropriation_account_tas_lookup(row.get("tas_id"))
@@ -172,24 +189,19 @@ def load_file_b(submission_attributes, prg_act_obj_cls_data, db_cursor):
             treasury_account_identifier=treasury_account, submission_id=submission_attributes.submission_id
         )
 
-        financial_by_prg_act_obj_cls = FinancialAccountsByProgramActivityObjectClass()
-
-        value_map = {
-            "submission": submission_attributes,
-            "reporting_period_start": submission_attributes.reporting_period_start,
-            "reporting_period_end": submission_attributes.reporting_period_end,
-            "treasury_account": treasury_account,
-            "appropriation_account_balances": account_balances,
-            "object_class": get_object_class(row["object_class"], row["by_direct_reimbursable_fun"]),
-            "program_activity": get_program_activity(row, submission_attributes),
-            "disaster_emergency_fund": get_disaster_emergency_fund(row),
-        }
-
-        save_manager.append(
-            load_data_into_model(financial_by_prg_act_obj_cls, row, value_map=value_map, save=False, reverse=reverse)
+        value_map.update(
+            {
+                "treasury_account": treasury_account,
+                "appropriation_account_balances": account_balances,
+                "object_class": get_object_class(row["object_class"], row["by_direct_reimbursable_fun"]),
+                "program_activity": get_program_activity(row, submission_attributes),
+                "disaster_emergency_fund": get_disaster_emergency_fund(row),
+            }
         )
+        save_manager.append_values(mapper.to_dict(row, value_map))
 
     save_manager.save_stragglers()
+    save_manager.log_throughput("File B")
 
     for tas, count in skipped_tas.items():
         logger.info(f"Skipped {count:,} rows due to {tas}")
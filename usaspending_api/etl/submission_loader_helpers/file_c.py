@@ -12,8 +12,8 @@ from usaspending_api.awards.models import FinancialAccountsByAwards
 from usaspending_api.common.helpers.dict_helpers import upper_case_dict_values
 from usaspending_api.common.helpers.etl_helpers import update_c_to_d_linkages
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
-from usaspending_api.etl.management.load_base import load_data_into_model
-from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import BulkCreateManager
+from usaspending_api.etl.management.load_base import compile_model_data_mapper
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import get_bulk_save_manager
 from usaspending_api.etl.submission_loader_helpers.disaster_emergency_fund_codes import get_disaster_emergency_fund
 from usaspending_api.etl.submission_loader_helpers.object_class import get_object_class_row
 from usaspending_api.etl.submission_loader_helpers.program_activities import get_program_activity
@@ -114,11 +114,12 @@ def get_file_c(submission_attributes, db_cursor, chunk_size):
     return CertifiedAwardFinancial(submission_attributes, db_cursor, chunk_size)
 
 
-def load_file_c(submission_attributes, db_cursor, certified_award_financial):
+def load_file_c(submission_attributes, db_cursor, certified_award_financial, copy_buffer_size=None):
     """
     Process and load file C broker data.
     Note: this should run AFTER the D1 and D2 files are loaded because we try to join to those records to retrieve some
     additional information about the awarding sub-tier agency.
+    With a copy_buffer_size, rows are streamed into the table with COPY instead of saved with bulk_create.
     """
 
     if certified_award_financial.count == 0:
@@ -134,7 +135,9 @@ def load_file_c(submission_attributes, db_cursor, certified_award_financial):
 
     bulk_treasury_appropriation_account_tas_lookup(certified_award_financial.tas_ids, db_cursor)
 
-    _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse)
+    _save_file_c_rows(
+        certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse, copy_buffer_size
+    )
 
     update_c_to_d_linkages("contract", False, submission_attributes.submission_id)
     update_c_to_d_linkages("assistance", False, submission_attributes.submission_id)
@@ -150,8 +153,22 @@ def load_file_c(submission_attributes, db_cursor, certified_award_financial):
         logger.info("All File C records in Broker loaded into USAspending")
 
 
-def _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse):
-    save_manager = BulkCreateManager(FinancialAccountsByAwards)
+def _save_file_c_rows(
+    certified_award_financial, total_rows, start_time, skipped_tas, submission_attributes, reverse, copy_buffer_size
+):
+    save_manager = get_bulk_save_manager(FinancialAccountsByAwards, copy_buffer_size)
+    value_map_faba = {
+        "submission": submission_attributes,
+        "reporting_period_start": submission_attributes.reporting_period_start,
+        "reporting_period_end": submission_attributes.reporting_period_end,
+        # set per row
+        "treasury_account": None,
+        "object_class": None,
+        "program_activity": None,
+        "disaster_emergency_fund": None,
+        "distinct_award_key": None,
+    }
+    mapper = compile_model_data_mapper(FinancialAccountsByAwards, value_map=value_map_faba, reverse=reverse)
     for index, row in enumerate(certified_award_financial, 1):
         if not (index % 1000):
             logger.info(f"C File Load: Loading row {index:,} of {total_rows:,} ({datetime.now() - start_time})")
@@ -164,24 +181,19 @@ def _save_file_c_rows(certified_award_financial, total_rows, start_time, skipped
             skipped_tas[tas_rendering_label] += 1
             continue
 
-        award_financial_data = FinancialAccountsByAwards()
-
-        value_map_faba = {
-            "submission": submission_attributes,
-            "reporting_period_start": submission_attributes.reporting_period_start,
-            "reporting_period_end": submission_attributes.reporting_period_end,
-            "treasury_account": treasury_account,
-            "object_class": row.get("object_class"),
-            "program_activity": row.get("program_activity"),
-            "disaster_emergency_fund": get_disaster_emergency_fund(row),
-            "distinct_award_key": create_distinct_award_key(row),
-        }
-
-        save_manager.append(
-            load_data_into_model(award_financial_data, row, value_map=value_map_faba, save=False, reverse=reverse)
+        value_map_faba.update(
+            {
+                "treasury_account": treasury_account,
+                "object_class": row.get("object_class"),
+                "program_activity": row.get("program_activity"),
+                "disaster_emergency_fund": get_disaster_emergency_fund(row),
+                "distinct_award_key": create_distinct_award_key(row),
+            }
         )
+        save_manager.append_values(mapper.to_dict(row, value_map_faba))
 
     save_manager.save_stragglers()
+    save_manager.log_throughput("File C")
 
 
 def create_distinct_award_key(row):
@@ -1,8 +1,12 @@
 from usaspending_api.common.containers import Bunch
+from usaspending_api.etl.transaction_loaders.cached_reference_data import ReferenceDataCache
 from usaspending_api.references.models import ObjectClass
 
 
-OBJECT_CLASSES = None
+OBJECT_CLASSES = ReferenceDataCache(
+    "object classes",
+    lambda: {(oc.object_class, oc.direct_reimbursable): oc for oc in ObjectClass.objects.all()},
+)
 
 
 def reset_object_class_cache():
@@ -11,8 +15,7 @@ def reset_object_class_cache():
     for tests.  So, to keep the performance of caching object classes globally but still
     allow tests to function properly, we need a way to reset the object class cache.
     """
-    global OBJECT_CLASSES
-    OBJECT_CLASSES = None
+    OBJECT_CLASSES.reset()
 
 
 def get_object_class_row(row):
@@ -25,10 +28,6 @@ def get_object_class_row(row):
          row.by_direct_reimbursable_fun: direct/reimbursable flag from the broker
              (used only when the object_class is 3 digits instead of 4)
     """
-    global OBJECT_CLASSES
-    if OBJECT_CLASSES is None:
-        OBJECT_CLASSES = {(oc.object_class, oc.direct_reimbursable): oc for oc in ObjectClass.objects.all()}
-
     # Object classes are numeric strings so let's ensure the one we're passed is actually a string before we begin.
     object_class = str(row.object_class).zfill(3) if type(row.object_class) is int else row.object_class
 
@@ -60,7 +59,7 @@ def get_object_class_row(row):
 
     # This will throw an exception if the object class does not exist which is the new desired behavior.
     try:
-        return OBJECT_CLASSES[(object_class, direct_reimbursable)]
+        return OBJECT_CLASSES.get()[(object_class, direct_reimbursable)]
     except KeyError:
         raise ObjectClass.DoesNotExist(
             f"Unable to find object class for object_class={object_class}, direct_reimbursable={direct_reimbursable}."
@@ -1,9 +1,24 @@
 from django.conf import settings
 from django.db import connection
+from usaspending_api.etl.transaction_loaders.cached_reference_data import ReferenceDataCache
 from usaspending_api.references.models import RefProgramActivity
 
 
-PROGRAM_ACTIVITIES = {}
+def _fetch_program_activities():
+    return {
+        (
+            pa.program_activity_code,
+            pa.program_activity_name,
+            pa.budget_year,
+            pa.responsible_agency_id,
+            pa.allocation_transfer_agency_id,
+            pa.main_account_code,
+        ): pa
+        for pa in RefProgramActivity.objects.all()
+    }
+
+
+PROGRAM_ACTIVITIES = ReferenceDataCache("program activities", _fetch_program_activities)
 
 
 def update_program_activities(submission_id):
@@ -13,8 +28,6 @@ def update_program_activities(submission_id):
     the program activities we need for this load.  Because other processes may also be running, we
     have to do this per submission just in case a new program activity is snuck in by another.
     """
-    global PROGRAM_ACTIVITIES
-
     sql = f"""
         insert into ref_program_activity (
                 program_activity_code,
@@ -86,17 +99,7 @@ def update_program_activities(submission_id):
         cursor.execute(sql)
         rowcount = cursor.rowcount
 
-    PROGRAM_ACTIVITIES = {
-        (
-            pa.program_activity_code,
-            pa.program_activity_name,
-            pa.budget_year,
-            pa.responsible_agency_id,
-            pa.allocation_transfer_agency_id,
-            pa.main_account_code,
-        ): pa
-        for pa in RefProgramActivity.objects.all()
-    }
+    PROGRAM_ACTIVITIES.refresh()
 
     return rowcount
 
@@ -112,4 +115,4 @@ def get_program_activity(row, submission_attributes):
         row["allocation_transfer_agency"],
         row["main_account_code"],
     )
-    return PROGRAM_ACTIVITIES[key]
+    return PROGRAM_ACTIVITIES.get()[key]
@@ -1,16 +1,18 @@
 from usaspending_api.accounts.models import TreasuryAppropriationAccount
 from usaspending_api.etl.broker_etl_helpers import dictfetchall
+from usaspending_api.etl.transaction_loaders.cached_reference_data import ReferenceDataCache
 
 
-# This dictionary will hold a map of tas_id -> treasury_account to ensure we don't keep hitting the
-# Broker DB for account data.
-TAS_ID_TO_ACCOUNT = {}
+# This will hold a map of tas_id -> (treasury_account, tas_rendering_label) to ensure we don't keep hitting the
+# Broker DB for account data.  It's filled by bulk lookups rather than loaded whole.
+TAS_ID_TO_ACCOUNT = ReferenceDataCache("treasury appropriation accounts by tas_id", dict)
 
 
 def bulk_treasury_appropriation_account_tas_lookup(rows, db_cursor):
 
     # Eliminate nulls, TAS we already know about, and remove duplicates.
-    tas_lookup_ids = tuple(set(r["tas_id"] for r in rows if (r["tas_id"] and r["tas_id"] not in TAS_ID_TO_ACCOUNT)))
+    known_tas = TAS_ID_TO_ACCOUNT.get()
+    tas_lookup_ids = tuple(set(r["tas_id"] for r in rows if (r["tas_id"] and r["tas_id"] not in known_tas)))
 
     if not tas_lookup_ids:
         return
@@ -58,7 +60,7 @@ def bulk_treasury_appropriation_account_tas_lookup(rows, db_cursor):
 
 
 def get_treasury_appropriation_account_tas_lookup(tas_lookup_id):
-    tas = TAS_ID_TO_ACCOUNT.get(tas_lookup_id)
+    tas = TAS_ID_TO_ACCOUNT.get().get(tas_lookup_id)
     if not tas or not tas[1]:
         return None, f"TAS Account Number (tas_lookup.account_num) '{tas_lookup_id}' not found in Broker"
     return tas
@@ -3,7 +3,13 @@ import pytest
 
 from model_mommy import mommy
 
-from usaspending_api.etl.award_helpers import update_awards, update_procurement_awards, update_assistance_awards
+from usaspending_api.awards.models import Award, IDVHierarchy
+from usaspending_api.etl.award_helpers import (
+    update_assistance_awards,
+    update_awards,
+    update_idv_hierarchy,
+    update_procurement_awards,
+)
 
 
 @pytest.mark.django_db
@@ -469,3 +475,47 @@ def test_award_update_transaction_fk():
         award.period_of_performance_current_end_date.strftime("%Y-%m-%d")
         == txn10.period_of_performance_current_end_date
     )
+
+
+def _make_idv_hierarchy_award(award_id, award_type, parent_id=None):
+    return mommy.make(
+        "awards.Award",
+        id=award_id,
+        type=award_type,
+        piid=f"piid_{award_id}",
+        fpds_agency_id="agency",
+        parent_award_piid=f"piid_{parent_id}" if parent_id else None,
+        fpds_parent_agency_id="agency" if parent_id else None,
+    )
+
+
+def _idv_hierarchy():
+    return set(IDVHierarchy.objects.values_list("ancestor_award_id", "descendant_award_id", "depth"))
+
+
+@pytest.mark.django_db
+def test_idv_hierarchy_rebuild_and_incremental_update():
+    _make_idv_hierarchy_award(1, "IDV_A")
+    _make_idv_hierarchy_award(2, "IDV_B", parent_id=1)
+    _make_idv_hierarchy_award(3, "A", parent_id=2)
+    _make_idv_hierarchy_award(4, "B", parent_id=1)
+    _make_idv_hierarchy_award(5, "C", parent_id=4)  # contracts aren't parents
+    _make_idv_hierarchy_award(6, "IDV_C")
+
+    assert update_idv_hierarchy() == 4
+    assert _idv_hierarchy() == {(1, 2, 1), (2, 3, 1), (1, 3, 2), (1, 4, 1)}
+
+    # Moving the child IDV moves its children with it
+    Award.objects.filter(id=2).update(parent_award_piid="piid_6", fpds_parent_agency_id="agency")
+    update_idv_hierarchy((2,))
+    assert _idv_hierarchy() == {(6, 2, 1), (2, 3, 1), (6, 3, 2), (1, 4, 1)}
+
+    # Deleting an IDV detaches its descendants from the rest of the hierarchy
+    Award.objects.filter(id=2).delete()
+    update_idv_hierarchy((2,))
+    assert _idv_hierarchy() == {(1, 4, 1)}
+
+    # A new IDV adopts awards already referring to it
+    _make_idv_hierarchy_award(2, "IDV_B", parent_id=1)
+    update_idv_hierarchy((2,))
+    assert _idv_hierarchy() == {(1, 2, 1), (2, 3, 1), (1, 3, 2), (1, 4, 1)}
@@ -0,0 +1,54 @@
+import pytest
+
+from usaspending_api.etl.elasticsearch_loader_helpers import CheckpointLedger, Controller
+
+
+def test_ledger_round_trip(tmp_path):
+    config = {"checkpoint_dir": str(tmp_path), "index_name": "test-awards", "load_type": "award"}
+    ledger = CheckpointLedger.for_config(config)
+    ledger.reset()
+    ledger.record("1-100", 0, 98)
+    ledger.record("null", 2, 3)
+
+    resumed = CheckpointLedger.for_config(config)
+    resumed.load()
+    assert resumed.is_complete("1-100")
+    assert resumed.is_complete("null")
+    assert not resumed.is_complete("101-200")
+    assert resumed.partitions["1-100"]["doc_count"] == 98
+
+    resumed.delete()
+    assert not ledger.path.exists()
+
+
+def test_ledger_rejects_other_index(tmp_path):
+    ledger = CheckpointLedger(tmp_path / "ledger.json", "test-awards", "award")
+    ledger.reset()
+    with pytest.raises(RuntimeError):
+        CheckpointLedger(tmp_path / "ledger.json", "other-awards", "award").load()
+
+
+def test_only_fully_loaded_partitions_are_checkpointed(tmp_path):
+    ctrl = Controller({"partition_size": 10})
+    ctrl.ledger = CheckpointLedger(tmp_path / "ledger.json", "test-awards", "award")
+    ctrl.checkpoint_partition(("1-10", 0, 10, 0))
+    ctrl.checkpoint_partition(("11-20", 1, 9, 1))
+    ctrl.checkpoint_partition(None)  # partition that errored or was skipped
+    assert list(ctrl.ledger.partitions) == ["1-10"]
+
+
+def test_resumed_runs_reuse_the_partitions_of_the_ledger(tmp_path):
+    ledger = CheckpointLedger(tmp_path / "ledger.json", "test-awards", "award")
+    ledger.reset([(5, 40), (41, 90)])  # e.g. density partitions, which sampling again wouldn't reproduce
+    ledger.record("5-40", 0, 30)
+
+    resumed = CheckpointLedger(tmp_path / "ledger.json", "test-awards", "award")
+    resumed.load()
+    assert resumed.partition_bounds == [(5, 40), (41, 90)]
+
+    ctrl = Controller({"partition_size": 10})
+    ctrl.min_id, ctrl.max_id = 5, 90
+    assert ctrl.determine_resumed_partitions(resumed.partition_bounds) == [(5, 40), (41, 90)]
+    # ids found since the run being resumed get partitions of their own
+    ctrl.min_id, ctrl.max_id = 1, 120
+    assert ctrl.determine_resumed_partitions(resumed.partition_bounds) == [(1, 4), (5, 40), (41, 90), (91, 120)]
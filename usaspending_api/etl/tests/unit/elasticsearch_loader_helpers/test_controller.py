@@ -200,6 +200,44 @@ def test_get_id_range_for_partition_with_empty_partitions():
     assert _remove_seen_ids(ctrl, record_ids) == set({})
 
 
+def test_determine_density_partitions_equalizes_record_counts():
+    """Dense and sparse stretches of the id-range should yield partitions of (roughly) equal record counts"""
+    record_ids = set(range(1, 31)) | {500, 1000, 5000, 9000, 10000}
+    sorted_ids = sorted(record_ids)
+    etl_config = {"partition_size": 7}
+    ctrl = Controller(etl_config)
+    ctrl.min_id = min(record_ids)
+    ctrl.max_id = max(record_ids)
+    ctrl.record_count = len(record_ids)
+    partitions = ctrl.determine_partitions_by_record_count()
+    assert partitions == 5
+    # Mimic percentile_disc() over the ids at each of the inner partition fractions
+    upper_bounds = [sorted_ids[ceil(len(sorted_ids) * i / partitions) - 1] for i in range(1, partitions)]
+    ctrl.partition_bounds = ctrl.determine_density_partitions(upper_bounds)
+    ctrl.config["partitions"] = len(ctrl.partition_bounds)
+
+    assert ctrl.partition_bounds == [(1, 7), (8, 14), (15, 21), (22, 28), (29, 10000)]
+    for partition_idx in range(ctrl.config["partitions"]):
+        lower_bound, upper_bound = ctrl.get_id_range_for_partition(partition_idx)
+        assert len([i for i in record_ids if lower_bound <= i <= upper_bound]) == 7
+    assert _remove_seen_ids(ctrl, record_ids) == set({})
+
+
+def test_determine_density_partitions_with_duplicate_bounds():
+    """Repeated or out-of-range sampled bounds must not produce empty, overlapping or missing id-ranges"""
+    etl_config = {"partition_size": 2}
+    ctrl = Controller(etl_config)
+    ctrl.min_id = 5
+    ctrl.max_id = 20
+    ctrl.partition_bounds = ctrl.determine_density_partitions([5, 5, 9, 9, 20])
+    ctrl.config["partitions"] = len(ctrl.partition_bounds)
+    assert ctrl.partition_bounds == [(5, 5), (6, 9), (10, 20)]
+    assert _remove_seen_ids(ctrl, set(range(5, 21))) == set({})
+
+    ctrl.partition_bounds = ctrl.determine_density_partitions([])
+    assert ctrl.partition_bounds == [(5, 20)]
+
+
 def _remove_seen_ids(ctrl, id_set):
     """Iterates through each bounded id-range, and removes IDs seen"""
     partition_range = range(0, ctrl.config["partitions"])
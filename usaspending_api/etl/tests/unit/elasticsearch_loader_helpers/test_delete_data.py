@@ -0,0 +1,30 @@
+from usaspending_api.etl.elasticsearch_loader_helpers import lookup_ids_with_changed_routing
+
+
+class _FakeSearchClient:
+    def __init__(self, indexed_routing):
+        self.indexed_routing = indexed_routing  # list of (_id, _routing) pairs of docs in the index
+
+    def search(self, index, body, **kwargs):
+        ids = set(body["query"]["bool"]["filter"][0]["ids"]["values"])
+        hits = [{"_id": i, "_routing": r} for i, r in self.indexed_routing if i in ids]
+        total = len(hits)
+        return {"hits": {"total": {"value": total}, "hits": hits[: body["size"]]}}
+
+
+def test_lookup_ids_with_changed_routing():
+    client = _FakeSearchClient([("1", "a"), ("2", "b"), ("3", "old"), ("4", "x"), ("4", "d")])
+    docs = [
+        {"_id": 1, "routing": "a"},  # same routing, overwritten in place
+        {"_id": 2, "routing": "changed"},  # would be left behind on its old shard
+        {"_id": 5, "routing": "e"},  # new doc
+        {"_id": 4, "routing": "d"},  # duplicated across shards, one of which is stale
+    ]
+    assert sorted(lookup_ids_with_changed_routing(client, docs, "test worker", "test-index")) == [2, 4]
+
+
+def test_lookup_ids_with_changed_routing_deletes_whole_chunk_when_hits_are_cut_short():
+    client = _FakeSearchClient([("1", "a")] * 5 + [("2", "b")])
+    docs = [{"_id": 1, "routing": "a"}, {"_id": 2, "routing": "b"}, {"_id": 3, "routing": "c"}]
+    ids = lookup_ids_with_changed_routing(client, docs, "test worker", "test-index", lookup_chunk_size=2)
+    assert sorted(ids) == [1, 2]
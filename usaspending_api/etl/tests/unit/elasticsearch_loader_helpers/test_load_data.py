@@ -0,0 +1,140 @@
+import json
+import pytest
+
+from importlib import import_module
+from threading import Lock
+
+from usaspending_api.etl.elasticsearch_loader_helpers import TaskSpec, load_data_in_batches
+
+# The package re-exports a load_data() function that shadows the load_data module of the same name
+load_data_module = import_module("usaspending_api.etl.elasticsearch_loader_helpers.load_data")
+
+
+def _task(is_incremental):
+    return TaskSpec(
+        base_table=None,
+        base_table_id=None,
+        field_for_es_id="award_id",
+        index="test-index",
+        is_incremental=is_incremental,
+        name="test worker",
+        partition_number=0,
+        primary_key="award_id",
+        sql=None,
+        view=None,
+        stream_batch_size=2,
+    )
+
+
+def test_load_data_in_batches_deletes_each_batch_before_indexing_it(monkeypatch):
+    events = []
+
+    def mock_delete(client, key, value_list, task_id, index, refresh_after=True):
+        events.append(("delete", value_list))
+
+    def mock_post(client, chunk, index_name, job_name=None, delete_before_index=True):
+        assert not delete_before_index
+        for doc in chunk:
+            events.append(("index", doc["_id"]))
+        return len(events), 0
+
+    monkeypatch.setattr(load_data_module, "delete_docs_by_unique_key", mock_delete)
+    monkeypatch.setattr(load_data_module, "streaming_post_to_es", mock_post)
+
+    batches = iter([[{"_id": 1}, {"_id": 2}], [{"_id": 3}]])
+    load_data_in_batches(_task(is_incremental=True), batches, None)
+
+    assert events == [
+        ("delete", [1, 2]),
+        ("index", 1),
+        ("index", 2),
+        ("delete", [3]),
+        ("index", 3),
+    ]
+
+
+def test_load_data_in_batches_consumes_batches_lazily(monkeypatch):
+    consumed = []
+
+    def batches():
+        for i in range(3):
+            consumed.append(i)
+            yield [{"_id": i}]
+
+    def mock_post(client, chunk, index_name, job_name=None, delete_before_index=True):
+        first = next(chunk)
+        assert consumed == [0]  # nothing read ahead of the doc being indexed
+        return 1 + sum(1 for _ in chunk), first["_id"]
+
+    monkeypatch.setattr(load_data_module, "streaming_post_to_es", mock_post)
+
+    assert load_data_in_batches(_task(is_incremental=False), batches(), None) == (3, 0)
+    assert consumed == [0, 1, 2]
+
+
+class _FakeSerializer:
+    def dumps(self, data):
+        return json.dumps(data, separators=(",", ":"))
+
+
+class _FakeTransport:
+    serializer = _FakeSerializer()
+
+
+class _FakeBulkClient:
+    """Accepts bulk bodies, rejecting each doc whose _id is in ``busy_ids`` the first time it is sent"""
+
+    transport = _FakeTransport()
+
+    def __init__(self, busy_ids=(), failing_ids=()):
+        self.busy_ids = set(busy_ids)
+        self.failing_ids = set(failing_ids)
+        self.indexed = []
+        self.lock = Lock()
+
+    def bulk(self, body, index):
+        lines = body.decode("utf-8").splitlines()
+        items = []
+        for action, source in zip(lines[::2], lines[1::2]):
+            doc_id = json.loads(action)["index"]["_id"]
+            if doc_id in self.busy_ids:
+                self.busy_ids.remove(doc_id)
+                items.append({"index": {"_id": doc_id, "status": 429}})
+            elif doc_id in self.failing_ids:
+                items.append({"index": {"_id": doc_id, "status": 400, "error": "mapper_parsing_exception"}})
+            else:
+                with self.lock:
+                    self.indexed.append((json.loads(action)["index"], json.loads(source)))
+                items.append({"index": {"_id": doc_id, "status": 201}})
+        return {"items": items}
+
+
+def test_serialized_bulk_bodies_respect_entry_and_byte_limits(monkeypatch):
+    monkeypatch.setattr(load_data_module, "ES_BATCH_ENTRIES", 3)
+    docs = [{"_id": i, "routing": "r", "name": "x" * 10} for i in range(7)]
+    bodies = list(load_data_module._serialized_bulk_bodies(_FakeBulkClient(), docs))
+    assert [len(body) for body in bodies] == [3, 3, 1]
+    assert bodies[0][0] == b'{"index":{"_id":0,"routing":"r"}}\n{"name":"xxxxxxxxxx"}\n'
+
+    monkeypatch.setattr(load_data_module, "ES_MAX_BATCH_BYTES", 2 * len(bodies[0][0]))
+    bodies = list(load_data_module._serialized_bulk_bodies(_FakeBulkClient(), docs))
+    assert [len(body) for body in bodies] == [2, 2, 2, 1]
+
+
+def test_parallel_post_to_es_retries_busy_rejections(monkeypatch):
+    monkeypatch.setattr(load_data_module, "ES_BATCH_ENTRIES", 10)
+    monkeypatch.setattr(load_data_module, "ES_BULK_INITIAL_BACKOFF", 0)
+    client = _FakeBulkClient(busy_ids={3, 42})
+    docs = ({"_id": i, "routing": i % 7, "value": i} for i in range(95))
+    success, failed = load_data_module.parallel_post_to_es(
+        client, docs, "test-index", "test worker", delete_before_index=False, senders=3
+    )
+    assert (success, failed) == (95, 0)
+    assert sorted(source["value"] for _, source in client.indexed) == list(range(95))
+    assert all(meta["routing"] == source["value"] % 7 for meta, source in client.indexed)
+
+
+def test_parallel_post_to_es_raises_on_failed_docs():
+    client = _FakeBulkClient(failing_ids={1})
+    with pytest.raises(RuntimeError):
+        load_data_module.parallel_post_to_es(client, [{"_id": 0}, {"_id": 1}], "test-index", delete_before_index=False)
@@ -0,0 +1,61 @@
+import json
+
+from copy import deepcopy
+
+from usaspending_api.etl.elasticsearch_loader_helpers import TaskSpec, transform_transaction_data
+from usaspending_api.etl.elasticsearch_loader_helpers.aggregate_key_functions import AGG_KEY_SOURCE_COLUMNS
+
+WORKER = TaskSpec(
+    name="test worker",
+    index=None,
+    sql=None,
+    view=None,
+    base_table=None,
+    base_table_id=None,
+    field_for_es_id="transaction_id",
+    primary_key="transaction_id",
+    partition_number=0,
+    is_incremental=False,
+)
+
+
+def _transaction_records():
+    columns = {col for cols in AGG_KEY_SOURCE_COLUMNS.values() for col in cols}
+    # The transaction ETL view has no abbreviation column for toptier agencies
+    columns -= {"awarding_toptier_agency_abbreviation", "funding_toptier_agency_abbreviation"}
+    records = []
+    for i, (value, levels) in enumerate([(1, ["C"]), (2, ["P", "R"]), (1, ["C"]), (None, None), (2, ["P", "R"])]):
+        record = {col: f"{col}-{value}" if value else None for col in columns}
+        record.update(
+            {
+                "transaction_id": i,
+                "federal_accounts": None,
+                "funding_toptier_agency_id": value,
+                "awarding_toptier_agency_id": value,
+                "recipient_hash": f"hash-{value}" if value else None,
+                "recipient_levels": levels,
+                "pop_state_population": value,
+                "recipient_location_county_population": float(value) if value else None,
+            }
+        )
+        records.append(record)
+    return records
+
+
+def test_batch_agg_keys_produce_identical_documents():
+    records = _transaction_records()
+    row_docs = transform_transaction_data(WORKER, deepcopy(records))
+    batch_docs = transform_transaction_data(WORKER, deepcopy(records), batch_agg_keys=True)
+
+    assert [json.dumps(d) for d in batch_docs] == [json.dumps(d) for d in row_docs]
+    assert batch_docs[0]["recipient_agg_key"] == batch_docs[2]["recipient_agg_key"]
+    assert batch_docs[3]["pop_state_agg_key"] is None
+    assert json.loads(batch_docs[1]["awarding_toptier_agency_agg_key"]) == {
+        "name": "awarding_toptier_agency_name-2",
+        "code": "awarding_toptier_agency_code-2",
+        "id": 2,
+    }
+
+
+def test_batch_agg_keys_with_no_records():
+    assert transform_transaction_data(WORKER, [], batch_agg_keys=True) == []
@@ -1,4 +1,8 @@
-from usaspending_api.etl.elasticsearch_loader_helpers.utilities import is_snapshot_running
+import psycopg2
+
+from decimal import Decimal
+
+from usaspending_api.etl.elasticsearch_loader_helpers.utilities import decode_copy_text, is_snapshot_running
 
 
 def test_is_snapshot_running(monkeypatch):
@@ -34,3 +38,26 @@ def test_is_snapshot_running(monkeypatch):
     index_names = ["2021-02-12-transactions", "2021-02-12-awards"]
     result = is_snapshot_running(mock_client, index_names)
     assert result
+
+
+def test_decode_copy_text():
+    columns = ["id", "name", "levels", "accounts", "amount"]
+    typecasters = [psycopg2.extensions.string_types[oid] for oid in (23, 25, 1009, 3802, 1700)]
+    copy_text = (
+        '1\tTab\\there\\\\slash\t{C,R}\t[{"id": 1}]\t10.50\n'
+        "2\t\\N\t\\N\t\\N\t\\N\n"
+        '3\tLine\\nbreak\t{"a\\\\\\\\b"}\t[]\t-1\n'
+    )
+    rows = decode_copy_text(copy_text, columns, typecasters, None)
+    assert rows == [
+        {
+            "id": 1,
+            "name": "Tab\there\\slash",
+            "levels": ["C", "R"],
+            "accounts": [{"id": 1}],
+            "amount": Decimal("10.50"),
+        },
+        {"id": 2, "name": None, "levels": None, "accounts": None, "amount": None},
+        {"id": 3, "name": "Line\nbreak", "levels": ["a\\b"], "accounts": [], "amount": Decimal("-1")},
+    ]
+    assert decode_copy_text("", columns, typecasters, None) == []
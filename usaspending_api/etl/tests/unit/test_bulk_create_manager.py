@@ -0,0 +1,61 @@
+from datetime import date
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from usaspending_api.awards.models import FinancialAccountsByAwards
+from usaspending_api.etl.submission_loader_helpers import bulk_create_manager
+from usaspending_api.etl.submission_loader_helpers.bulk_create_manager import (
+    BulkCopyManager,
+    BulkCreateManager,
+    get_bulk_save_manager,
+)
+from usaspending_api.references.models import DisasterEmergencyFundCode
+from usaspending_api.submissions.models import SubmissionAttributes
+
+
+def test_rows_are_copied_in_buffers(monkeypatch):
+    copied = []
+    cursor = MagicMock()
+    cursor.copy_expert.side_effect = lambda sql, buffer: copied.append((sql, buffer.read()))
+    connection = MagicMock()
+    connection.cursor.return_value.__enter__.return_value = cursor
+    monkeypatch.setattr(bulk_create_manager, "connection", connection)
+
+    manager = get_bulk_save_manager(FinancialAccountsByAwards, copy_buffer_size=2)
+    assert isinstance(manager, BulkCopyManager)
+    rows = [
+        {
+            "submission": SubmissionAttributes(submission_id=5),
+            "disaster_emergency_fund": DisasterEmergencyFundCode(code="L"),
+            "distinct_award_key": f"PIID{i}|||",
+            "piid": f"PIID{i}\tTAB",
+            "transaction_obligated_amount": Decimal("-1.50"),
+            "reporting_period_start": date(2020, 4, 1),
+        }
+        for i in range(3)
+    ]
+    for row in rows:
+        manager.append_values(row)
+    assert len(copied) == 1
+    manager.save_stragglers()
+    assert len(copied) == 2
+
+    sql, data = copied[0]
+    columns = sql[sql.index("(") + 1 : sql.index(")")].split(", ")
+    assert sql.startswith("COPY financial_accounts_by_awards (")
+    assert '"financial_accounts_by_awards_id"' not in columns
+    first_row = dict(zip(columns, data.splitlines()[0].split("\t")))
+    assert first_row['"submission_id"'] == "5"
+    assert first_row['"disaster_emergency_fund_code"'] == "L"
+    assert first_row['"piid"'] == "PIID0\\tTAB"
+    assert first_row['"transaction_obligated_amount"'] == "-1.50"
+    assert first_row['"reporting_period_start"'] == "2020-04-01"
+    assert first_row['"award_id"'] == "\\N"
+    assert first_row['"create_date"'] != "\\N"
+    assert len(copied[1][1].splitlines()) == 1
+    assert manager.total_count == 3
+
+
+def test_bulk_create_is_the_default():
+    assert isinstance(get_bulk_save_manager(FinancialAccountsByAwards), BulkCreateManager)
+    assert not isinstance(get_bulk_save_manager(FinancialAccountsByAwards), BulkCopyManager)
@@ -0,0 +1,76 @@
+import re
+
+from datetime import date
+from decimal import Decimal
+
+from usaspending_api.etl.management.load_base import (
+    ModelDataMapper,
+    compile_model_data_mapper,
+    load_data_into_model,
+)
+from usaspending_api.financial_activities.models import FinancialAccountsByProgramActivityObjectClass
+
+REVERSE = re.compile(r"(_(cpe|fyb)$)|^transaction_obligated_amount$")
+
+
+def test_row_is_loaded_with_the_load_data_into_model_rules():
+    row = {
+        "ussgl480100_undelivered_or_cpe": "12.50",
+        "ussgl480100_undelivered_orders_obligations_unpaid_fyb": None,
+        "gross_outlay_amount_by_pro_cpe": "3",
+        "last_modified_date": "2020-01-31 10:20:30",
+        "certified": "2020-02-01",
+        "unmapped_column": "ignored",
+    }
+    value_map = {
+        "reporting_period_start": "2019-10-01",
+        "last_modified_date": lambda data: data["certified"],
+        "program_activity": None,
+    }
+    field_map = {"certified_date": "certified", "reporting_period_end": "missing_column"}
+
+    result = load_data_into_model(
+        FinancialAccountsByProgramActivityObjectClass(),
+        row,
+        field_map=field_map,
+        value_map=value_map,
+        reverse=REVERSE,
+        as_dict=True,
+    )
+
+    assert result == {
+        "data_source": "DBR",
+        "program_activity": None,
+        "ussgl480100_undelivered_orders_obligations_unpaid_fyb": None,
+        "ussgl480100_undelivered_orders_obligations_unpaid_cpe": Decimal("-12.50"),
+        "gross_outlay_amount_by_program_object_class_cpe": Decimal("-3"),
+        "reporting_period_start": "2019-10-01",  # only fields named *date are parsed
+        "last_modified_date": "2020-02-01",
+        "certified_date": date(2020, 2, 1),
+    }
+
+
+def test_model_is_loaded_with_a_cached_plan():
+    value_map = {"reporting_period_start": date(2019, 10, 1), "data_source": "USA"}
+    mapper = compile_model_data_mapper(
+        FinancialAccountsByProgramActivityObjectClass, value_map=value_map, reverse=REVERSE
+    )
+    assert mapper is compile_model_data_mapper(
+        FinancialAccountsByProgramActivityObjectClass, value_map=dict(value_map), reverse=REVERSE
+    )
+    assert mapper is not compile_model_data_mapper(FinancialAccountsByProgramActivityObjectClass, value_map=value_map)
+
+    instance = load_data_into_model(
+        FinancialAccountsByProgramActivityObjectClass(),
+        {"transaction_obligated_amount": 5, "data_source": "DBR"},
+        value_map=value_map,
+        reverse=REVERSE,
+    )
+    assert isinstance(instance, FinancialAccountsByProgramActivityObjectClass)
+    assert instance.reporting_period_start == date(2019, 10, 1)
+    assert instance.data_source == "USA"
+
+    compiled = ModelDataMapper(FinancialAccountsByProgramActivityObjectClass, reverse=REVERSE)
+    assert compiled.to_model({"deobligations_recoveries_refund_pri_program_object_class_cpe": 7}).__dict__[
+        "deobligations_recoveries_refund_pri_program_object_class_cpe"
+    ] == Decimal("-7")
@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock
+
+from usaspending_api.etl import award_helpers
+from usaspending_api.etl.award_helpers import recompute_awards
+
+
+def _mock_connection(monkeypatch, rowcount=1, fetchall=None):
+    cursor = MagicMock()
+    cursor.rowcount = rowcount
+    cursor.fetchall.return_value = fetchall
+    connection = MagicMock()
+    connection.in_atomic_block = True
+    connection.cursor.return_value.__enter__.return_value = cursor
+    monkeypatch.setattr(award_helpers, "connection", connection)
+    return cursor
+
+
+def test_award_ids_are_staged_and_recomputed_in_chunks(monkeypatch):
+    cursor = _mock_connection(monkeypatch)
+
+    counts = recompute_awards([5, 3, 1, 3, 9], ["prune", "awards"], chunk_size=2, connections=4)
+
+    assert counts == {"prune": 2, "awards": 2}
+    staged = cursor.copy_expert.call_args[0][1].getvalue()
+    assert staged == "1\n3\n5\n9\n"
+
+    statements = [call[0][0] for call in cursor.execute.call_args_list]
+    recompute_statements = [sql for sql in statements if "temp_award_recompute_ids WHERE" in sql]
+    assert len(recompute_statements) == 4  # 2 chunks of 2 steps, on the one connection of the transaction
+    assert "AND a.id IN (SELECT award_id FROM temp_award_recompute_ids WHERE award_id BETWEEN 1 AND 3)" in (
+        recompute_statements[0]
+    )
+    assert "WHERE tn.award_id IN (SELECT award_id FROM temp_award_recompute_ids WHERE award_id BETWEEN 5 AND 9)" in (
+        recompute_statements[3]
+    )
+    assert "%s" not in "".join(recompute_statements)
+    assert statements[-1] == "DROP TABLE temp_award_recompute_ids"
+
+
+def test_every_award_is_recomputed_in_id_ranges(monkeypatch):
+    cursor = _mock_connection(monkeypatch, rowcount=2, fetchall=[(1, 100), (101, 250)])
+
+    assert award_helpers.update_awards() == 4
+    statements = [call[0][0] for call in cursor.execute.call_args_list]
+    assert "ROW_NUMBER() OVER (ORDER BY id)" in statements[0]
+    assert "WHERE tn.award_id BETWEEN 101 AND 250" in statements[2]
+    cursor.copy_expert.assert_not_called()
+
+
+def test_nothing_to_recompute(monkeypatch):
+    cursor = _mock_connection(monkeypatch)
+    assert recompute_awards([], ["awards", "procurement"]) == {"awards": 0, "procurement": 0}
+    cursor.execute.assert_not_called()
+
+
+def test_chunks_are_recomputed_on_parallel_connections(monkeypatch):
+    _mock_connection(monkeypatch)
+    award_helpers.connection.in_atomic_block = False
+    monkeypatch.setattr(award_helpers, "get_database_dsn_string", lambda: "dsn")
+    db_connections = []
+
+    def connect(dsn):
+        db_connection = MagicMock()
+        db_connection.cursor.return_value.__enter__.return_value.rowcount = 1
+        db_connections.append(db_connection)
+        return db_connection
+
+    monkeypatch.setattr(award_helpers.psycopg2, "connect", connect)
+
+    assert recompute_awards(range(10), ["procurement"], chunk_size=3, connections=2) == {"procurement": 4}
+    assert 1 <= len(db_connections) <= 2
+    staged = sorted(
+        call[0][1].getvalue()
+        for db_connection in db_connections
+        for call in db_connection.cursor.return_value.__enter__.return_value.copy_expert.call_args_list
+    )
+    assert staged == ["0\n1\n2\n", "3\n4\n5\n", "6\n7\n8\n", "9\n"]
+    assert all(db_connection.close.called for db_connection in db_connections)
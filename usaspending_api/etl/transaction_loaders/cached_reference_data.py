@@ -1,12 +1,56 @@
 import psycopg2
+
+from types import MappingProxyType
+from typing import Callable, Mapping
+
 from usaspending_api.common.helpers.sql_helpers import get_database_dsn_string
 
 
-SUBTIER_AGENCY_LIST_CACHE = {}
+class ReferenceDataCache:
+    """
+    Read-only, in-process copy of a reference table (or of the lookups made against one) for loaders deriving values
+    row by row. Lookups are plain dictionary hits against a read-only mapping that is never copied: refresh() builds
+    a new mapping and swaps it in whole, stepping the version, so a mapping already handed out doesn't change under
+    its holder. Caches filled incrementally add entries with update() instead, which the mapping shows in place.
+    """
+
+    def __init__(self, name: str, load: Callable[[], dict]):
+        self.name = name
+        self._load = load
+        self._values = None
+        self._data = None
+        self.version = 0  # stepped every time the mapping is replaced or updated; 0 until loaded
+
+    def get(self) -> Mapping:
+        """Returns the mapping, loading it on first use. Does NOT refresh if called twice."""
+        data = self._data
+        if data is None:
+            data = self.refresh()
+        return data
+
+    def refresh(self) -> Mapping:
+        return self._replace(self._load())
+
+    def update(self, values: dict) -> Mapping:
+        """Adds these values to the mapping (loaded if need be) in place, without copying it"""
+        data = self.get()
+        self._values.update(values)
+        self.version += 1
+        return data
 
+    def reset(self):
+        """Drops the mapping so it's loaded again on next use (e.g. between tests)"""
+        self._values = None
+        self._data = None
 
-def _fetch_reference_data():
-    global SUBTIER_AGENCY_LIST_CACHE
+    def _replace(self, values: dict) -> Mapping:
+        self._values = values
+        self._data = MappingProxyType(values)
+        self.version += 1
+        return self._data
+
+
+def _fetch_subtier_agencies():
     with psycopg2.connect(dsn=get_database_dsn_string()) as connection:
         with connection.cursor(cursor_factory=psycopg2.extras.DictCursor) as cursor:
             sql = (
@@ -16,13 +60,13 @@ def _fetch_reference_data():
             )
 
             cursor.execute(sql)
-            SUBTIER_AGENCY_LIST_CACHE = {result["subtier_code"]: result for result in cursor.fetchall()}
+            return {result["subtier_code"]: MappingProxyType(dict(result.items())) for result in cursor.fetchall()}
 
 
-def subtier_agency_list():
-    """Returns all rows from subtier_agency table. Does NOT refresh if called twice,
-    and does NOT make a copy that you can modify"""
-    if not SUBTIER_AGENCY_LIST_CACHE:
-        _fetch_reference_data()
+SUBTIER_AGENCIES = ReferenceDataCache("subtier agencies", _fetch_subtier_agencies)
 
-    return SUBTIER_AGENCY_LIST_CACHE.copy()
+
+def subtier_agency_list():
+    """Returns all rows from subtier_agency table by subtier code, as read-only mappings. Does NOT refresh if called
+    twice, and does NOT make a copy (see ReferenceDataCache)"""
+    return SUBTIER_AGENCIES.get()
@@ -39,6 +39,16 @@ def format_value_for_sql(val, cur):
     return str(cur.mogrify("%s", (val,)), "utf-8")
 
 
+def format_value_for_copy(value):
+    """Format a value as a field of COPY's text format"""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (list, tuple)):
+        elements = (str(element).replace("\\", "\\\\").replace('"', '\\"') for element in value)
+        value = "{" + ",".join(f'"{element}"' for element in elements) + "}"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
 def format_bulk_insert_list_column_sql(cursor, load_objects, type):
     """creates formatted sql text to put into a bulk insert statement"""
     keys = load_objects[0][type].keys()
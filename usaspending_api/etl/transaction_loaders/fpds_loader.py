@@ -1,7 +1,8 @@
+import io
 import logging
 from psycopg2.extras import DictCursor
 from psycopg2 import Error
-from django.db import connection
+from django.db import connection, transaction
 
 from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
     transaction_fpds_nonboolean_columns,
@@ -13,7 +14,11 @@ from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
     transaction_fpds_functions,
     all_broker_columns,
 )
-from usaspending_api.etl.transaction_loaders.data_load_helpers import capitalize_if_string, false_if_null
+from usaspending_api.etl.transaction_loaders.data_load_helpers import (
+    capitalize_if_string,
+    false_if_null,
+    format_value_for_copy,
+)
 from usaspending_api.etl.transaction_loaders.generic_loaders import (
     update_transaction_fpds,
     update_transaction_normalized,
@@ -28,6 +33,13 @@ logger = logging.getLogger("script")
 
 failed_ids = []
 
+# load object -> (staging table, target table, target columns staged besides those of the load object)
+SET_BASED_STAGING_TABLES = {
+    "award": ("temp_fpds_load_award", "awards", []),
+    "transaction_normalized": ("temp_fpds_load_transaction_normalized", "transaction_normalized", ["id", "award_id"]),
+    "transaction_fpds": ("temp_fpds_load_transaction_fpds", "transaction_fpds", []),
+}
+
 
 def delete_stale_fpds(detached_award_procurement_ids):
     """
@@ -84,11 +96,14 @@ def delete_stale_fpds(detached_award_procurement_ids):
         return awards_touched
 
 
-def load_fpds_transactions(chunk):
+def load_fpds_transactions(chunk, set_based=False):
     """
     Run transaction load for the provided ids. This will create any new rows in other tables to support the transaction
     data, but does NOT update "secondary" award values like total obligations or C -> D linkages.
 
+    With set_based, the chunk is loaded with a few statements for all of its transactions rather than several
+    statements per transaction.
+
     returns ids for each award touched
     """
     with Timer() as timer:
@@ -98,7 +113,10 @@ def load_fpds_transactions(chunk):
             if broker_transactions:
                 load_objects = _transform_objects(broker_transactions)
 
-                retval = _load_transactions(load_objects)
+                if set_based:
+                    retval = _load_transactions_set_based(load_objects)
+                else:
+                    retval = _load_transactions(load_objects)
     logger.info("batch completed in {}".format(timer.as_string(timer.elapsed)))
     return retval
 
@@ -117,42 +135,49 @@ def _extract_broker_objects(id_list):
     return results
 
 
-def _create_load_object(broker_object, non_boolean_column_map, boolean_column_map, function_map):
-    retval = {}
-    if non_boolean_column_map:
-        retval.update(
-            {non_boolean_column_map[key]: capitalize_if_string(broker_object[key]) for key in non_boolean_column_map}
-        )
+def _compile_load_object_mapper(non_boolean_column_map, boolean_column_map, function_map):
+    """
+    Returns a function building load objects from broker objects with these maps, with the column plan (source
+    column, target column and conversion of each) worked out once instead of for every broker object
+    """
+    columns = tuple(
+        [(key, target, capitalize_if_string) for key, target in (non_boolean_column_map or {}).items()]
+        + [(key, target, false_if_null) for key, target in (boolean_column_map or {}).items()]
+    )
+    functions = tuple((function_map or {}).items())
 
-    if boolean_column_map:
-        retval.update({boolean_column_map[key]: false_if_null(broker_object[key]) for key in boolean_column_map})
+    def create_load_object(broker_object):
+        retval = {target: convert(broker_object[key]) for key, target, convert in columns}
+        for key, func in functions:
+            retval[key] = func(broker_object)
+        return retval
 
-    if function_map:
-        retval.update({key: func(broker_object) for key, func in function_map.items()})
+    return create_load_object
 
-    return retval
+
+def _create_load_object(broker_object, non_boolean_column_map, boolean_column_map, function_map):
+    return _compile_load_object_mapper(non_boolean_column_map, boolean_column_map, function_map)(broker_object)
+
+
+# award. NOT used if a matching award is found later
+_create_award = _compile_load_object_mapper(award_nonboolean_columns, None, award_functions)
+_create_transaction_normalized = _compile_load_object_mapper(
+    transaction_normalized_nonboolean_columns, None, transaction_normalized_functions
+)
+_create_transaction_fpds = _compile_load_object_mapper(
+    transaction_fpds_nonboolean_columns, transaction_fpds_boolean_columns, transaction_fpds_functions
+)
 
 
 def _transform_objects(broker_objects):
-    retval = []
-
-    for broker_object in broker_objects:
-        connected_objects = {
-            # award. NOT used if a matching award is found later
-            "award": _create_load_object(broker_object, award_nonboolean_columns, None, award_functions),
-            "transaction_normalized": _create_load_object(
-                broker_object, transaction_normalized_nonboolean_columns, None, transaction_normalized_functions
-            ),
-            "transaction_fpds": _create_load_object(
-                broker_object,
-                transaction_fpds_nonboolean_columns,
-                transaction_fpds_boolean_columns,
-                transaction_fpds_functions,
-            ),
+    return [
+        {
+            "award": _create_award(broker_object),
+            "transaction_normalized": _create_transaction_normalized(broker_object),
+            "transaction_fpds": _create_transaction_fpds(broker_object),
         }
-        retval.append(connected_objects)
-
-    return retval
+        for broker_object in broker_objects
+    ]
 
 
 def _load_transactions(load_objects):
@@ -196,8 +221,161 @@ def _load_transactions(load_objects):
     return list(ids_of_awards_created_or_updated)
 
 
+def _load_transactions_set_based(load_objects):
+    """
+    Copy the load objects into temporary tables, then match or create their awards and update or insert their
+    transactions with a statement each, in one database transaction.  As with _load_transactions, a new award is
+    created from the first transaction of its unique_award_key and a transaction repeated in the chunk is loaded with
+    its last values.  If the chunk fails to load, its transactions are loaded one at a time to report which failed.
+
+    returns ids for each award touched
+    """
+    try:
+        with transaction.atomic():
+            with connection.connection.cursor() as cursor:
+                staged_columns = _stage_load_objects(cursor, load_objects)
+                award_ids = _upsert_staged_transactions(cursor, staged_columns)
+                for staging_table, _, _ in SET_BASED_STAGING_TABLES.values():
+                    cursor.execute(f"DROP TABLE {staging_table}")
+    except Error as e:
+        logger.warning(
+            f"set-based load of {len(load_objects):,} transactions failed, loading them one at a time."
+            f"\nDetails: {e.pgerror}"
+        )
+        return _load_transactions(load_objects)
+
+    return award_ids
+
+
+def _stage_load_objects(cursor, load_objects):
+    """COPY the load objects into staging tables, returning the columns of each load object"""
+    staged_columns = {}
+    for key, (staging_table, table, extra_columns) in SET_BASED_STAGING_TABLES.items():
+        columns = list(load_objects[0][key])
+        staged_columns[key] = columns
+        all_columns = columns + [column for column in extra_columns if column not in columns]
+
+        cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {staging_table} AS "
+            f"SELECT NULL::INTEGER AS load_order, {_column_list(all_columns)} FROM {table} LIMIT 0"
+        )
+
+        copy_buffer = io.StringIO()
+        for load_order, load_object in enumerate(load_objects):
+            values = [load_order] + [load_object[key][column] for column in columns]
+            copy_buffer.write("\t".join(format_value_for_copy(value) for value in values) + "\n")
+        copy_buffer.seek(0)
+        cursor.copy_expert(f"COPY {staging_table} (load_order, {_column_list(columns)}) FROM STDIN", copy_buffer)
+
+    return staged_columns
+
+
+def _upsert_staged_transactions(cursor, staged_columns):
+    award_columns = _column_list(staged_columns["award"])
+    normalized_columns = staged_columns["transaction_normalized"]
+    fpds_columns = staged_columns["transaction_fpds"]
+
+    # AWARD GET OR CREATE
+    cursor.execute(
+        f"""
+        INSERT INTO awards ({award_columns})
+        SELECT DISTINCT ON (a.generated_unique_award_id) {award_columns}
+        FROM temp_fpds_load_award a
+        WHERE NOT EXISTS (SELECT 1 FROM awards WHERE awards.generated_unique_award_id = a.generated_unique_award_id)
+        ORDER BY a.generated_unique_award_id, a.load_order
+        """
+    )
+    cursor.execute(
+        """
+        UPDATE temp_fpds_load_transaction_normalized n
+        SET award_id = a.id
+        FROM (
+            SELECT DISTINCT ON (generated_unique_award_id) generated_unique_award_id, id
+            FROM awards
+            WHERE generated_unique_award_id IN (SELECT unique_award_key FROM temp_fpds_load_transaction_normalized)
+            ORDER BY generated_unique_award_id, id
+        ) a
+        WHERE a.generated_unique_award_id = n.unique_award_key
+        """
+    )
+    cursor.execute("SELECT DISTINCT award_id FROM temp_fpds_load_transaction_normalized")
+    award_ids = [row[0] for row in cursor.fetchall()]
+
+    # TRANSACTION UPSERT, keeping the last of repeated transactions
+    cursor.execute(
+        """
+        DELETE FROM temp_fpds_load_transaction_normalized s
+        USING temp_fpds_load_transaction_normalized l
+        WHERE l.transaction_unique_id = s.transaction_unique_id AND l.load_order > s.load_order
+        """
+    )
+    cursor.execute(
+        """
+        DELETE FROM temp_fpds_load_transaction_fpds s
+        USING temp_fpds_load_transaction_fpds l
+        WHERE l.detached_award_proc_unique = s.detached_award_proc_unique AND l.load_order > s.load_order
+        """
+    )
+    cursor.execute(
+        """
+        UPDATE temp_fpds_load_transaction_normalized n
+        SET id = f.transaction_id
+        FROM transaction_fpds f
+        WHERE f.detached_award_proc_unique = n.transaction_unique_id
+        """
+    )
+    update_pairs = ", ".join(
+        f'"{column}" = n."{column}"' for column in normalized_columns + ["award_id"] if column != "create_date"
+    )
+    cursor.execute(
+        f"""
+        UPDATE transaction_normalized t
+        SET {update_pairs}
+        FROM temp_fpds_load_transaction_normalized n
+        WHERE n.id = t.id
+        """
+    )
+    insert_columns = _column_list(normalized_columns + ["award_id"])
+    cursor.execute(
+        f"""
+        WITH inserted AS (
+            INSERT INTO transaction_normalized ({insert_columns})
+            SELECT {insert_columns}
+            FROM temp_fpds_load_transaction_normalized
+            WHERE id IS NULL
+            ORDER BY load_order
+            RETURNING id, transaction_unique_id
+        )
+        UPDATE temp_fpds_load_transaction_normalized n
+        SET id = i.id
+        FROM inserted i
+        WHERE i.transaction_unique_id = n.transaction_unique_id
+        """
+    )
+    update_pairs = ", ".join(
+        f'"{column}" = EXCLUDED."{column}"' for column in fpds_columns if column not in ("transaction_id", "created_at")
+    )
+    cursor.execute(
+        f"""
+        INSERT INTO transaction_fpds (transaction_id, {_column_list(fpds_columns)})
+        SELECT n.id, {", ".join(f'f."{column}"' for column in fpds_columns)}
+        FROM temp_fpds_load_transaction_fpds f
+        INNER JOIN temp_fpds_load_transaction_normalized n ON n.transaction_unique_id = f.detached_award_proc_unique
+        ORDER BY f.load_order
+        ON CONFLICT (detached_award_proc_unique) DO UPDATE SET {update_pairs}
+        """
+    )
+
+    return award_ids
+
+
+def _column_list(columns):
+    return ", ".join(f'"{column}"' for column in columns)
+
+
 def _matching_award(cursor, load_object):
-    """ Try to find an award for this transaction to belong to by unique_award_key"""
+    """Try to find an award for this transaction to belong to by unique_award_key"""
     find_matching_award_sql = "select id from awards where generated_unique_award_id = '{}'".format(
         load_object["transaction_fpds"]["unique_award_key"]
     )
@@ -114,3 +114,29 @@ def test_load_source_procurement_by_ids():
     assert transactions_by_id[101].fiscal_year == 2010
     assert transactions_by_id[201].fiscal_year == 2010
     assert transactions_by_id[301].fiscal_year == 2011
+
+
+@pytest.mark.django_db
+def test_set_based_load_source_procurement_by_ids():
+    source_procurement_id_list = [101, 201, 301]
+    _assemble_source_procurement_records(source_procurement_id_list)
+
+    call_command("load_fpds_transactions", "--ids", *source_procurement_id_list[:2], "--set-based")
+    transaction_ids = dict(TransactionFPDS.objects.values_list("detached_award_proc_unique", "transaction_id"))
+
+    # Reloading updates the loaded transactions in place, and inserts the new one under the same award
+    call_command("load_fpds_transactions", "--ids", *source_procurement_id_list, "--set-based")
+
+    usaspending_transactions = TransactionFPDS.objects.all()
+    assert sorted(_.detached_award_proc_unique for _ in usaspending_transactions) == ["101", "201", "301"]
+    assert all(_.transaction.transaction_unique_id == _.detached_award_proc_unique for _ in usaspending_transactions)
+    reloaded_transaction_ids = dict(TransactionFPDS.objects.values_list("detached_award_proc_unique", "transaction_id"))
+    assert reloaded_transaction_ids.items() >= transaction_ids.items()
+
+    usaspending_awards = Award.objects.all()
+    assert len(usaspending_awards) == 1
+    new_award = usaspending_awards[0]
+    assert all(_.transaction.award_id == new_award.id for _ in usaspending_transactions)
+    assert new_award.transaction_unique_id == "101"
+    assert new_award.latest_transaction.transaction_unique_id == "301"
+    assert new_award.earliest_transaction.transaction_unique_id == "101"
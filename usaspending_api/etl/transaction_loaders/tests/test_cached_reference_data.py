@@ -0,0 +1,40 @@
+import pytest
+
+from usaspending_api.etl.transaction_loaders import cached_reference_data
+from usaspending_api.etl.transaction_loaders.cached_reference_data import ReferenceDataCache
+from usaspending_api.etl.transaction_loaders.derived_field_functions_fpds import calculate_awarding_agency
+
+
+def test_mapping_is_shared_read_only_until_refreshed():
+    loads = []
+    cache = ReferenceDataCache("codes", lambda: loads.append(1) or {"A": len(loads)})
+    assert cache.version == 0
+
+    codes = cache.get()
+    assert cache.get() is codes
+    assert codes == {"A": 1}
+    assert cache.version == 1
+    with pytest.raises(TypeError):
+        codes["B"] = 2
+
+    refreshed = cache.refresh()
+    assert refreshed == {"A": 2}
+    assert codes == {"A": 1}  # a refresh never changes a mapping handed out
+    assert cache.version == 2
+
+    updated = cache.update({"B": 3})
+    assert updated is refreshed  # updates are made in place, without copying the mapping
+    assert refreshed == {"A": 2, "B": 3}
+    assert cache.version == 3
+
+    cache.reset()
+    assert cache.get() == {"A": 3}
+
+
+def test_subtier_agency_lookup_does_not_copy(monkeypatch):
+    cache = ReferenceDataCache("subtier agencies", lambda: {"0100": {"id": 7}})
+    monkeypatch.setattr(cached_reference_data, "SUBTIER_AGENCIES", cache)
+
+    assert calculate_awarding_agency({"awarding_sub_tier_agency_c": "0100"}) == 7
+    assert calculate_awarding_agency({"awarding_sub_tier_agency_c": "9999"}) is None
+    assert cached_reference_data.subtier_agency_list() is cache.get()
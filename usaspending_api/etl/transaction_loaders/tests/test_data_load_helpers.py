@@ -1,4 +1,10 @@
-from usaspending_api.etl.transaction_loaders.data_load_helpers import capitalize_if_string, false_if_null
+import datetime
+
+from usaspending_api.etl.transaction_loaders.data_load_helpers import (
+    capitalize_if_string,
+    false_if_null,
+    format_value_for_copy,
+)
 
 
 def test_capitalize_if_string():
@@ -14,3 +20,12 @@ def test_false_if_null():
     assert false_if_null(True)
     assert not false_if_null(False)
     assert not false_if_null(None)
+
+
+def test_values_are_formatted_for_copy():
+    assert format_value_for_copy(None) == "\\N"
+    assert format_value_for_copy("") == ""
+    assert format_value_for_copy("a\tb\nc\\N") == "a\\tb\\nc\\\\N"
+    assert format_value_for_copy(True) == "True"
+    assert format_value_for_copy(datetime.date(2010, 1, 1)) == "2010-01-01"
+    assert format_value_for_copy(["small_business", 'quote"d']) == '{"small_business","quote\\\\"d"}'
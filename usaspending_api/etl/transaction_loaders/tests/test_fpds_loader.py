@@ -5,6 +5,7 @@ from usaspending_api.etl.transaction_loaders.fpds_loader import (
     _create_load_object,
     _transform_objects,
     _load_transactions,
+    _load_transactions_set_based,
 )
 from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
     transaction_fpds_nonboolean_columns,
@@ -13,6 +14,7 @@ from usaspending_api.etl.transaction_loaders.field_mappings_fpds import (
 )
 from usaspending_api.etl.transaction_loaders.data_load_helpers import format_insert_or_update_column_sql
 
+from psycopg2 import Error
 from unittest.mock import MagicMock, patch
 
 
@@ -250,3 +252,16 @@ def test_load_transactions(mock__fetch_subtier_agency_id, mock_connection):
 
     load_objects = _transform_objects([mega_key_list])
     _load_transactions(load_objects)
+
+
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.connection")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader.transaction")
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader._stage_load_objects", side_effect=Error())
+@patch("usaspending_api.etl.transaction_loaders.fpds_loader._load_transactions", return_value=[1])
+def test_failed_set_based_load_falls_back_to_row_by_row(
+    mock__load_transactions, mock__stage_load_objects, mock_transaction, mock_connection
+):
+    load_objects = [{"transaction_fpds": {"detached_award_procurement_id": 101}}]
+
+    assert _load_transactions_set_based(load_objects) == [1]
+    mock__load_transactions.assert_called_once_with(load_objects)
@@ -16,6 +16,7 @@ in the IDV world but has been added for testing purposes.  Hope this helps.
 import pytest
 from model_mommy import mommy
 
+from usaspending_api.etl.award_helpers import update_idv_hierarchy
 from usaspending_api.submissions.models.dabs_submission_window_schedule import DABSSubmissionWindowSchedule
 
 
@@ -205,6 +206,8 @@ def basic_idvs():
             rollup_contract_count=400000 + award_id,
         )
 
+    update_idv_hierarchy()
+
 
 @pytest.fixture
 def idv_with_unreleased_submissions():
@@ -212,6 +215,7 @@ def idv_with_unreleased_submissions():
 
     standard_sub_window_schedule(DATE_IN_THE_FUTURE)
     idv_from_award_id(2, defc=defc_a)
+    update_idv_hierarchy()
 
 
 @pytest.fixture
@@ -220,6 +224,7 @@ def idv_with_released_submissions():
 
     standard_sub_window_schedule(DATE_IN_THE_PAST)
     idv_from_award_id(2, defc=defc_a)
+    update_idv_hierarchy()
 
 
 def idv_from_award_id(award_id, defc):
@@ -15,6 +15,8 @@ in the IDV world but has been added for testing purposes.  Hope this helps.
 """
 from model_mommy import mommy
 
+from usaspending_api.etl.award_helpers import update_idv_hierarchy
+
 
 AWARD_COUNT = 15
 IDVS = (1, 2, 3, 4, 5, 7, 8)
@@ -192,3 +194,5 @@ def create_idv_test_data():
             parent_award_id=PARENTS.get(award_id),
             rollup_contract_count=400000 + award_id,
         )
+
+    update_idv_hierarchy()
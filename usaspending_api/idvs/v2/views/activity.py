@@ -14,24 +14,11 @@ from usaspending_api.common.validator.pagination import PAGINATION
 from usaspending_api.common.validator.tinyshield import TinyShield
 
 
-# In gather_award_ids, if any awards are found for IDVs in the second half of
-# the union, by definition, they have to be grandchildren so even though the
-# grandchild boolean appears to be applying to the IDV, it will actually
-# trickle down to its children.
+# Contracts are found anywhere below the IDV in its hierarchy, along with
+# their parent IDV (which is either the IDV itself or one of its children)
+# to identify grandchildren.
 ACTIVITY_SQL = SQL(
     """
-    with gather_award_ids as (
-        select  award_id,
-                false grandchild
-        from    parent_award
-        where   {award_id_column} = {award_id}
-        union all
-        select  cpa.award_id,
-                true grandchild
-        from    parent_award ppa
-                inner join parent_award cpa on cpa.parent_award_id = ppa.award_id
-        where   ppa.{award_id_column} = {award_id}
-    )
     select
         ca.id                                           award_id,
         ta.name                                         awarding_agency,
@@ -47,15 +34,18 @@ ACTIVITY_SQL = SQL(
         ca.piid,
         rl.legal_business_name                          recipient_name,
         rp.recipient_hash || '-' || rp.recipient_level  recipient_id,
-        gaids.grandchild
+        pa.id != ra.id                                  grandchild
     from
-        gather_award_ids gaids
-        inner join awards pa on pa.id = gaids.award_id
+        awards ra
+        inner join idv_hierarchy h on h.ancestor_award_id = ra.id
         inner join awards ca on
-            ca.parent_award_piid = pa.piid and
-            ca.fpds_parent_agency_id = pa.fpds_agency_id and
+            ca.id = h.descendant_award_id and
             ca.type not like 'IDV%'
             {hide_edges_awarded_amount}
+        inner join idv_hierarchy ph on
+            ph.descendant_award_id = ca.id and
+            ph.depth = 1
+        inner join awards pa on pa.id = ph.ancestor_award_id
         left outer join transaction_fpds tf on tf.transaction_id = ca.latest_transaction_id
         left outer join recipient_lookup rl on rl.duns = tf.awardee_or_recipient_uniqu
         left outer join recipient_profile rp on
@@ -63,7 +53,16 @@ ACTIVITY_SQL = SQL(
             rp.recipient_level = case when tf.ultimate_parent_unique_ide is null then 'R' else 'C' end
         left outer join agency a on a.id = ca.awarding_agency_id
         left outer join toptier_agency ta on ta.toptier_agency_id = a.toptier_agency_id
-    {hide_edges_end_date}
+    where
+        ra.{awards_table_id_column} = {award_id} and (
+            pa.id = ra.id or
+            exists (
+                select  1
+                from    idv_hierarchy ah
+                where   ah.ancestor_award_id = ra.id and ah.descendant_award_id = pa.id
+            )
+        )
+        {hide_edges_end_date}
     order by
         ca.total_obligation desc, ca.id desc
     limit {limit} offset {offset}
@@ -86,30 +85,19 @@ COUNT_ACTIVITY_SQL = SQL(
 
 COUNT_ACTIVITY_HIDDEN_SQL = SQL(
     """
-    with gather_award_ids as (
-        select  award_id,
-                false grandchild
-        from    parent_award
-        where   {award_id_column} = {award_id}
-        union all
-        select  cpa.award_id,
-                true grandchild
-        from    parent_award ppa
-                inner join parent_award cpa on cpa.parent_award_id = ppa.award_id
-        where   ppa.{award_id_column} = {award_id}
-    )
     select
         count(*) rollup_contract_count
     from
-        gather_award_ids gaids
-        inner join awards pa on pa.id = gaids.award_id
+        awards ra
+        inner join idv_hierarchy h on h.ancestor_award_id = ra.id
         inner join awards ca on
-            ca.parent_award_piid = pa.piid and
-            ca.fpds_parent_agency_id = pa.fpds_agency_id and
+            ca.id = h.descendant_award_id and
             ca.type not like 'IDV%'
             {hide_edges_awarded_amount}
         left outer join transaction_fpds tf on tf.transaction_id = ca.latest_transaction_id
-    {hide_edges_end_date}
+    where
+        ra.{awards_table_id_column} = {award_id}
+        {hide_edges_end_date}
 """
 )
 
@@ -150,11 +138,12 @@ class IDVActivityViewSet(APIView):
         hide_edges_awarded_amount = ""
         hide_edges_end_date = ""
         award_id_column = "award_id" if type(award_id) is int else "generated_unique_award_id"
+        awards_table_id_column = "id" if type(award_id) is int else "generated_unique_award_id"
         if hide_edge_cases:
             hide_edges_awarded_amount = "and ca.base_and_all_options_value > 0 and ca.total_obligation > 0"
-            hide_edges_end_date = "where tf.period_of_perf_potential_e is not null"
+            hide_edges_end_date = "and tf.period_of_perf_potential_e is not null"
             sql = COUNT_ACTIVITY_HIDDEN_SQL.format(
-                award_id_column=Identifier(award_id_column),
+                awards_table_id_column=Identifier(awards_table_id_column),
                 award_id=Literal(award_id),
                 hide_edges_awarded_amount=SQL(hide_edges_awarded_amount),
                 hide_edges_end_date=SQL(hide_edges_end_date),
@@ -164,7 +153,7 @@ class IDVActivityViewSet(APIView):
         overall_count_results = execute_sql_to_ordered_dictionary(sql)
         overall_count = overall_count_results[0]["rollup_contract_count"] if overall_count_results else 0
         sql = ACTIVITY_SQL.format(
-            award_id_column=Identifier(award_id_column),
+            awards_table_id_column=Identifier(awards_table_id_column),
             award_id=Literal(award_id),
             limit=Literal(request_data["limit"] + 1),
             offset=Literal((request_data["page"] - 1) * request_data["limit"]),
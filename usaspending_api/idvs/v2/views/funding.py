@@ -38,16 +38,7 @@ DEFAULT_SORT_COLUMN = "reporting_fiscal_date"
 # data not File C (financial_accounts_by_awards).
 GET_FUNDING_SQL = SQL(
     """
-    with gather_award_ids as (
-        select  award_id
-        from    parent_award
-        where   {award_id_column} = {award_id}
-        union all
-        select  cpa.award_id
-        from    parent_award ppa
-                inner join parent_award cpa on cpa.parent_award_id = ppa.award_id
-        where   ppa.{award_id_column} = {award_id}
-    ), gather_awards as (
+    with gather_awards as (
         select  id award_id,
                 generated_unique_award_id,
                 piid,
@@ -62,12 +53,12 @@ GET_FUNDING_SQL = SQL(
                 ca.piid,
                 ca.awarding_agency_id,
                 ca.funding_agency_id
-        from    gather_award_ids gaids
-                inner join awards pa on pa.id = gaids.award_id
+        from    awards pa
+                inner join idv_hierarchy h on h.ancestor_award_id = pa.id
                 inner join awards ca on
-                    ca.parent_award_piid = pa.piid and
-                    ca.fpds_parent_agency_id = pa.fpds_agency_id and
+                    ca.id = h.descendant_award_id and
                     (ca.piid = {piid} or {piid} is null)
+        where   pa.{awards_table_id_column} = {award_id}
     ), gather_financial_accounts_by_awards as (
         select  ga.award_id,
                 ga.generated_unique_award_id,
@@ -154,11 +145,9 @@ class IDVFundingViewSet(APIView):
         # TinyShield.  We will either have an internal award id that is an
         # integer or a generated award id that is a string.
         award_id = request_data["award_id"]
-        award_id_column = "award_id" if type(award_id) is int else "generated_unique_award_id"
         awards_table_id_column = "id" if type(award_id) is int else "generated_unique_award_id"
 
         sql = GET_FUNDING_SQL.format(
-            award_id_column=Identifier(award_id_column),
             awards_table_id_column=Identifier(awards_table_id_column),
             award_id=Literal(award_id),
             piid=Literal(request_data.get("piid")),
@@ -17,25 +17,16 @@ from usaspending_api.common.validator.tinyshield import validate_post_request
 # performance a bit.
 ROLLUP_SQL = SQL(
     """
-    with gather_award_ids as (
-        select  award_id
-        from    parent_award
-        where   {award_id_column} = {award_id}
-        union all
-        select  cpa.award_id
-        from    parent_award ppa
-                inner join parent_award cpa on cpa.parent_award_id = ppa.award_id
-        where   ppa.{award_id_column} = {award_id}
-    ), gather_awards as (
+    with gather_awards as (
         select  ca.id award_id,
                 ca.awarding_agency_id,
                 ca.funding_agency_id
-        from    gather_award_ids gaids
-                inner join awards pa on pa.id = gaids.award_id
+        from    awards pa
+                inner join idv_hierarchy h on h.ancestor_award_id = pa.id
                 inner join awards ca on
-                    ca.parent_award_piid = pa.piid and
-                    ca.fpds_parent_agency_id = pa.fpds_agency_id and
+                    ca.id = h.descendant_award_id and
                     ca.type not like 'IDV%'
+        where   pa.{awards_table_id_column} = {award_id}
     ), gather_financial_accounts_by_awards as (
         select  ga.awarding_agency_id,
                 ga.funding_agency_id,
@@ -75,9 +66,9 @@ class IDVFundingRollupViewSet(APIView):
         # TinyShield.  We will either have an internal award id that is an
         # integer or a generated award id that is a string.
         award_id = request_data["award_id"]
-        award_id_column = "award_id" if type(award_id) is int else "generated_unique_award_id"
+        awards_table_id_column = "id" if type(award_id) is int else "generated_unique_award_id"
 
-        sql = ROLLUP_SQL.format(award_id_column=Identifier(award_id_column), award_id=Literal(award_id))
+        sql = ROLLUP_SQL.format(awards_table_id_column=Identifier(awards_table_id_column), award_id=Literal(award_id))
 
         return execute_sql_to_ordered_dictionary(sql)[0]
 
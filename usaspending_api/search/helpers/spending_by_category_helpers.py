@@ -1,5 +1,7 @@
 import logging
-from typing import Tuple, Optional
+
+from django.db.models import QuerySet
+from typing import Callable, Dict, Iterable, Tuple
 
 from usaspending_api.recipient.models import StateData
 from usaspending_api.references.models import Agency, Cfda, PSC, RefCountryCode, NAICS
@@ -7,60 +9,72 @@ from usaspending_api.references.models import Agency, Cfda, PSC, RefCountryCode,
 logger = logging.getLogger(__name__)
 
 
-def fetch_agency_tier_id_by_agency(agency_name: str, is_subtier: bool = False) -> Optional[int]:
+def _fetch_by_codes(table: str, codes: Iterable[str], query: Callable[[set], QuerySet]) -> dict:
+    """
+    Resolve many codes of a reference table with one query. query returns (code, value) rows for a set of codes
+    ordered by primary key; when a code has several rows, the first is used.
+    """
+    codes = {code for code in codes if code is not None}
+    results = {}
+    if codes:
+        for code, value in query(codes):
+            results.setdefault(code, value)
+        if len(results) < len(codes):
+            logger.warning(f"{table} not found for codes: {', '.join(sorted(codes.difference(results)))}")
+    return results
+
+
+def fetch_agency_tier_ids_by_agencies(agency_names: Iterable[str], is_subtier: bool = False) -> Dict[str, int]:
     agency_type = "subtier_agency" if is_subtier else "toptier_agency"
-    columns = ["id"]
-    filters = {"{}__name".format(agency_type): agency_name}
-    if not is_subtier:
-        # Note: The awarded/funded subagency can be a toptier agency, so we don't filter only subtiers in that case.
-        filters["toptier_flag"] = True
-    result = Agency.objects.filter(**filters).values(*columns).first()
-    if not result:
-        logger.warning("{} not found for agency_name: {}".format(",".join(columns), agency_name))
-        return None
-    return result[columns[0]]
-
-
-def fetch_cfda_id_title_by_number(cfda_number: str) -> Optional[Tuple[int, str]]:
-    columns = ["id", "program_title"]
-    result = Cfda.objects.filter(program_number=cfda_number).values(*columns).first()
-    if not result:
-        logger.warning("{} not found for cfda_number: {}".format(",".join(columns), cfda_number))
-        return None, None
-    return result[columns[0]], result[columns[1]]
-
-
-def fetch_psc_description_by_code(psc_code: str) -> Optional[str]:
-    columns = ["description"]
-    result = PSC.objects.filter(code=psc_code).values(*columns).first()
-    if not result:
-        logger.warning("{} not found for psc_code: {}".format(",".join(columns), psc_code))
-        return None
-    return result[columns[0]]
-
-
-def fetch_country_name_from_code(country_code: str) -> Optional[str]:
-    columns = ["country_name"]
-    result = RefCountryCode.objects.filter(country_code=country_code).values(*columns).first()
-    if not result:
-        logger.warning("{} not found for country_code: {}".format(",".join(columns), country_code))
-        return None
-    return result[columns[0]]
-
-
-def fetch_state_name_from_code(state_code: str) -> Optional[str]:
-    columns = ["name"]
-    result = StateData.objects.filter(code=state_code).values(*columns).first()
-    if not result:
-        logger.warning("{} not found for state_code: {}".format(",".join(columns), state_code))
-        return None
-    return result[columns[0]]
-
-
-def fetch_naics_description_from_code(naics_code: str, passthrough: str = None) -> Optional[str]:
-    columns = ["description"]
-    result = NAICS.objects.filter(code=naics_code).values(*columns).first()
-    if not result:
-        logger.warning("{} not found for naics_code: {}".format(",".join(columns), naics_code))
-        return passthrough
-    return result[columns[0]]
+
+    def query(names):
+        filters = {f"{agency_type}__name__in": names}
+        if not is_subtier:
+            # Note: The awarded/funded subagency can be a toptier agency, so we don't filter only subtiers in that case.
+            filters["toptier_flag"] = True
+        return Agency.objects.filter(**filters).order_by("pk").values_list(f"{agency_type}__name", "id")
+
+    return _fetch_by_codes(f"{agency_type} id", agency_names, query)
+
+
+def fetch_cfda_id_titles_by_numbers(cfda_numbers: Iterable[str]) -> Dict[str, Tuple[int, str]]:
+    def query(numbers):
+        rows = Cfda.objects.filter(program_number__in=numbers).order_by("pk")
+        return (
+            (number, (cfda_id, title))
+            for number, cfda_id, title in rows.values_list("program_number", "id", "program_title")
+        )
+
+    return _fetch_by_codes("cfda id, program_title", cfda_numbers, query)
+
+
+def fetch_psc_descriptions_by_codes(psc_codes: Iterable[str]) -> Dict[str, str]:
+    def query(codes):
+        return PSC.objects.filter(code__in=codes).order_by("pk").values_list("code", "description")
+
+    return _fetch_by_codes("psc description", psc_codes, query)
+
+
+def fetch_country_names_from_codes(country_codes: Iterable[str]) -> Dict[str, str]:
+    def query(codes):
+        return (
+            RefCountryCode.objects.filter(country_code__in=codes)
+            .order_by("pk")
+            .values_list("country_code", "country_name")
+        )
+
+    return _fetch_by_codes("country_name", country_codes, query)
+
+
+def fetch_state_names_from_codes(state_codes: Iterable[str]) -> Dict[str, str]:
+    def query(codes):
+        return StateData.objects.filter(code__in=codes).order_by("pk").values_list("code", "name")
+
+    return _fetch_by_codes("state name", state_codes, query)
+
+
+def fetch_naics_descriptions_from_codes(naics_codes: Iterable[str]) -> Dict[str, str]:
+    def query(codes):
+        return NAICS.objects.filter(code__in=codes).order_by("pk").values_list("code", "description")
+
+    return _fetch_by_codes("naics description", naics_codes, query)
@@ -798,6 +798,29 @@ def test_category_recipient_duns_subawards(recipient_test_data):
     assert expected_response == spending_by_category_logic
 
 
+def test_recipient_duns_subawards_resolve_recipient_levels_in_one_query(db, django_assert_num_queries):
+    for duns, levels in [("111", ["P", "R", "C"]), ("222", ["P", "R"]), ("333", ["P"])]:
+        recipient_hash = f"00000000-0000-0000-0000-000000000{duns}"
+        for level in levels:
+            mommy.make(
+                "recipient.RecipientProfile",
+                recipient_hash=recipient_hash,
+                recipient_level=level,
+                recipient_unique_id=duns,
+                recipient_name=f"RECIPIENT {duns}",
+            )
+    rows = [{"recipient_unique_id": duns} for duns in ["111", "222", "333", "444", None]]
+
+    with django_assert_num_queries(1):
+        recipient_ids = RecipientDunsViewSet._get_recipient_ids(rows)
+
+    assert recipient_ids == {
+        "111": "00000000-0000-0000-0000-000000000111-C",
+        "222": "00000000-0000-0000-0000-000000000222-R",
+        "333": "00000000-0000-0000-0000-000000000333-P",
+    }
+
+
 def test_category_cfda_awards(cfda_test_data, monkeypatch, elasticsearch_transaction_index):
     setup_elasticsearch_test(monkeypatch, elasticsearch_transaction_index)
 
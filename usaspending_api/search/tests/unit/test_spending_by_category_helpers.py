@@ -0,0 +1,20 @@
+from model_mommy import mommy
+
+from usaspending_api.references.models import Cfda
+from usaspending_api.search.helpers.spending_by_category_helpers import (
+    fetch_cfda_id_titles_by_numbers,
+    fetch_state_names_from_codes,
+)
+
+
+def test_codes_are_fetched_in_one_query(db, django_assert_num_queries):
+    mommy.make(Cfda, id=1, program_number="10.001", program_title="Agricultural Research")
+    mommy.make(Cfda, id=2, program_number="10.002", program_title="Basic Research")
+    mommy.make(Cfda, id=3, program_number="10.002", program_title="Duplicate Program Number")
+
+    with django_assert_num_queries(1):
+        results = fetch_cfda_id_titles_by_numbers(["10.001", "10.002", "10.002", "99.999", None])
+    assert results == {"10.001": (1, "Agricultural Research"), "10.002": (2, "Basic Research")}
+
+    with django_assert_num_queries(0):
+        assert fetch_state_names_from_codes([]) == {}
@@ -46,7 +46,7 @@ class SpendingByCategoryVisualizationViewSet(APIView):
 
     endpoint_doc = "usaspending_api/api_contracts/contracts/v2/search/spending_by_category.md"
 
-    @cache_response()
+    @cache_response(single_flight=True)
     def post(self, request: Request) -> Response:
         """Return all budget function/subfunction titles matching the provided search text"""
         categories = [
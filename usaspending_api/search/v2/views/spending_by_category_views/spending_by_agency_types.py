@@ -6,7 +6,7 @@ from django.db.models import QuerySet, F
 from enum import Enum
 from typing import List
 
-from usaspending_api.search.helpers.spending_by_category_helpers import fetch_agency_tier_id_by_agency
+from usaspending_api.search.helpers.spending_by_category_helpers import fetch_agency_tier_ids_by_agencies
 from usaspending_api.search.v2.views.spending_by_category_views.spending_by_category import (
     Category,
     AbstractSpendingByCategoryViewSet,
@@ -53,11 +53,10 @@ class AbstractAgencyViewSet(AbstractSpendingByCategoryViewSet, metaclass=ABCMeta
         lower_limit = self.pagination.lower_limit
         upper_limit = self.pagination.upper_limit
         query_results = list(queryset[lower_limit:upper_limit])
+        is_subtier = self.agency_type == AgencyType.AWARDING_SUBTIER or self.agency_type == AgencyType.FUNDING_SUBTIER
+        agency_ids = fetch_agency_tier_ids_by_agencies([row["name"] for row in query_results], is_subtier=is_subtier)
         for row in query_results:
-            is_subtier = (
-                self.agency_type == AgencyType.AWARDING_SUBTIER or self.agency_type == AgencyType.FUNDING_SUBTIER
-            )
-            row["id"] = fetch_agency_tier_id_by_agency(agency_name=row["name"], is_subtier=is_subtier)
+            row["id"] = agency_ids.get(row["name"])
             row.pop(f"{self.agency_type.value}_agency_name")
             row.pop(f"{self.agency_type.value}_agency_abbreviation")
         return query_results
@@ -49,7 +49,7 @@ class AbstractSpendingByCategoryViewSet(APIView, metaclass=ABCMeta):
     subawards: bool
     high_cardinality_categories: List[str] = ["recipient_duns"]
 
-    @cache_response()
+    @cache_response(single_flight=True)
     def post(self, request: Request) -> Response:
         models = [
             {"name": "subawards", "key": "subawards", "type": "boolean", "default": False, "optional": True},
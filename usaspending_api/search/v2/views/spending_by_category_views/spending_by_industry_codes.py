@@ -8,9 +8,9 @@ from typing import List
 
 from usaspending_api.references.models import Cfda
 from usaspending_api.search.helpers.spending_by_category_helpers import (
-    fetch_cfda_id_title_by_number,
-    fetch_psc_description_by_code,
-    fetch_naics_description_from_code,
+    fetch_cfda_id_titles_by_numbers,
+    fetch_psc_descriptions_by_codes,
+    fetch_naics_descriptions_from_codes,
 )
 from usaspending_api.search.v2.views.spending_by_category_views.spending_by_category import (
     Category,
@@ -79,15 +79,23 @@ class AbstractIndustryCodeViewSet(AbstractSpendingByCategoryViewSet, metaclass=A
         upper_limit = self.pagination.upper_limit
         query_results = list(queryset[lower_limit:upper_limit])
 
+        codes = [row["code"] for row in query_results]
+        if self.industry_code_type == IndustryCodeType.CFDA:
+            code_names = fetch_cfda_id_titles_by_numbers(codes)
+        elif self.industry_code_type == IndustryCodeType.PSC:
+            code_names = fetch_psc_descriptions_by_codes(codes)
+        else:
+            code_names = fetch_naics_descriptions_from_codes(codes)
+
         for row in query_results:
             if self.industry_code_type == IndustryCodeType.CFDA:
-                row["id"], row["name"] = fetch_cfda_id_title_by_number(row["code"])
+                row["id"], row["name"] = code_names.get(row["code"], (None, None))
             elif self.industry_code_type == IndustryCodeType.PSC:
                 row["id"] = None
-                row["name"] = fetch_psc_description_by_code(row["code"])
+                row["name"] = code_names.get(row["code"])
             elif self.industry_code_type == IndustryCodeType.NAICS:
                 row["id"] = None
-                row["name"] = fetch_naics_description_from_code(row["code"], row.get("name"))
+                row["name"] = code_names.get(row["code"], row.get("name"))
             row.pop(self.industry_code_type.value)
 
         return query_results
@@ -7,8 +7,8 @@ from enum import Enum
 from typing import List
 
 from usaspending_api.search.helpers.spending_by_category_helpers import (
-    fetch_country_name_from_code,
-    fetch_state_name_from_code,
+    fetch_country_names_from_codes,
+    fetch_state_names_from_codes,
 )
 from usaspending_api.search.v2.views.spending_by_category_views.spending_by_category import (
     Category,
@@ -81,6 +81,12 @@ class AbstractLocationViewSet(AbstractSpendingByCategoryViewSet, metaclass=ABCMe
         upper_limit = self.pagination.upper_limit
         query_results = list(queryset[lower_limit:upper_limit])
 
+        location_names = {}
+        if self.location_type == LocationType.COUNTRY:
+            location_names = fetch_country_names_from_codes(row["code"] for row in query_results)
+        elif self.location_type == LocationType.STATE_TERRITORY:
+            location_names = fetch_state_names_from_codes(row["code"] for row in query_results)
+
         for row in query_results:
             row["id"] = None
             if self.location_type == LocationType.CONGRESSIONAL_DISTRICT:
@@ -88,10 +94,8 @@ class AbstractLocationViewSet(AbstractSpendingByCategoryViewSet, metaclass=ABCMe
                 if district_code == "90":
                     district_code = "MULTIPLE DISTRICTS"
                 row["name"] = f"{row['pop_state_code']}-{district_code}"
-            elif self.location_type == LocationType.COUNTRY:
-                row["name"] = fetch_country_name_from_code(row["code"])
-            elif self.location_type == LocationType.STATE_TERRITORY:
-                row["name"] = fetch_state_name_from_code(row["code"])
+            elif self.location_type in (LocationType.COUNTRY, LocationType.STATE_TERRITORY):
+                row["name"] = location_names.get(row["code"])
 
             for key in django_values:
                 row.pop(key)
@@ -2,7 +2,7 @@ import json
 
 from decimal import Decimal
 from django.db.models import QuerySet, F, Case, When, Value, IntegerField
-from typing import List
+from typing import Dict, List
 
 from usaspending_api.common.recipient_lookups import combine_recipient_hash_and_level
 from usaspending_api.recipient.models import RecipientProfile
@@ -23,25 +23,31 @@ class RecipientDunsViewSet(AbstractSpendingByCategoryViewSet):
     category = Category(name="recipient_duns", agg_key="recipient_agg_key")
 
     @staticmethod
-    def _get_recipient_id(row: list) -> str:
+    def _get_recipient_ids(rows: List[dict]) -> Dict[str, str]:
         """
         In the recipient_profile table there is a 1 to 1 relationship between hashes and DUNS
         (recipient_unique_id) and the hashes+duns match exactly between recipient_profile and
         recipient_lookup where there are matches.  Grab the level from recipient_profile by
         hash if we have one or by DUNS if we have one of those.
+
+        The preferred level (C, then R, then P) of every row's recipient is found in one query,
+        and returned as the hash with level, keyed by the hash or DUNS it was found by.
         """
-        if "recipient_hash" in row:
-            profile_filter = {"recipient_hash": row["recipient_hash"]}
-        elif "recipient_unique_id" in row:
-            profile_filter = {"recipient_unique_id": row["recipient_unique_id"]}
+        if not rows:
+            return {}
+        if "recipient_hash" in rows[0]:
+            profile_key = "recipient_hash"
+        elif "recipient_unique_id" in rows[0]:
+            profile_key = "recipient_unique_id"
         else:
             raise RuntimeError(
                 "Attempted to lookup recipient profile using a queryset that contains neither "
                 "'recipient_hash' nor 'recipient_unique_id'"
             )
 
-        profile = (
-            RecipientProfile.objects.filter(**profile_filter)
+        keys = {row[profile_key] for row in rows if row[profile_key] is not None}
+        profiles = (
+            RecipientProfile.objects.filter(**{f"{profile_key}__in": keys})
             .exclude(recipient_name__in=SPECIAL_CASES)
             .annotate(
                 sort_order=Case(
@@ -51,14 +57,17 @@ class RecipientDunsViewSet(AbstractSpendingByCategoryViewSet):
                     output_field=IntegerField(),
                 )
             )
-            .values("recipient_hash", "recipient_level")
-            .order_by("sort_order")
-            .first()
+            .order_by(profile_key, "sort_order")
+            .distinct(profile_key)
+            .values(profile_key, "recipient_hash", "recipient_level")
         )
 
-        return (
-            combine_recipient_hash_and_level(profile["recipient_hash"], profile["recipient_level"]) if profile else None
-        )
+        return {
+            profile[profile_key]: combine_recipient_hash_and_level(
+                profile["recipient_hash"], profile["recipient_level"]
+            )
+            for profile in profiles
+        }
 
     def build_elasticsearch_result(self, response: dict) -> List[dict]:
 
@@ -87,8 +96,9 @@ class RecipientDunsViewSet(AbstractSpendingByCategoryViewSet):
         upper_limit = self.pagination.upper_limit
         query_results = list(queryset[lower_limit:upper_limit])
 
+        recipient_ids = self._get_recipient_ids(query_results)
         for row in query_results:
-            row["recipient_id"] = self._get_recipient_id(row)
+            row["recipient_id"] = recipient_ids.get(row["recipient_unique_id"])
 
             for key in django_values:
                 del row[key]
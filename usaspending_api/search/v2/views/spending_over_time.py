@@ -176,7 +176,7 @@ class SpendingOverTimeVisualizationViewSet(APIView):
         response = search.handle_execute()
         return self.build_elasticsearch_result(response.aggs, time_periods)
 
-    @cache_response()
+    @cache_response(single_flight=True)
     def post(self, request: Request) -> Response:
         self.original_filters = request.data.get("filters")
         json_request = self.validate_request_data(request.data)
@@ -24,6 +24,24 @@ DOWNLOAD_TIMEOUT_MIN_LIMIT = 10
 # Default timeout for SQL statements in Django
 DEFAULT_DB_TIMEOUT_IN_SECONDS = int(os.environ.get("DEFAULT_DB_TIMEOUT_IN_SECONDS", 0))
 DOWNLOAD_DB_TIMEOUT_IN_HOURS = 4
+# Max download sources exported at once by a download worker, each by a PSQL process with its own DB connection
+DOWNLOAD_MAX_CONCURRENT_EXPORTS = int(os.environ.get("DOWNLOAD_MAX_CONCURRENT_EXPORTS", 1))
+# Stream PSQL's output straight into the zip file (counting and splitting rows on the way) instead of writing, then
+# re-reading, a delimited text file
+DOWNLOAD_STREAM_TO_ZIP = os.environ.get("DOWNLOAD_STREAM_TO_ZIP", "").lower() in ["true", "1", "yes"]
+# Upload the zip file to S3 in parts as it's generated, instead of writing it to disk and uploading it once finished
+DOWNLOAD_STREAMING_UPLOAD = os.environ.get("DOWNLOAD_STREAMING_UPLOAD", "").lower() in ["true", "1", "yes"]
+# zlib level (0-9, or -1 for zlib's default of 6) the files of a download are deflated with, unless a download type
+# sets its own "compression_level" in VALUE_MAPPINGS
+DOWNLOAD_COMPRESSION_LEVEL = int(os.environ.get("DOWNLOAD_COMPRESSION_LEVEL", -1))
+# Processes compressing the split files of a download source concurrently, before they're written to the zip file
+DOWNLOAD_COMPRESSION_PROCESSES = int(os.environ.get("DOWNLOAD_COMPRESSION_PROCESSES", 1))
+# Add the data files of monthly archives as individually gzipped (.gz) members rather than deflated ones
+MONTHLY_DOWNLOAD_GZIP_MEMBERS = os.environ.get("MONTHLY_DOWNLOAD_GZIP_MEMBERS", "").lower() in ["true", "1", "yes"]
+# Awards recomputed from their transactions per statement after a load, and DB connections recomputing them in
+# parallel (only outside of a transaction, as other connections can't see the changes it hasn't committed)
+AWARD_RECOMPUTE_CHUNK_SIZE = int(os.environ.get("AWARD_RECOMPUTE_CHUNK_SIZE", 25000))
+AWARD_RECOMPUTE_CONNECTIONS = int(os.environ.get("AWARD_RECOMPUTE_CONNECTIONS", 1))
 CONNECTION_MAX_SECONDS = 10
 
 API_MAX_DATE = "2024-09-30"  # End of FY2024
@@ -129,6 +147,9 @@ ES_COVID19_FABA_MAX_RESULT_WINDOW = 50000
 ES_COVID19_FABA_NAME_SUFFIX = "covid19-faba"
 ES_COVID19_FABA_QUERY_ALIAS_PREFIX = "covid19-faba-query"
 ES_COVID19_FABA_WRITE_ALIAS = "covid19-faba-load-alias"
+# How downloads collect matching ids from Elasticsearch: "terms" (partitioned aggregations) or "search_after" (sorted
+# paging over the id doc-values, in a single pass and without the MAX_DOWNLOAD_LIMIT cap on ids)
+ES_DOWNLOAD_ID_COLLECTION = os.environ.get("ES_DOWNLOAD_ID_COLLECTION", "terms")
 ES_TRANSACTIONS_ETL_VIEW_NAME = "transaction_delta_view"
 ES_TRANSACTIONS_MAX_RESULT_WINDOW = 50000
 ES_TRANSACTIONS_NAME_SUFFIX = "transactions"
@@ -427,7 +448,8 @@ CACHE_ENVIRONMENTS = {
     "disabled": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
 }
 
-# Set the usaspending-cache to whatever our environment cache dictates
+# Set the usaspending-cache to whatever our environment cache dictates. Its keys include the version of the loaded data
+# (see usaspending_api.common.cache.DataVersionKeyBit), so cached responses are never served after a data load
 CACHES["usaspending-cache"] = CACHE_ENVIRONMENTS[CACHE_ENVIRONMENT]
 
 # DRF extensions